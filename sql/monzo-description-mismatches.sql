@@ -2,12 +2,9 @@
 -- bmonzo is true data
 -- _bmonzo has fewer columns than bmonzo
 
--- first create a backup after every download
-DROP TABLE IF EXISTS bmonzo_backup;
-
-CREATE TABLE bmonzo_backup AS
-SELECT *
-FROM bmonzo;
+-- every download keeps the database it replaced as a backup,
+-- our_finances.sqlite.previous alongside the live file
+ATTACH DATABASE 'our_finances.sqlite.previous' AS previous;
 
 -- SELECT sql FROM sqlite_master WHERE type='table' AND name='bmonzo';
 
@@ -96,9 +93,10 @@ AND b.id=1319
 -- WHERE money_out NOT LIKE '%.%';
 
 
--- restore from backup
+-- restore from the previous download
+-- (download-sheets-to-sqlite --restore-previous restores every table)
 -- BEGIN TRANSACTION;
 -- DELETE FROM bmonzo;
--- INSERT INTO bmonzo SELECT * FROM bmonzo_backup;
+-- INSERT INTO bmonzo SELECT * FROM previous.bmonzo;
 -- COMMIT;
 
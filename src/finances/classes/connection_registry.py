@@ -0,0 +1,109 @@
+# standard imports
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+# pip imports
+from sqlalchemy import Engine, QueuePool, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+# local imports
+from finances.classes.exception_helper import ExceptionHelper
+
+T = TypeVar("T")
+
+
+class ConnectionRegistryError(ExceptionHelper):
+    pass
+
+
+class ConnectionRegistry:
+    """
+    Process-wide registry of database engines and shared SQL helpers.
+
+    Engines are keyed by database URL so every table object talking to the
+    same database file reuses one pooled engine instead of creating its own.
+    """
+
+    def __init__(self) -> None:
+        self._engines: dict[str, Engine] = {}
+        self._session_factories: dict[str, sessionmaker[Session]] = {}
+        self._shared: dict[str, Any] = {}
+        self.engines_created = 0
+        self.engines_disposed = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<ConnectionRegistry {len(self._engines)} open engines, "
+            f"{self.engines_created} created>"
+        )
+
+    def close(self, database_url: str) -> None:
+        """
+        Dispose of the engine for database_url and forget it.
+        """
+        engine = self._engines.pop(database_url, None)
+        self._session_factories.pop(database_url, None)
+        if engine is None:
+            return
+
+        engine.dispose()
+        self.engines_disposed += 1
+
+    def dispose(self) -> None:
+        """
+        Dispose of every engine and drop every shared helper.
+        """
+        for database_url in list(self._engines):
+            self.close(database_url)
+
+        self._shared.clear()
+
+    def get_session_factory(self, database_url: str) -> sessionmaker[Session]:
+        if database_url not in self._session_factories:
+            raise ConnectionRegistryError(
+                f"No engine is open for '{database_url}'"
+            ) from KeyError(database_url)
+
+        return self._session_factories[database_url]
+
+    def get_shared(self, key: str, factory: Callable[[], T]) -> T:
+        """
+        Return the shared object for key, creating it with factory on first use.
+        """
+        if key not in self._shared:
+            self._shared[key] = factory()
+
+        shared: T = self._shared[key]
+        return shared
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "engines_open": len(self._engines),
+            "engines_created": self.engines_created,
+            "engines_disposed": self.engines_disposed,
+            "shared_helpers": len(self._shared),
+        }
+
+    def is_open(self, database_url: str) -> bool:
+        return database_url in self._engines
+
+    def open(self, database_url: str, echo: bool = False) -> Engine:
+        """
+        Return the engine for database_url, creating it on first use.
+        """
+        if database_url in self._engines:
+            return self._engines[database_url]
+
+        if "mode=memory" in database_url:
+            # Each pooled connection opens the same shared-cache memory database
+            engine = create_engine(database_url, echo=echo, poolclass=QueuePool)
+        else:
+            engine = create_engine(database_url, echo=echo)
+        self._engines[database_url] = engine
+        self._session_factories[database_url] = sessionmaker(bind=engine)
+        self.engines_created += 1
+
+        return engine
+
+
+registry = ConnectionRegistry()
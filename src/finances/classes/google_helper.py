@@ -1,9 +1,15 @@
 import json
-from collections.abc import Sequence
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
 from pathlib import Path
+from typing import Any, Protocol, TypeVar
 
 import gspread
 from google.oauth2.service_account import Credentials
+from gspread.exceptions import APIError
+from gspread.utils import absolute_range_name, fill_gaps
 
 from finances.classes.config import Config, ConfigError
 from finances.classes.exception_helper import ExceptionHelper
@@ -13,6 +19,162 @@ class GoogleHelperError(ExceptionHelper):
     pass
 
 
+class ValuesBatchGetter(Protocol):
+    """
+    What batch_get_values needs: a gspread.Spreadsheet, or a snapshot of one.
+    """
+
+    def values_batch_get(self, ranges: list[str]) -> Any: ...
+
+
+# Worksheets fetched per values_batch_get request
+BATCH_GET_CHUNK_SIZE = 20
+
+# Google's default Sheets read quota, per user
+READ_REQUESTS_PER_MINUTE = 60
+
+# Quota exhausted, or a transient server error
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+T = TypeVar("T")
+
+
+class GoogleApiLimiter:
+    """
+    Token bucket for the Sheets read quota, with retries on 429 and 5xx.
+
+    Requests go straight through while the bucket has tokens, so an idle
+    quota costs no waiting. Retries back off exponentially with jitter.
+    A 429 halves the refill rate, and each success wins back a tenth of
+    the configured rate, so a quota shared with other clients is not
+    hammered at the full rate.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = READ_REQUESTS_PER_MINUTE,
+        max_retries: int = 5,
+        max_backoff: float = 64.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if requests_per_minute < 1:
+            raise ValueError(
+                f"requests_per_minute must be at least 1, not {requests_per_minute}"
+            )
+
+        self.capacity = float(requests_per_minute)
+        self.max_refill_per_second = requests_per_minute / 60
+        self.refill_per_second = self.max_refill_per_second
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.sleep = sleep
+
+        self.tokens = self.capacity
+        self.refilled_at = clock()
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.retries = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def __repr__(self) -> str:
+        return f"<GoogleApiLimiter {self.get_stats()}>"
+
+    def acquire(self) -> None:
+        """
+        Take a token, sleeping until one is available.
+        """
+        with self.lock:
+            now = self.clock()
+            elapsed = now - self.refilled_at
+            self.tokens = min(
+                self.capacity, self.tokens + elapsed * self.refill_per_second
+            )
+            self.refilled_at = now
+
+            # Reserve the token now, so concurrent callers queue up behind it
+            self.tokens -= 1
+            wait = -self.tokens / self.refill_per_second if self.tokens < 0 else 0.0
+            self.requests += 1
+            if wait:
+                self.waits += 1
+                self.wait_seconds += wait
+
+        if wait:
+            self.sleep(wait)
+
+    def call(self, request: Callable[[], T]) -> T:
+        """
+        Make request within the quota, retrying on 429 and 5xx responses.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                result = request()
+            except APIError as e:
+                status_code = e.response.status_code
+                if status_code == 429:
+                    self.slow_down()
+                if attempt == self.max_retries or status_code not in RETRY_STATUS_CODES:
+                    raise
+            else:
+                self.speed_up()
+                return result
+
+            with self.lock:
+                self.retries += 1
+            self.sleep(self.get_backoff(attempt))
+            attempt += 1
+
+    def get_backoff(self, attempt: int) -> float:
+        return float(min(2**attempt + random.random(), self.max_backoff))
+
+    def slow_down(self) -> None:
+        """
+        Halve the refill rate, down to one request a minute.
+        """
+        with self.lock:
+            self.refill_per_second = max(1 / 60, self.refill_per_second / 2)
+
+    def speed_up(self) -> None:
+        """
+        Raise the refill rate a step back towards the configured rate.
+        """
+        with self.lock:
+            self.refill_per_second = min(
+                self.max_refill_per_second,
+                self.refill_per_second + self.max_refill_per_second / 10,
+            )
+
+    def get_stats(self) -> dict[str, float]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+_api_limiter: GoogleApiLimiter | None = None
+
+
+def get_api_limiter() -> GoogleApiLimiter:
+    """
+    Return the process-wide limiter, so every Sheets call shares one budget.
+    """
+    global _api_limiter
+    if _api_limiter is None:
+        requests_per_minute = Config().get(
+            "GOOGLE_READ_REQUESTS_PER_MINUTE", READ_REQUESTS_PER_MINUTE
+        )
+        _api_limiter = GoogleApiLimiter(int(requests_per_minute))
+    return _api_limiter
+
+
 class GoogleHelper:
     def __init__(self) -> None:
         self.read_config()
@@ -57,7 +219,9 @@ class GoogleHelper:
 
     def get_spreadsheet(self, scopes: list[str]) -> gspread.Spreadsheet:
         client: gspread.Client = self.get_authorized_client(scopes)
-        spreadsheet: gspread.Spreadsheet = client.open_by_key(self.spreadsheet_key)
+        spreadsheet: gspread.Spreadsheet = get_api_limiter().call(
+            lambda: client.open_by_key(self.spreadsheet_key)
+        )
 
         return spreadsheet
 
@@ -73,3 +237,50 @@ class GoogleHelper:
             self.spreadsheet_key = config.GOOGLE_DRIVE_OUR_FINANCES_KEY
         except ConfigError as e:
             raise GoogleHelperError("Config error") from e
+
+
+def batch_get_values(
+    spreadsheet: ValuesBatchGetter,
+    titles: Sequence[str],
+    chunk_size: int = BATCH_GET_CHUNK_SIZE,
+    limiter: GoogleApiLimiter | None = None,
+    cell_range: str | None = None,
+) -> dict[str, list[list[str]]]:
+    """
+    Get every value of the titled worksheets, chunk_size worksheets per request.
+
+    Args:
+        spreadsheet (ValuesBatchGetter): The spreadsheet to read.
+        titles (Sequence[str]): The worksheet titles to read.
+        chunk_size (int): The most worksheets to read in one request.
+        limiter (GoogleApiLimiter): The limiter for the requests, by default
+            the process-wide one.
+        cell_range (str): The A1 range to read from each worksheet, such as
+            "1:1" for the header row; by default the whole worksheet.
+
+    Returns:
+        values_by_title: Each title's values, padded to a rectangle like
+            Worksheet.get_all_values.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, not {chunk_size}")
+
+    limiter = limiter or get_api_limiter()
+
+    values_by_title: dict[str, list[list[str]]] = {}
+    for start in range(0, len(titles), chunk_size):
+        chunk = titles[start : start + chunk_size]
+        ranges = [absolute_range_name(title, cell_range) for title in chunk]
+        response = limiter.call(lambda: spreadsheet.values_batch_get(ranges))
+
+        # Value ranges come back in the order they were requested
+        value_ranges = response.get("valueRanges", [])
+        if len(value_ranges) != len(chunk):
+            raise GoogleHelperError(
+                f"Asked for {len(chunk)} worksheets, got {len(value_ranges)}"
+            )
+
+        for title, value_range in zip(chunk, value_ranges, strict=True):
+            values_by_title[title] = fill_gaps(value_range.get("values", []))
+
+    return values_by_title
@@ -0,0 +1,71 @@
+# standard imports
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+# local imports
+from finances.classes.hmrc.question_plan import HMRCQuestionPlan
+from finances.classes.hmrc_output import HMRCOutputData
+
+if TYPE_CHECKING:
+    from finances.classes.hmrc.core import HMRC
+
+
+@dataclass(frozen=True)
+class HMRCAnswerSet:
+    """
+    Every answer in one person's return for one tax year.
+
+    Each getter in the question plan runs exactly once. Every report type
+    is then a projection of these values, so a new report type only costs
+    its formatting.
+    """
+
+    person_name: str
+    tax_year: str
+    unique_tax_reference: str | None
+    plan: HMRCQuestionPlan
+    values: Mapping[str, Any]
+
+    @classmethod
+    def compute(cls, hmrc: HMRC) -> HMRCAnswerSet:
+        plan = hmrc.get_question_plan()
+
+        # Plan order matters: the tax digests pass unused allowance along
+        values = {
+            method_name: plan.get_answer(hmrc, method_name)
+            for method_name in plan.get_method_names()
+        }
+
+        return cls(
+            person_name=hmrc.person.get_name(),
+            tax_year=hmrc.tax_year,
+            unique_tax_reference=hmrc.person.get_unique_tax_reference(),
+            plan=plan,
+            values=MappingProxyType(values),
+        )
+
+    def get_answers(self, report_type: str) -> list[list[Any]]:
+        return [
+            [
+                planned.question,
+                planned.section,
+                planned.header,
+                planned.box,
+                self.values[planned.method_name],
+                planned.information,
+            ]
+            for planned in self.plan.get_questions(report_type)
+        ]
+
+    def get_output_data(self, report_type: str) -> HMRCOutputData:
+        return HMRCOutputData(
+            person_name=self.person_name,
+            report_type=report_type,
+            tax_year=self.tax_year,
+            unique_tax_reference=self.unique_tax_reference,
+            answers=self.get_answers(report_type),
+        )
@@ -0,0 +1,90 @@
+import re
+from bisect import bisect_left
+from decimal import Decimal
+
+from finances.classes.sqlite_table.transactions import Transactions
+from finances.util.financial_helpers import round_even
+
+
+class HMRCCategoryTotals:
+    """
+    Per tax year snapshot of transactions totals and counts by category.
+
+    One GROUP BY query loads the whole year on first use. LIKE patterns are
+    then answered in memory, using a sorted index for the literal prefix.
+    """
+
+    def __init__(self, tax_year: str) -> None:
+        self.tax_year = tax_year
+        self._loaded = False
+
+    def _get_indexes_like(self, category_like: str) -> list[int]:
+        self._load()
+
+        # LIKE is case-insensitive, so match against the lowercased keys
+        pattern = category_like.lower()
+        prefix = re.split(r"[%_]", pattern, maxsplit=1)[0]
+
+        start = bisect_left(self._keys, prefix)
+        indexes: list[int] = []
+        for index in range(start, len(self._keys)):
+            if not self._keys[index].startswith(prefix):
+                break
+            indexes.append(index)
+
+        if pattern == f"{prefix}%":
+            return indexes
+
+        regex = like_to_regex(pattern)
+        return [index for index in indexes if regex.fullmatch(self._keys[index])]
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+
+        rows = Transactions().fetch_totals_by_category(self.tax_year)
+        # A NULL category never matches = or LIKE, so leave it out
+        rows = sorted(
+            (row for row in rows if row[0] is not None),
+            key=lambda row: str(row[0]).lower(),
+        )
+
+        self._categories: list[str] = [str(row[0]) for row in rows]
+        self._keys = [category.lower() for category in self._categories]
+        self._totals: list[Decimal] = [row[1] for row in rows]
+        self._counts = [int(row[2]) for row in rows]
+        self._by_category = {
+            category: index for index, category in enumerate(self._categories)
+        }
+        self._loaded = True
+
+    def get_categories_like(self, category_like: str) -> list[str]:
+        return [self._categories[i] for i in self._get_indexes_like(category_like)]
+
+    def get_how_many_categories_like(self, category_like: str) -> int:
+        return len(self._get_indexes_like(category_like))
+
+    def get_how_many_transactions_like(self, category_like: str) -> int:
+        return sum(self._counts[i] for i in self._get_indexes_like(category_like))
+
+    def get_total(self, category: str) -> Decimal:
+        self._load()
+
+        index = self._by_category.get(category)
+        total = Decimal(0) if index is None else self._totals[index]
+        return round_even(total)
+
+    def get_total_like(self, category_like: str) -> Decimal:
+        indexes = self._get_indexes_like(category_like)
+        return round_even(sum((self._totals[i] for i in indexes), Decimal(0)))
+
+
+def like_to_regex(pattern: str) -> re.Pattern[str]:
+    """
+    Translate a SQL LIKE pattern into an equivalent regular expression.
+    """
+    parts = [
+        ".*" if part == "%" else "." if part == "_" else re.escape(part)
+        for part in re.split(r"([%_])", pattern)
+    ]
+    return re.compile("".join(parts), re.DOTALL)
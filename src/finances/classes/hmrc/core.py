@@ -2,29 +2,36 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from functools import cache
 from typing import Any
+from weakref import WeakValueDictionary
 
 # local imports
+from finances.classes.connection_registry import registry
 from finances.classes.gbp import GBP
+from finances.classes.hmrc.answer_set import HMRCAnswerSet
 from finances.classes.hmrc.booleans import HMRCBooleans as Booleans
+from finances.classes.hmrc.category_totals import HMRCCategoryTotals as CategoryTotals
 from finances.classes.hmrc.income import HMRCIncome as Income
 from finances.classes.hmrc.person import HMRCPerson as Person
+from finances.classes.hmrc.question_plan import HMRCQuestionPlan
 from finances.classes.hmrc.tax import HMRCTax as Tax
 from finances.classes.hmrc_calculation import HMRC_Calculation
-from finances.classes.hmrc_output import HMRCOutput, HMRCOutputData
+from finances.classes.hmrc_output import HMRCOutput
+from finances.classes.memo import memoized
 from finances.classes.sql_helper import select_sql_helper
 from finances.classes.sqlite_helper import to_table_name
 from finances.classes.sqlite_table.categories import Categories
 from finances.classes.sqlite_table.hmrc_constants_by_year import HMRCConstantsByYear
 from finances.classes.sqlite_table.hmrc_overrides_by_year import HMRCOverridesByYear
 from finances.classes.sqlite_table.hmrc_property import HMRC_Property
-from finances.classes.sqlite_table.hmrc_questions_by_year import HMRC_QuestionsByYear
 from finances.classes.sqlite_table.transactions import Transactions
 from finances.util import boolean_helpers, financial_helpers
 
 
 class HMRC:
+    # Live returns by (person_code, tax_year), so spouses share one instance
+    _instances: WeakValueDictionary[tuple[str, str], HMRC] = WeakValueDictionary()
+
     def __init__(self, person_code: str, tax_year: str) -> None:
         self.person_code = person_code
         self.tax_year = tax_year
@@ -41,6 +48,19 @@ class HMRC:
 
         self.sql = select_sql_helper("SQLite")
         self.transactions = Transactions()
+        self.category_totals = CategoryTotals(tax_year)
+
+    @classmethod
+    def get_instance(cls, person_code: str, tax_year: str) -> HMRC:
+        """
+        Return the live HMRC for person_code and tax_year, creating it if needed.
+        """
+        key = (person_code, tax_year)
+        hmrc = cls._instances.get(key)
+        if hmrc is None:
+            hmrc = cls(person_code, tax_year)
+            cls._instances[key] = hmrc
+        return hmrc
 
     def initialize_properties(self) -> None:
         self._booleans: Booleans | None = None
@@ -49,22 +69,25 @@ class HMRC:
 
     def _get_breakdown(self, category_like: str) -> str:
         tax_year = self.tax_year
-        query = (
+        query, params = (
             self.transactions.query_builder()
             .select("date", "key", "description", "note", "nett", "category")
-            .where(f'"tax_year"="{tax_year}" AND "category" LIKE "{category_like}%"')
+            .where(
+                '"tax_year" = :tax_year AND "category" LIKE :category_like',
+                {"tax_year": tax_year, "category_like": f"{category_like}%"},
+            )
             .order("date")
             .build()
         )
 
-        rows = self.sql.fetch_all(query)
+        rows = self.sql.fetch_all(query, params)
         if not rows:
             return ""
         max_description_width = 40
         max_category_width = max_description_width
         breakdown = ["Date | Account | Description | Note | Nett (£) | Category"]
         for row in rows:
-            nett_decimal = Decimal(row[4])
+            nett_decimal = financial_helpers.from_decimal_2(row[4])
             breakdown.append(
                 f"{row[0]} | {row[1]} | {row[2][:max_description_width]} | {row[3]} | {nett_decimal:>10.2f} | {row[5][:max_category_width]}"
             )
@@ -76,17 +99,9 @@ class HMRC:
     def are_there_digest_transactions(self, digest_type: str) -> bool:
         digest_category_like = self.get_digest_type_categories()[digest_type]
         person_code = self.person.code
-        tax_year = self.tax_year
-        query = (
-            self.transactions.query_builder()
-            .select_raw("COUNT(DISTINCT category)")
-            .where(
-                f'"tax_year"="{tax_year}"'
-                + f' AND "category" LIKE "HMRC {person_code}{digest_category_like}%"'
-            )
-            .build()
+        how_many = self.category_totals.get_how_many_categories_like(
+            f"HMRC {person_code}{digest_category_like}%"
         )
-        how_many = self.sql.fetch_one_value(query)
         return how_many > 0
 
     def are_there_dividends_transactions(self) -> bool:
@@ -319,11 +334,8 @@ class HMRC:
 
     def did_you_get_dividends_income(self) -> bool:
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} DIV income: "
-        total = self.transactions.fetch_total_by_tax_year_category_like(
-            tax_year, category_like
-        )
+        total = self.category_totals.get_total_like(f"{category_like}%")
         return total > 0
 
     def did_you_get_eea_furnished_holiday_lettings_income(self) -> bool:
@@ -530,13 +542,12 @@ class HMRC:
     def get_annual_payments_made(self) -> Any:
         return self.gbpb(0)
 
-    def get_answers(self) -> list[list[str]]:
-        questions = self.get_questions()
-        answers: list[list[str]] = []
-        for question, section, header, box, method_name, information in questions:
-            answer = self.call_method(method_name)
-            answers.append([question, section, header, box, answer, information])
-        return answers
+    @memoized
+    def get_answer_set(self) -> HMRCAnswerSet:
+        return HMRCAnswerSet.compute(self)
+
+    def get_answers(self, report_type: str) -> list[list[str]]:
+        return self.get_answer_set().get_answers(report_type)
 
     def get_any_employer_deducted_post_grad_loan(self) -> Any:
         return self.gbpb(0)
@@ -626,6 +637,7 @@ class HMRC:
     def get_business_end_date__in_this_tax_year_(self) -> Any:
         return self.gbpb(0)
 
+    @memoized
     def get_business_income(self) -> Any:
         return (
             self.get_trading_income()
@@ -666,6 +678,7 @@ class HMRC:
     def get_class_2_annual_amount(self) -> Any:
         return self.constants.class_2_annual_amount
 
+    @memoized
     def get_class_2_nics_due(self) -> Any:
         class_2_annual_amount = self.get_class_2_annual_amount()
 
@@ -703,6 +716,7 @@ class HMRC:
     def get_class_4_lower_rate(self) -> Percentage:
         return self.constants.class_4_lower_rate
 
+    @memoized
     def get_class_4_nics_due(self) -> Decimal:
         class_4_nics_lower_rate = self.get_class_4_lower_rate()
         class_4_nics_upper_rate = self.get_class_4_upper_rate()
@@ -918,13 +932,11 @@ class HMRC:
             tax_year, f"HMRC {person_code} INC Dividends from UK companies"
         )
 
+    @memoized
     def get_dividends_income(self) -> GBP:
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} DIV income: "
-        dividends_income = self.transactions.fetch_total_by_tax_year_category_like(
-            tax_year, category_like
-        )
+        dividends_income = self.category_totals.get_total_like(f"{category_like}%")
         return self.round_down(dividends_income, 0)
 
     def get_dividends_income_gbp(self) -> Any:
@@ -1055,6 +1067,7 @@ class HMRC:
         higher_tax_rate = self.constants.higher_tax_rate
         return higher_tax_rate
 
+    @memoized
     def get_hmrc_allowance(self) -> Any:
         personal_allowance = self.get_personal_allowance()
         allowance_enlargement = self.get_marriage_allowance_recipient_amount()
@@ -1068,19 +1081,11 @@ class HMRC:
     def get_hmrc_businesses(self) -> Any:
         hmrc_businesses = []
         person_code = self.person.code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} SES income: "
-        where = f'"Tax year"="{tax_year}" AND "Category" LIKE "{category_like}%"'
-        query = (
-            self.transactions.query_builder()
-            .select_raw("DISTINCT Category")
-            .where(where)
-            .build()
-        )
-        rows = self.sql.fetch_all(query)
+        categories = self.category_totals.get_categories_like(f"{category_like}%")
         start_position = len(category_like)
-        for row in rows:
-            business_name = row[0][start_position:]
+        for category in categories:
+            business_name = category[start_position:]
             hmrc_business = HMRC_Businesses(business_name)
             hmrc_businesses.append(hmrc_business)
         return hmrc_businesses
@@ -1089,6 +1094,7 @@ class HMRC:
         hmrc_calculation = HMRC_Calculation(self)
         return hmrc_calculation.get_output()
 
+    @memoized
     def get_hmrc_total_income(self) -> Decimal:
         total_income_received = self.get_hmrc_total_income_received()
         hmrc_allowance = self.get_hmrc_allowance()
@@ -1096,6 +1102,7 @@ class HMRC:
 
         return hmrc_total_income
 
+    @memoized
     def get_hmrc_total_income_received(self) -> Decimal:
         values = [
             self.get_trading_profit(),
@@ -1105,22 +1112,16 @@ class HMRC:
         ]
         return financial_helpers.sum_values(values)
 
+    @memoized
     def get_how_many_businesses(self) -> Any:
         hmrc_businesses = self.get_hmrc_businesses()
         return len(hmrc_businesses)
 
     def get_how_many_employments(self) -> Any:
         person_code = self.person.code
-        tax_year = self.tax_year
-        query = (
-            self.transactions.query_builder()
-            .select_raw("COUNT(DISTINCT Category)")
-            .where(
-                f'"Tax year"="{tax_year}" AND "Category" LIKE "HMRC {person_code} EMP%"'
-            )
-            .build()
+        how_many = self.category_totals.get_how_many_categories_like(
+            f"HMRC {person_code} EMP%"
         )
-        how_many = self.sql.fetch_one_value(query)
         return how_many
 
     def get_how_many_partnerships(self) -> Any:
@@ -1128,30 +1129,16 @@ class HMRC:
 
     def get_how_many_properties_do_you_rent_out(self) -> Any:
         person_code = self.person.code
-        tax_year = self.tax_year
-        query = (
-            self.transactions.query_builder()
-            .select_raw("COUNT(DISTINCT Category)")
-            .where(
-                f'"Tax year"="{tax_year}" AND "Category" LIKE "HMRC {person_code} UKP income%"'
-            )
-            .build()
+        how_many = self.category_totals.get_how_many_categories_like(
+            f"HMRC {person_code} UKP income%"
         )
-        how_many = self.sql.fetch_one_value(query)
         return how_many
 
     def get_how_many_self_employed_businesses_did_you_have(self) -> int:
         person_code = self.person.code
-        tax_year = self.tax_year
-        query = (
-            self.transactions.query_builder()
-            .select_raw("COUNT(DISTINCT Category)")
-            .where(
-                f'"Tax year"="{tax_year}" AND "Category" LIKE "HMRC {person_code} SES income%"'
-            )
-            .build()
+        how_many = self.category_totals.get_how_many_categories_like(
+            f"HMRC {person_code} SES income%"
         )
-        how_many = self.sql.fetch_one_value(query)
         return how_many
 
     def get_how_many_years_policy_was_last_held_or_received_gain(self) -> Any:
@@ -1175,6 +1162,7 @@ class HMRC:
         pay_voluntarily_nics = self.do_you_want_to_pay_class_2_nics_voluntarily()
         return trading_income <= trading_allowance and pay_voluntarily_nics
 
+    @memoized
     def get_income_tax(self) -> GBP:
         non_savings_income = self.get_non_savings_income()
         savings_income = self.get_savings_income()
@@ -1265,6 +1253,7 @@ class HMRC:
         parts.append(f"transferred to: {transferred_to}")
         return "\n" + " | ".join(parts)
 
+    @memoized
     def get_marriage_allowance_donor_amount(self) -> Decimal:
         if not self.person.is_married():
             return Decimal(0)
@@ -1294,7 +1283,7 @@ class HMRC:
     def get_marriage_allowance_donor_amount_gbp(self) -> str:
         return self.gbpb(self.get_marriage_allowance_donor_amount())
 
-    @cache
+    @memoized
     def get_marriage_allowance_recipient_amount(self) -> Decimal:
         if not self.person.is_married():
             return Decimal(0)
@@ -1332,6 +1321,7 @@ class HMRC:
     def get_net_business_loss_for_tax_purposes_gbp(self) -> Any:
         return self.gbpb(self.get_net_business_loss_for_tax_purposes())
 
+    @memoized
     def get_net_business_profit_for_tax_purposes(self) -> Any:
         income = self.get_business_income()
         if self.use_trading_allowance():
@@ -1377,6 +1367,7 @@ class HMRC:
     def get_non_residential_finance_property_costs_gbp(self) -> Any:
         return self.gbpb(0)
 
+    @memoized
     def get_non_savings_income(self) -> GBP:
         values = [self.get_trading_profit(), self.get_property_profit()]
         non_savings_income = GBP(sum(values))
@@ -1480,12 +1471,11 @@ class HMRC:
     def get_payments_to_overseas_pension_scheme(self) -> Any:
         return 0
 
+    @memoized
     def get_payments_to_pension_schemes__relief_at_source(self) -> Decimal:
         person_code = self.person_code
-        payments_to_pension_schemes = (
-            self.transactions.fetch_total_by_tax_year_category_like(
-                self.tax_year, f"HMRC {person_code} RLF pension"
-            )
+        payments_to_pension_schemes = self.category_totals.get_total_like(
+            f"HMRC {person_code} RLF pension%"
         )
         return payments_to_pension_schemes
 
@@ -1503,8 +1493,8 @@ class HMRC:
 
     def get_pension_contributions(self) -> Any:
         person_code = self.person_code
-        pension_contributions = self.transactions.fetch_total_by_tax_year_category(
-            self.tax_year, f"HMRC {person_code} RLF pension contribution"
+        pension_contributions = self.category_totals.get_total(
+            f"HMRC {person_code} RLF pension contribution"
         )
         return pension_contributions
 
@@ -1513,15 +1503,13 @@ class HMRC:
 
     def get_private_pensions_income(self) -> Any:
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} PEN income: "
-        return self.transactions.fetch_total_by_tax_year_category_like(
-            tax_year, category_like
-        )
+        return self.category_totals.get_total_like(f"{category_like}%")
 
     def get_private_pensions_income__other_than_state_pension_(self) -> Any:
         return 0
 
+    @memoized
     def get_personal_allowance(self) -> Any:
         return self.constants.personal_allowance
 
@@ -1564,6 +1552,7 @@ class HMRC:
     def get_property_adjustments_gbp(self) -> Any:
         return self.gbpb(0)
 
+    @memoized
     def get_property_allowance(self) -> Any:
         actual_property_allowance = self.get_property_allowance_actual()
         actual_property_expenses = self.get_property_expenses_actual()
@@ -1572,6 +1561,7 @@ class HMRC:
         else:
             return 0
 
+    @memoized
     def get_property_allowance_actual(self) -> Any:
         return self.constants.property_income_allowance
 
@@ -1591,6 +1581,7 @@ class HMRC:
     def get_property_digest(self) -> str:
         return self.get_digest_by_type("property")
 
+    @memoized
     def get_property_expenses(self) -> Any:
         actual_property_allowance = self.get_property_allowance_actual()
         actual_property_expenses = self.get_property_expenses_actual()
@@ -1599,6 +1590,7 @@ class HMRC:
         else:
             return 0
 
+    @memoized
     def get_property_expenses_actual(self) -> GBP:
         property_expenses = [
             self.get_rent__rates__insurance_and_ground_rents(),
@@ -1619,13 +1611,11 @@ class HMRC:
     def get_total_property_expenses_gbp(self) -> Any:
         return self.gbpb(self.get_property_expenses())
 
+    @memoized
     def get_property_income(self) -> Decimal:
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} UKP income"
-        property_income = self.transactions.fetch_total_by_tax_year_category_like(
-            tax_year, category_like
-        )
+        property_income = self.category_totals.get_total_like(f"{category_like}%")
         return Decimal(self.round_down(property_income))
 
     def get_property_income_breakdown(self) -> Any:
@@ -1636,7 +1626,7 @@ class HMRC:
     def get_property_income_gbp(self) -> str:
         return self.gbpb(self.get_property_income())
 
-    @cache
+    @memoized
     def get_property_profit(self) -> Any:
         property_allowance = self.get_property_allowance_actual()
         property_expenses = self.get_property_expenses_actual()
@@ -1672,22 +1662,27 @@ class HMRC:
     def get_qualifying_loan_interest_payable_in_the_year(self) -> Any:
         return self.gbpb(0)
 
-    def get_questions(self) -> Any:
-        report_type = self.report_type
-        match report_type:
-            case HMRCOutput.HMRC_CALCULATION:
-                questions = HMRC_QuestionsByYear(
-                    self.tax_year
-                ).get_hmrc_calculation_questions()
-            case HMRCOutput.HMRC_ONLINE_ANSWERS:
-                questions = HMRC_QuestionsByYear(self.tax_year).get_online_questions()
-            case HMRCOutput.HMRC_TAX_RETURN:
-                questions = HMRC_QuestionsByYear(
-                    self.tax_year
-                ).get_printed_form_questions()
-            case _:
-                raise ValueError(f"Unexpected report type: {report_type}")
-        return questions
+    def get_question_plan(self) -> HMRCQuestionPlan:
+        tax_year = self.tax_year
+        target = type(self)
+        return registry.get_shared(
+            f"HMRCQuestionPlan {tax_year}",
+            lambda: HMRCQuestionPlan.compile(tax_year, target),
+        )
+
+    def get_questions(self, report_type: str) -> Any:
+        plan = self.get_question_plan()
+        return [
+            [
+                planned.question,
+                planned.section,
+                planned.header,
+                planned.box,
+                planned.method_name,
+                planned.information,
+            ]
+            for planned in plan.get_questions(report_type)
+        ]
 
     def get_redundancy_payments(self) -> Any:
         return self.gbpb(0)
@@ -1723,19 +1718,15 @@ class HMRC:
 
     def get_rented_property_postcode(self) -> Any:
         person_code = self.person.code
-        tax_year = self.tax_year
-        query = (
-            self.transactions.query_builder()
-            .select_raw("DISTINCT Category")
-            .where(
-                f'"Tax year"="{tax_year}"'
-                + f' AND "Category" LIKE "HMRC {person_code} UKP income: rent received %"'
-            )
-            .build()
+        categories = self.category_totals.get_categories_like(
+            f"HMRC {person_code} UKP income: rent received %"
         )
-        category = self.sql.fetch_one_value(query)
+        if not categories:
+            raise ValueError(
+                f"No rent received category for {person_code} in {self.tax_year}"
+            )
         prefix_length = len("HMRC B UKP income: rent received ")
-        rented_property_postcode = category[prefix_length:]
+        rented_property_postcode = categories[0][prefix_length:]
         return rented_property_postcode
 
     def get_residential_property_finance_costs(self) -> Any:
@@ -1769,13 +1760,11 @@ class HMRC:
     def get_savings_digest(self) -> Any:
         return self.get_digest_by_type("savings")
 
+    @memoized
     def get_savings_income(self) -> GBP:
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} INT income"
-        savings_income = self.transactions.fetch_total_by_tax_year_category_like(
-            tax_year, category_like
-        )
+        savings_income = self.category_totals.get_total_like(f"{category_like}%")
         return GBP(self.round_down(savings_income, 0))
 
     def get_savings_income_breakdown(self) -> Any:
@@ -1840,7 +1829,7 @@ class HMRC:
     def get_small_profits_threshold(self) -> Any:
         return self.constants.small_profits_threshold
 
-    @cache
+    @memoized
     def get_spouse_total_income_received(self) -> Decimal:
         spouse_hmrc = self.person.get_spouse_hmrc(self.tax_year)
         spouse_total_income_received = spouse_hmrc.get_hmrc_total_income_received()
@@ -1851,11 +1840,8 @@ class HMRC:
 
     def get_taxable_benefits_income(self) -> Any:
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} BEN income: "
-        return self.transactions.fetch_total_by_tax_year_category_like(
-            tax_year, category_like
-        )
+        return self.category_totals.get_total_like(f"{category_like}%")
 
     def get_state_pension(self) -> Any:
         return 0
@@ -1979,6 +1965,7 @@ class HMRC:
     def get_taxable_profits_or_net_loss__before_set_offs__gbp(self) -> Any:
         return self.gbpb(self.get_net_business_profit_for_tax_purposes())
 
+    @memoized
     def get_taxable_savings(self) -> Any:
         savings_allowance = self.get_savings_allowance()
         savings_income = self.get_savings_income()
@@ -2037,12 +2024,8 @@ class HMRC:
         return self.gbpb(self.get_hmrc_total_income_received())
 
     def get_total_of_any__one_off__payments_in_box_1(self) -> Any:
-        my_payments = self.transactions.fetch_total_by_tax_year_category(
-            self.tax_year, "HMRC S pension contribution"
-        )
-        hmrc_contribution = self.transactions.fetch_total_by_tax_year_category(
-            self.tax_year, "HMRC S pension tax relief"
-        )
+        my_payments = self.category_totals.get_total("HMRC S pension contribution")
+        hmrc_contribution = self.category_totals.get_total("HMRC S pension tax relief")
         return my_payments + hmrc_contribution
 
     def get_total_of_any__one_off__payments_in_box_5(self) -> Any:
@@ -2118,13 +2101,11 @@ class HMRC:
         total = self.get_total_to_add_to_sa_account_due_by_31st_january()
         return self.gbpb(total)
 
+    @memoized
     def get_total_transactions_by_category_like(self, category_like) -> Decimal:
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} {category_like}"
-        total = self.transactions.fetch_total_by_tax_year_category_like(
-            tax_year, category_like
-        )
+        total = self.category_totals.get_total_like(f"{category_like}%")
         return total
 
     def get_total_uk_property_income_gbp(self) -> Any:
@@ -2144,6 +2125,7 @@ class HMRC:
         else:
             return 0
 
+    @memoized
     def get_trading_allowance_actual(self) -> Any:
         trading_income_allowance = self.constants.trading_income_allowance
         return trading_income_allowance
@@ -2169,16 +2151,14 @@ class HMRC:
         else:
             return 0
 
+    @memoized
     def get_trading_expenses_actual(self) -> Decimal:
         if self.get_how_many_self_employed_businesses_did_you_have() > 1:
             raise ValueError("More than one business. Review the code")
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} SES expense"
-        trading_expenses_actual = (
-            self.transactions.fetch_total_by_tax_year_category_like(
-                tax_year, category_like
-            )
+        trading_expenses_actual = self.category_totals.get_total_like(
+            f"{category_like}%"
         )
         return self.round_up(trading_expenses_actual)
 
@@ -2193,15 +2173,13 @@ class HMRC:
     def get_trading_expenses_gbp(self) -> Any:
         return self.gbpb(self.get_trading_expenses())
 
+    @memoized
     def get_trading_income(self) -> Decimal:
         if self.get_how_many_self_employed_businesses_did_you_have() > 1:
             raise ValueError("More than one business. Review the code")
         person_code = self.person_code
-        tax_year = self.tax_year
         category_like = f"HMRC {person_code} SES income"
-        trading_income = self.transactions.fetch_total_by_tax_year_category_like(
-            tax_year, category_like
-        )
+        trading_income = self.category_totals.get_total_like(f"{category_like}%")
         return self.round_down(trading_income)
 
     def get_trading_income__turnover__gbp(self) -> str:
@@ -2262,6 +2240,7 @@ class HMRC:
     def get_trading_losses_brought_forward_and_set_off_gbp(self) -> Any:
         return self.gbpb(0)
 
+    @memoized
     def get_trading_outgo(self) -> Any:
         if self.use_trading_allowance():
             trading_allowance = self.get_trading_allowance_actual()
@@ -2275,7 +2254,7 @@ class HMRC:
 
         return trading_outgo
 
-    @cache
+    @memoized
     def get_trading_profit(self) -> Any:
         trading_income = self.get_trading_income()
         trading_outgo = self.get_trading_outgo()
@@ -2338,6 +2317,7 @@ class HMRC:
         untaxed_foreign_interest = self.get_untaxed_foreign_interest()
         return self.gbpb(untaxed_foreign_interest)
 
+    @memoized
     def get_untaxed_uk_interest(self) -> Any:
         person_code = self.person_code
         tax_year = self.tax_year
@@ -2374,7 +2354,11 @@ class HMRC:
         weekly_state_pension_forecast = self.person.get_weekly_state_pension_forecast()
         return Decimal(weekly_state_pension_forecast)
 
+    @memoized
     def get_year_category_total(self, tax_year, category):
+        if tax_year == self.tax_year:
+            return self.category_totals.get_total(category)
+
         return self.transactions.fetch_total_by_tax_year_category(tax_year, category)
 
     def get_years_voided_isas_held(self) -> Any:
@@ -2492,29 +2476,16 @@ class HMRC:
         return self.gbpb(0)
 
     def list_categories(self) -> Any:
-        query = (
-            self.transactions.query_builder()
-            .select_raw("DISTINCT Category")
-            .where(
-                f'"Tax year" = "{self.tax_year}" AND "Category" LIKE "HMRC {self.person_code}%" ORDER BY Category'
-            )
-            .build()
+        categories = sorted(
+            self.category_totals.get_categories_like(f"HMRC {self.person_code}%")
         )
-        categories = self.sql.fetch_all(query)
-        for row in categories:
-            print(row[0])
+        for category in categories:
+            print(category)
 
     def print_reports(self) -> None:
+        answer_set = self.get_answer_set()
         for report_type in HMRCOutput.REPORT_TYPES:
-            self.report_type = report_type
-            hmrc_output_data = HMRCOutputData(
-                person_name=self.person.get_name(),
-                report_type=report_type,
-                tax_year=self.tax_year,
-                unique_tax_reference=self.person.get_unique_tax_reference(),
-                answers=self.get_answers(),
-            )
-            hmrc_output = HMRCOutput(hmrc_output_data)
+            hmrc_output = HMRCOutput(answer_set.get_output_data(report_type))
             hmrc_output.print_report()
 
     def receives_child_benefit(self) -> Any:
@@ -2592,17 +2563,9 @@ class HMRC:
 
     def were_you_employed_in_this_tax_year(self) -> bool:
         person_code = self.person.code
-        tax_year = self.tax_year
-        query = (
-            self.transactions.query_builder()
-            .select_raw("COUNT(*)")
-            .where(
-                f'"Tax year"="{tax_year}" '
-                f'AND "Category" LIKE "HMRC {person_code} EMP%income"'
-            )
-            .build()
+        how_many = self.category_totals.get_how_many_transactions_like(
+            f"HMRC {person_code} EMP%income"
         )
-        how_many = self.sql.fetch_one_value(query)
         return how_many > 0
 
     def were_you_in_partnership_s__this_tax_year(self) -> bool:
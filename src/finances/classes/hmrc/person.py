@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from functools import cache
 from typing import Any
 
+from finances.classes.memo import memoized
 from finances.classes.sqlite_table.bank_accounts import BankAccounts
 from finances.classes.sqlite_table.hmrc_people_details import HMRCPeopleDetails
 
@@ -45,12 +45,12 @@ class HMRCPerson(People):
     def get_spouse_code(self) -> str | None:
         return self.hmrc_person_details.get_spouse_code()
 
-    @cache
+    @memoized
     def get_spouse_hmrc(self, tax_year: str) -> HMRC | None:
         from finances.classes.hmrc.core import HMRC
 
         return (
-            HMRC(spouse_code, tax_year)
+            HMRC.get_instance(spouse_code, tax_year)
             if (spouse_code := self.get_spouse_code())
             else None
         )
@@ -0,0 +1,164 @@
+# standard imports
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+# local imports
+from finances.classes.config import Config
+from finances.classes.hmrc_output import HMRCOutput
+from finances.classes.sqlite_helper import to_table_name
+from finances.classes.sqlite_table import hmrc_questions_by_year
+from finances.classes.sqlite_table.hmrc_questions_by_year import HMRC_QuestionsByYear
+from finances.util import string_helpers
+
+# Method names depend on this code, so a change to it invalidates the cache
+CODE_PATHS = [
+    Path(__file__).with_name("core.py"),
+    Path(hmrc_questions_by_year.__file__),
+    Path(string_helpers.__file__),
+]
+
+
+@dataclass(frozen=True)
+class PlannedQuestion:
+    question: str
+    section: str
+    header: str
+    box: str
+    method_name: str
+    information: str
+
+
+@dataclass(frozen=True)
+class HMRCQuestionPlan:
+    """
+    Every report type's questions for a tax year, with their HMRC method names.
+
+    The method names are cached on disk, keyed by the questions' content
+    and the code that derives them, so unchanged questions skip
+    to_method_name entirely.
+    """
+
+    tax_year: str
+    questions: Mapping[str, tuple[PlannedQuestion, ...]]
+    # Methods the target class lacks; their questions answer "Method not found"
+    missing_methods: frozenset[str] = frozenset()
+
+    @classmethod
+    def compile(cls, tax_year: str, target: type) -> "HMRCQuestionPlan":
+        """
+        Compile the plan, recording the questions that have no method on target.
+        """
+        questions_table = HMRC_QuestionsByYear(tax_year)
+        calculation_questions = questions_table.get_hmrc_calculation_questions()
+        online_rows = questions_table.fetch_online_question_rows()
+        printed_rows = questions_table.fetch_printed_form_question_rows()
+        rows: dict[str, list[Any]] = {
+            HMRCOutput.HMRC_CALCULATION: [
+                [*question[:4], question[5]] for question in calculation_questions
+            ],
+            HMRCOutput.HMRC_ONLINE_ANSWERS: online_rows,
+            HMRCOutput.HMRC_TAX_RETURN: printed_rows,
+        }
+
+        cache_path = get_cache_path(tax_year, rows)
+        method_names = read_method_names(cache_path)
+        if method_names is None:
+            method_names = {
+                HMRCOutput.HMRC_CALCULATION: [
+                    question[4] for question in calculation_questions
+                ],
+                HMRCOutput.HMRC_ONLINE_ANSWERS: [
+                    questions_table.to_method_name(row[0]) for row in online_rows
+                ],
+                HMRCOutput.HMRC_TAX_RETURN: [
+                    questions_table.to_method_name(row[0]) for row in printed_rows
+                ],
+            }
+            write_method_names(cache_path, method_names)
+
+        plan = cls(
+            tax_year,
+            MappingProxyType(
+                {
+                    report_type: tuple(
+                        PlannedQuestion(row[0], row[1], row[2], row[3], name, row[4])
+                        for row, name in zip(
+                            report_rows, method_names[report_type], strict=True
+                        )
+                    )
+                    for report_type, report_rows in rows.items()
+                }
+            ),
+        )
+
+        missing = [
+            name for name in plan.get_method_names() if not hasattr(target, name)
+        ]
+        if missing:
+            print(
+                f"{len(missing)} questions for {tax_year} have no"
+                f" {target.__name__} method: {', '.join(missing)}"
+            )
+
+        return replace(plan, missing_methods=frozenset(missing))
+
+    def get_answer(self, instance: object, method_name: str) -> Any:
+        """
+        Call method_name on instance, or say it is missing, like call_method.
+        """
+        if method_name in self.missing_methods:
+            return f"Method not found: {method_name} - check log file"
+
+        return getattr(instance, method_name)()
+
+    def get_method_names(self) -> list[str]:
+        """
+        Every method the plan calls, once each, in first-use order.
+        """
+        method_names = {
+            planned.method_name: None
+            for questions in self.questions.values()
+            for planned in questions
+        }
+        return list(method_names)
+
+    def get_questions(self, report_type: str) -> tuple[PlannedQuestion, ...]:
+        if report_type not in self.questions:
+            raise ValueError(f"Unexpected report type: {report_type}")
+
+        return self.questions[report_type]
+
+
+def get_cache_path(tax_year: str, rows: Mapping[str, list[Any]]) -> Path:
+    content = json.dumps([tax_year, rows], default=str, sort_keys=True)
+    digest = hashlib.sha256(content.encode())
+    for path in CODE_PATHS:
+        digest.update(path.read_bytes())
+
+    cache_dir = Path(Config().get("HMRC_QUESTION_PLAN_CACHE_DIR", "output/cache/hmrc"))
+    return (
+        cache_dir / f"question_plan{to_table_name(tax_year)}_{digest.hexdigest()}.json"
+    )
+
+
+def read_method_names(cache_path: Path) -> dict[str, list[str]] | None:
+    if not cache_path.exists():
+        return None
+
+    method_names: dict[str, list[str]] = json.loads(cache_path.read_text())
+    return method_names
+
+
+def write_method_names(cache_path: Path, method_names: dict[str, list[str]]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write then rename, so a concurrent reader never sees a partial file
+    temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(method_names))
+    os.replace(temp_path, cache_path)
@@ -1,5 +1,7 @@
+import io
+import os
 from dataclasses import dataclass
-from functools import cache
+from pathlib import Path
 from typing import Any
 
 from finances.util.string_helpers import crop
@@ -44,6 +46,9 @@ class HMRCOutput:
         self.previous_section = ""
         self.previous_header = ""
 
+        # Lines are written here, and only reach disk in write_report
+        self.buffer = io.StringIO()
+
     def get_title(self) -> str:
         unique_tax_reference = self.unique_tax_reference
         person_name = self.person_name
@@ -67,8 +72,7 @@ class HMRCOutput:
             raise HTMLOutputError("Answer formatting error: string_list is too short.")
 
     def print(self, txt: str) -> None:
-        with open(self.get_report_name(), "a") as file:
-            print(txt, file=file)
+        print(txt, file=self.buffer)
 
     def print_end_of_tax_return(self) -> None:
         title = self.get_title()
@@ -115,27 +119,26 @@ class HMRCOutput:
             print("No answers found ==> No report generated.")
             return
 
-        self.truncate_report()
+        self.write_report(self.render())
+
+    def render(self) -> str:
+        """
+        Render the report to a string, without touching disk.
+        """
+        self.buffer = io.StringIO()
         self.print_title()
-        for answer_number, (
-            question,
-            section,
-            header,
-            box,
-            answer,
-            information,
-        ) in enumerate(answers, start=1):
+        for question, section, header, box, answer, information in self.answers:
             self.print_formatted_answer(
                 question, section, header, box, answer, information
             )
         self.print_end_of_tax_return()
+        return self.buffer.getvalue()
 
     def print_title(self) -> None:
         self.print(self.get_title())
         self.previous_section = ""
         self.previous_header = ""
 
-    @cache
     def get_report_name(self) -> str:
         """
         Gets the report file name based on the person's name, report type, and tax year.
@@ -158,18 +161,22 @@ class HMRCOutput:
         # Log the generated file name
         print(f"Generated report file name: {self.get_report_name()}")
 
-    def truncate_report(self) -> None:
-        """
-        Creates an empty file with the report name, overwriting if it already exists.
+    def write_report(self, text: str) -> None:
         """
+        Write text to the report file in one go.
 
-        report_name = self.get_report_name()
+        The text goes to a temporary file that then replaces the report, so a
+        reader never sees a partly written report.
+        """
+        report_name = Path(self.get_report_name())
+        temp_name = report_name.with_suffix(f".{os.getpid()}.tmp")
 
-        # Create or overwrite the file to ensure it's empty
         try:
-            with open(report_name, "w"):
-                pass  # Truncate the file if it exists, or create it if it doesn't
-        except Exception as e:
+            report_name.parent.mkdir(parents=True, exist_ok=True)
+            temp_name.write_text(text)
+            os.replace(temp_name, report_name)
+        except OSError as e:
+            temp_name.unlink(missing_ok=True)
             raise HTMLOutputError(
-                f"Failed to create the report file: {report_name}"
+                f"Failed to write the report file: {report_name}"
             ) from e
@@ -0,0 +1,76 @@
+# standard imports
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, Concatenate, cast
+
+
+class Memo:
+    """
+    Cached getter results for one instance, with hit and miss counters.
+
+    The memo lives in the instance's __dict__, so cached values are freed
+    with the instance instead of being held by a process-wide cache.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[tuple[str, tuple[Any, ...]], Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"<Memo {len(self)} values, {self.hits} hits, {self.misses} misses>"
+
+    def get_stats(self) -> dict[str, int]:
+        return {"values": len(self), "hits": self.hits, "misses": self.misses}
+
+    def invalidate(self, method_name: str | None = None) -> None:
+        """
+        Forget the cached results of method_name, or of every method.
+        """
+        if method_name is None:
+            self._values.clear()
+            return
+
+        for key in [key for key in self._values if key[0] == method_name]:
+            del self._values[key]
+
+
+def get_memo(instance: object) -> Memo:
+    """
+    Return the Memo for instance, creating it on first use.
+    """
+    memo: Memo | None = instance.__dict__.get("_memo")
+    if memo is None:
+        memo = Memo()
+        instance.__dict__["_memo"] = memo
+    return memo
+
+
+def memoized[**P, R](
+    method: Callable[Concatenate[Any, P], R],
+) -> Callable[Concatenate[Any, P], R]:
+    """
+    Cache a pure getter's result per instance and per positional arguments.
+
+    Exceptions are not cached, so a failing lookup is retried next time.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self: Any, *args: P.args, **kwargs: P.kwargs) -> R:
+        memo = get_memo(self)
+        key = (name, args + tuple(sorted(kwargs.items())))
+        if key in memo._values:
+            memo.hits += 1
+            value: R = memo._values[key]
+            return value
+
+        memo.misses += 1
+        value = method(self, *args, **kwargs)
+        memo._values[key] = value
+        return value
+
+    return cast(Callable[Concatenate[Any, P], R], wrapper)
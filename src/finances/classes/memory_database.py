@@ -0,0 +1,71 @@
+"""
+A copy of the database held in memory, for read-only report runs.
+
+MemoryDatabase copies the file with the backup API into a named
+shared-cache memory database. While SQLITE_IN_MEMORY names it, every
+SQLiteHelper and SQLAlchemyHelper in the process connects to that copy
+instead of the file. The copy lasts until MemoryDatabase is closed.
+"""
+
+# standard imports
+import sqlite3
+from pathlib import Path
+
+# local imports
+from finances.classes.config import Config
+from finances.classes.exception_helper import ExceptionHelper
+
+
+class MemoryDatabaseError(ExceptionHelper):
+    pass
+
+
+class MemoryDatabase:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.uri = get_memory_uri(name)
+        # Holds the database open; it vanishes with the last connection
+        self.keeper: sqlite3.Connection | None = None
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.keeper else "closed"
+        return f"<MemoryDatabase {self.name} {state}>"
+
+    def close(self) -> None:
+        if self.keeper:
+            self.keeper.close()
+            self.keeper = None
+
+    def load(self, db_path: str) -> None:
+        """
+        Copy the database at db_path into memory, replacing any earlier copy.
+        """
+        if not Path(db_path).exists():
+            raise MemoryDatabaseError(f"No database at {db_path} to load")
+
+        self.close()
+        self.keeper = sqlite3.connect(self.uri, uri=True)
+        disk = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            disk.backup(self.keeper)
+        finally:
+            disk.close()
+
+
+def get_memory_name() -> str:
+    """
+    The memory database SQLITE_IN_MEMORY names, or "" to use the file.
+    """
+    name: str = Config().get("SQLITE_IN_MEMORY", "")
+    return name
+
+
+def get_memory_uri(name: str) -> str:
+    return f"file:{name}?mode=memory&cache=shared"
+
+
+def get_memory_url(name: str) -> str:
+    """
+    The SQLAlchemy URL of the memory database.
+    """
+    return f"sqlite:///{get_memory_uri(name)}&uri=true"
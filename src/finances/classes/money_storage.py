@@ -0,0 +1,159 @@
+"""
+Money columns stored as TEXT pounds, or as INTEGER pence.
+
+TEXT is the default. With SQLITE_MONEY_STORAGE=pence, registry money fields
+(from_db "from_decimal_2") are written as INTEGER pence, so SUM is exact
+integer arithmetic, and amounts become Decimal only when read.
+"""
+
+# standard imports
+import sqlite3
+from collections.abc import Callable
+from typing import Any, Protocol
+
+# local imports
+from finances.classes.config import Config
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.table_migration import TableMigration, apply_migrations
+from finances.util.financial_helpers import from_pence, text_to_pence
+
+MONEY_FROM_DB = "from_decimal_2"
+
+STORAGE_PENCE = "pence"
+STORAGE_TEXT = "text"
+MONEY_STORAGES = [STORAGE_TEXT, STORAGE_PENCE]
+
+SQLITE_TYPES = {STORAGE_PENCE: "INTEGER", STORAGE_TEXT: "TEXT"}
+
+
+class MoneyFields(Protocol):
+    def __contains__(self, key: tuple[str, str]) -> bool: ...
+
+    def get_from_db(self, table_name: str, column_name: str) -> str: ...
+
+
+def get_money_storage() -> str:
+    storage = Config().get("SQLITE_MONEY_STORAGE", STORAGE_TEXT)
+    if storage not in MONEY_STORAGES:
+        raise ValueError(
+            f"SQLITE_MONEY_STORAGE must be one of {MONEY_STORAGES}, not {storage}"
+        )
+    return str(storage)
+
+
+def get_column_storage(sql: SQLiteHelper, table_name: str, column_name: str) -> str:
+    """
+    How a money column is actually stored, from its declared type.
+
+    The configured storage only says how the next ingest or migration
+    writes, so reading by it would misread a database not yet migrated.
+    A column that does not exist yet falls back to the configured storage.
+    """
+    column_info = sql.get_column_info(table_name, column_name)
+    if column_info is None:
+        return get_money_storage()
+    return (
+        STORAGE_PENCE if column_info[2] == SQLITE_TYPES[STORAGE_PENCE] else STORAGE_TEXT
+    )
+
+
+def get_money_columns(sql: SQLiteHelper, fields: MoneyFields) -> dict[str, list[str]]:
+    """
+    The registry money columns of every existing table, by table name.
+    """
+    money_columns: dict[str, list[str]] = {}
+    for table_name in sql.get_table_names():
+        columns = [
+            row[1]
+            for row in sql.get_table_info(table_name)
+            if (table_name, row[1]) in fields
+            and fields.get_from_db(table_name, row[1]) == MONEY_FROM_DB
+        ]
+        if columns:
+            money_columns[table_name] = columns
+    return money_columns
+
+
+def is_money_field(fields: MoneyFields, table_name: str, column_name: str) -> bool:
+    return (table_name, column_name) in fields and (
+        fields.get_from_db(table_name, column_name) == MONEY_FROM_DB
+    )
+
+
+def migrate_money_columns(
+    sql: SQLiteHelper, fields: MoneyFields, storage: str
+) -> list[str]:
+    """
+    Convert every registry money column to storage, in one transaction.
+
+    Columns already stored that way are left alone, so running it again does
+    nothing. A value that is not a whole number of pence stops the migration
+    and leaves every table as it was.
+
+    Args:
+        sql (SQLiteHelper): The helper, inside a session.
+        fields (MoneyFields): The registry of each column's types.
+        storage (str): "pence" or "text".
+
+    Returns:
+        list[str]: The tables that were converted.
+    """
+    if storage not in MONEY_STORAGES:
+        raise ValueError(f"storage must be one of {MONEY_STORAGES}, not {storage}")
+    if not sql.in_session():
+        raise ValueError("migrate_money_columns needs a session, for one transaction")
+
+    sqlite_type = SQLITE_TYPES[storage]
+    to_storage: Callable[[Any], Any] = (
+        text_to_pence if storage == STORAGE_PENCE else to_pounds_text
+    )
+
+    tables = {
+        table_name: columns
+        for table_name, columns in get_money_columns(sql, fields).items()
+        if any(
+            sql.get_column_info(table_name, column)[2] != sqlite_type
+            for column in columns
+        )
+    }
+
+    connection = sql.db_connection
+    failures: list[str] = []
+
+    def convert(value: Any) -> Any:
+        try:
+            return to_storage(value)
+        except ValueError as e:
+            failures.append(str(e))
+            raise
+
+    connection.create_function("to_money_storage", 1, convert, deterministic=True)
+
+    migrations = []
+    for table_name, columns in tables.items():
+        migration = TableMigration(table_name)
+        for column in columns:
+            migration.change_type(
+                column, sqlite_type, using=f'to_money_storage("{column}")'
+            )
+        migrations.append(migration)
+
+    try:
+        apply_migrations(connection, migrations)
+    except sqlite3.OperationalError as e:
+        # sqlite3 hides the function's error behind a generic one
+        if failures:
+            raise ValueError(f"Cannot convert money columns: {failures[0]}") from e
+        raise
+
+    return list(tables)
+
+
+def to_pounds_text(value: int | str | None) -> str | None:
+    """
+    Convert integer pence back to pounds text, such as "1.50".
+    """
+    if value is None or isinstance(value, str):
+        return value
+
+    return str(from_pence(value))
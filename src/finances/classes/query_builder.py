@@ -1,4 +1,5 @@
-from typing import Self
+from collections.abc import Mapping
+from typing import Any, Self
 
 from finances.classes.sqlalchemy_helper import validate_table_name
 
@@ -8,6 +9,7 @@ class QueryBuilder:
         self.table_name = table_name
         self.columns: list[str] = []
         self.conditions: list[str] = []
+        self.params: dict[str, Any] = {}
         self.group_by: list[str] = []
         self.order_by = None
         self.limit: int | None = None
@@ -26,8 +28,25 @@ class QueryBuilder:
         self.columns = [f'COALESCE(SUM("{column}"), 0)']
         return self
 
-    def where(self, condition: str) -> Self:
+    def where(self, condition: str, params: Mapping[str, Any] | None = None) -> Self:
+        """
+        Add a condition, with values passed as :name placeholders in params.
+
+        Keeping values out of the SQL text means every call with the same
+        condition shares one prepared statement.
+        """
         self.conditions.append(condition)
+
+        for name, value in (params or {}).items():
+            if name in self.params and self.params[name] != value:
+                raise ValueError(f"Conflicting values for query parameter '{name}'")
+            self.params[name] = value
+
+        return self
+
+    def group(self, *columns: str) -> Self:
+        [validate_table_name(col) for col in columns]
+        self.group_by = [f'"{col}"' for col in columns]
         return self
 
     def order(self, column: str, direction: str = "ASC") -> Self:
@@ -39,7 +58,7 @@ class QueryBuilder:
         self.limit = limit
         return self
 
-    def build(self) -> str:
+    def build(self) -> tuple[str, dict[str, Any]]:
         columns = ", ".join(self.columns) if self.columns else "*"
 
         query = f"SELECT {columns} FROM {self.table_name}"
@@ -48,10 +67,13 @@ class QueryBuilder:
             conditions = " AND ".join(self.conditions)
             query += f" WHERE {conditions}"
 
+        if self.group_by:
+            query += f" GROUP BY {', '.join(self.group_by)}"
+
         if self.order_by:
             query += f" ORDER BY {self.order_by}"
 
         if self.limit:
             query += f" LIMIT {self.limit}"
 
-        return query
+        return query, dict(self.params)
@@ -0,0 +1,260 @@
+"""
+Per-statement timing for both SQL helpers, passed to pluggable listeners.
+
+SQLiteHelper and SQLAlchemyHelper report each statement they run to the
+process-wide query_log, which does nothing until a listener is added.
+QueryStats is the listener generate-reports uses: it groups statements by
+their normalized SQL, and can write every statement to a JSON trace.
+"""
+
+# standard imports
+import json
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+# Modules below the code that asked for the data, skipped to find the caller
+DATABASE_MODULES = (
+    "contextlib",
+    "finances.classes.memo",
+    "finances.classes.query_builder",
+    "finances.classes.query_log",
+    "finances.classes.sql_helper",
+    "finances.classes.sqlalchemy_helper",
+    "finances.classes.sqlalchemy_table",
+    "finances.classes.sqlite_helper",
+    "finances.classes.sqlite_table",
+    "sqlalchemy",
+)
+
+# The table whose full scans are worth explaining
+SCANNED_TABLE = "transactions"
+
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+@dataclass(frozen=True)
+class QueryEvent:
+    sql: str
+    seconds: float
+    rows: int
+    caller: str
+    # EXPLAIN QUERY PLAN details, only for a full scan of SCANNED_TABLE
+    plan: tuple[str, ...] | None = None
+
+
+QueryListener = Callable[[QueryEvent], None]
+
+
+class QueryLog:
+    def __init__(self) -> None:
+        self.listeners: list[QueryListener] = []
+        self.explain_full_scans = False
+        self._explained: set[str] = set()
+
+    def __repr__(self) -> str:
+        return f"<QueryLog {len(self.listeners)} listeners>"
+
+    def add_listener(self, listener: QueryListener) -> None:
+        self.listeners.append(listener)
+
+    def get_full_scan_plan(
+        self, sql: str, explain: Callable[[], list[str]]
+    ) -> tuple[str, ...] | None:
+        """
+        The plan of sql if it scans all of SCANNED_TABLE, explaining it once.
+        """
+        if not self.explain_full_scans or sql in self._explained:
+            return None
+        if not sql.upper().startswith(("SELECT", "WITH")):
+            return None
+        if not re.search(rf"\b{SCANNED_TABLE}\b", sql):
+            return None
+
+        self._explained.add(sql)
+        plan = explain()
+        return tuple(plan) if is_full_scan(plan, SCANNED_TABLE) else None
+
+    def is_enabled(self) -> bool:
+        return bool(self.listeners)
+
+    def record(
+        self,
+        statement: str,
+        started: float,
+        rows: int,
+        explain: Callable[[], list[str]],
+    ) -> None:
+        """
+        Pass a finished statement to every listener.
+
+        Args:
+            statement (str): The SQL as run.
+            started (float): time.perf_counter() before it ran.
+            rows (int): How many rows it returned.
+            explain (Callable[[], list[str]]): Its EXPLAIN QUERY PLAN details.
+        """
+        seconds = time.perf_counter() - started
+        sql = normalize_sql(statement)
+        event = QueryEvent(
+            sql, seconds, rows, get_caller(), self.get_full_scan_plan(sql, explain)
+        )
+        for listener in self.listeners:
+            listener(event)
+
+    def remove_listener(self, listener: QueryListener) -> None:
+        self.listeners.remove(listener)
+        if not self.listeners:
+            self._explained.clear()
+
+
+@dataclass
+class StatementStats:
+    sql: str
+    calls: int = 0
+    rows: int = 0
+    seconds: list[float] = field(default_factory=list)
+    callers: Counter[str] = field(default_factory=Counter)
+    plan: tuple[str, ...] | None = None
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds)
+
+    def add(self, event: QueryEvent) -> None:
+        self.calls += 1
+        self.rows += event.rows
+        self.seconds.append(event.seconds)
+        self.callers[event.caller] += 1
+        self.plan = self.plan or event.plan
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "calls": self.calls,
+            "rows": self.rows,
+            "total_ms": self.total_seconds * 1000,
+            "p50_ms": percentile(self.seconds, 50) * 1000,
+            "p95_ms": percentile(self.seconds, 95) * 1000,
+            "max_ms": max(self.seconds) * 1000,
+            "callers": dict(self.callers.most_common()),
+            "full_scan_plan": list(self.plan) if self.plan else None,
+        }
+
+
+class QueryStats:
+    """
+    A query_log listener that totals statements by their normalized SQL.
+    """
+
+    def __init__(self, keep_events: bool = False) -> None:
+        self.keep_events = keep_events
+        self.events: list[QueryEvent] = []
+        self.statements: dict[str, StatementStats] = {}
+
+    def __call__(self, event: QueryEvent) -> None:
+        if event.sql not in self.statements:
+            self.statements[event.sql] = StatementStats(event.sql)
+        self.statements[event.sql].add(event)
+        if self.keep_events:
+            self.events.append(event)
+
+    def __repr__(self) -> str:
+        return f"<QueryStats {len(self.statements)} statements>"
+
+    def format_summary(self, limit: int = 20) -> str:
+        """
+        The slowest statements in total, one line each, full scans flagged.
+        """
+        statements = self.get_statements()
+        calls = sum(statement.calls for statement in statements)
+        total = sum(statement.total_seconds for statement in statements)
+        lines = [
+            f"{calls} queries, {len(statements)} distinct, {total * 1000:.1f} ms",
+            f"{'calls':>7} {'total ms':>9} {'p50 ms':>7} {'p95 ms':>7}"
+            f" {'rows':>7}  caller / sql",
+        ]
+        for statement in statements[:limit]:
+            summary = statement.to_dict()
+            caller = statement.callers.most_common(1)[0][0]
+            scan = "  FULL SCAN" if statement.plan else ""
+            lines.append(
+                f"{statement.calls:>7} {summary['total_ms']:>9.1f}"
+                f" {summary['p50_ms']:>7.2f} {summary['p95_ms']:>7.2f}"
+                f" {statement.rows:>7}  {caller}{scan}"
+            )
+            lines.append(f"{'':>42}{statement.sql[:120]}")
+        return "\n".join(lines)
+
+    def get_statements(self) -> list[StatementStats]:
+        return sorted(
+            self.statements.values(),
+            key=lambda statement: statement.total_seconds,
+            reverse=True,
+        )
+
+    def write_trace(self, path: Path) -> None:
+        """
+        Write the summary and, if kept, every event, as JSON.
+        """
+        content = {
+            "statements": [statement.to_dict() for statement in self.get_statements()],
+            "events": [asdict(event) for event in self.events],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(content, indent=2), encoding="utf-8")
+
+
+def get_caller() -> str:
+    """
+    The first function outside the database code, as Class.method.
+    """
+    frame: FrameType | None = sys._getframe(1)
+    while frame:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(DATABASE_MODULES):
+            return frame.f_code.co_qualname
+        frame = frame.f_back
+    return "<unknown>"
+
+
+def get_used_index(plan: list[str]) -> str:
+    for detail in plan:
+        if " INDEX " in detail:
+            return detail.split(" INDEX ")[1].split(" ")[0]
+    return "none (full scan)"
+
+
+def is_full_scan(plan: list[str], table_name: str) -> bool:
+    """
+    Whether plan reads every row of table_name, without an index.
+    """
+    # "SCAN TABLE name" before SQLite 3.36, "SCAN name" since
+    scan = re.compile(rf"^SCAN (?:TABLE )?{re.escape(table_name)}\b")
+    return any(scan.match(detail) and " INDEX " not in detail for detail in plan)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    statement with its whitespace collapsed and literals replaced by ?.
+    """
+    return " ".join(LITERAL.sub("?", statement).split())
+
+
+def percentile(values: list[float], percent: int) -> float:
+    """
+    The nearest-rank percentile of values.
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[rank - 1]
+
+
+# Shared by every helper in the process
+query_log = QueryLog()
@@ -0,0 +1,212 @@
+"""
+Worksheet values to SQLite rows, without pandas.
+
+Each column's converter is looked up once, and every row is converted when
+the rows are prepared. In SpreadSheetToSqlite that is the convert stage, so
+the conversion overlaps the writer inserting earlier worksheets.
+"""
+
+# standard imports
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Final, Protocol
+
+# local imports
+from finances.classes.sqlite_helper import SQLiteHelper, to_table_name
+from finances.util.boolean_helpers import boolean_string_to_int
+from finances.util.database_indexes import get_create_index_statements
+from finances.util.database_keys import get_primary_key_columns, has_primary_key
+from finances.util.date_helpers import UK_to_ISO
+from finances.util.financial_helpers import string_to_financial, string_to_pence
+from finances.util.string_helpers import crop, remove_non_numeric
+
+# Rows per executemany call
+ROWS_CHUNK_SIZE = 5000
+
+SCALARS: Final[dict[str, Callable[[str], Any] | None]] = {
+    "to_boolean_integer": boolean_string_to_int,
+    "to_date": UK_to_ISO,
+    "to_financial": string_to_financial,
+    "to_numeric_str": remove_non_numeric,
+    "to_pence": string_to_pence,
+    "to_str": None,
+}
+
+
+class SheetRowsError(Exception):
+    pass
+
+
+class FieldTypes(Protocol):
+    def get_sqlite_type(self, table_name: str, column_name: str) -> str: ...
+
+    def get_to_db(self, table_name: str, column_name: str) -> str: ...
+
+
+@dataclass(frozen=True)
+class PreparedRows:
+    table_name: str
+    columns: tuple[str, ...]
+    sqlite_types: tuple[str, ...]
+    key_column: str | None
+    rows: list[tuple[Any, ...]]
+    worksheet_title: str
+    content_hash: str
+
+
+def financial_to_text(string: str) -> str:
+    """
+    Convert a currency or percent string to Decimal text.
+
+    sqlite3 cannot bind a Decimal, and the financial columns are TEXT.
+    """
+    return str(string_to_financial(string))
+
+
+def prepare_rows(
+    title: str,
+    values: list[list[str]],
+    field_types: FieldTypes,
+    content_hash: str,
+) -> PreparedRows:
+    """
+    Plan the table for a worksheet, converting its rows.
+
+    Args:
+        title (str): The worksheet title.
+        values (list[list[str]]): The worksheet values, headers first.
+        field_types (FieldTypes): The registry of each column's types.
+        content_hash (str): The hash of values, for the sync manifest.
+
+    Returns:
+        PreparedRows: The table's columns and converted rows.
+    """
+    table_name = to_table_name(title)
+    header = values[0] if values else []
+    columns = tuple(to_sqlite_column_name(column) for column in header)
+    if not columns or any(column.strip() == "" for column in columns):
+        raise SheetRowsError(
+            f"Empty column name(s) in worksheet '{table_name}': {list(columns)}"
+        )
+
+    converters: list[Callable[[str], Any] | None] = []
+    for column in columns:
+        to_db = field_types.get_to_db(table_name, column)
+        if to_db not in SCALARS:
+            raise ValueError(f"Unexpected to_db value: {to_db}")
+        converters.append(
+            financial_to_text if to_db == "to_financial" else SCALARS[to_db]
+        )
+
+    key_column = None
+    if has_primary_key(table_name):
+        key_column = get_primary_key_columns(table_name)[0]
+        if key_column not in columns:
+            raise ValueError(
+                f"Primary key column '{key_column}' not found in worksheet '{title}'"
+            )
+
+    sqlite_types = tuple(
+        field_types.get_sqlite_type(table_name, column) for column in columns
+    )
+
+    return PreparedRows(
+        table_name,
+        columns,
+        sqlite_types,
+        key_column,
+        list(convert_rows(values[1:], tuple(converters))),
+        title,
+        content_hash,
+    )
+
+
+def convert_rows(
+    rows: list[list[str]], converters: tuple[Callable[[str], Any] | None, ...]
+) -> Iterator[tuple[Any, ...]]:
+    """
+    Convert each row's cells, padding short rows with empty strings.
+    """
+    width = len(converters)
+    for row in rows:
+        cells = row + [""] * (width - len(row)) if len(row) < width else row
+        yield tuple(
+            converter(cell) if converter else cell
+            for converter, cell in zip(converters, cells)
+        )
+
+
+def to_sqlite_column_name(spreadsheet_column_name: str) -> str:
+    sqlite_column_name = to_table_name(spreadsheet_column_name)
+
+    if spreadsheet_column_name.endswith(" (£)"):
+        sqlite_column_name = crop(sqlite_column_name, "____")
+    elif spreadsheet_column_name.endswith(" (%)"):
+        sqlite_column_name = crop(sqlite_column_name, "____")
+    elif spreadsheet_column_name.endswith("?"):
+        sqlite_column_name = sqlite_column_name.strip("_")
+
+    return sqlite_column_name
+
+
+def write_rows(
+    sql: SQLiteHelper, prepared: PreparedRows, chunk_size: int = ROWS_CHUNK_SIZE
+) -> int:
+    """
+    Replace the table with the prepared rows, in one transaction.
+
+    Args:
+        sql (SQLiteHelper): The helper, inside a session.
+        prepared (PreparedRows): The table and its rows.
+        chunk_size (int): The most rows to insert per executemany call.
+
+    Returns:
+        int: How many rows were written.
+    """
+    if not sql.in_session():
+        raise ValueError("write_rows needs a session, for one transaction")
+
+    table_name = prepared.table_name
+    definitions = [
+        f'"{column}" {sqlite_type}'
+        + (" PRIMARY KEY" if column == prepared.key_column else "")
+        for column, sqlite_type in zip(
+            prepared.columns, prepared.sqlite_types, strict=True
+        )
+    ]
+    columns = list(prepared.columns)
+    rows: Iterator[tuple[Any, ...]] = iter(prepared.rows)
+    if prepared.key_column is None:
+        # Same synthetic id as the pandas writer gives
+        definitions.insert(0, '"id" INTEGER PRIMARY KEY AUTOINCREMENT')
+        columns.insert(0, "id")
+        rows = ((number, *row) for number, row in enumerate(rows, start=1))
+
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    insert = f'INSERT INTO "{table_name}" ({column_list}) VALUES ({placeholders})'
+
+    connection = sql.db_connection
+    cursor = connection.cursor()
+    written = 0
+    try:
+        # sqlite3 would otherwise commit the DROP and CREATE on their own
+        if not connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        cursor.execute(f'CREATE TABLE "{table_name}" ({", ".join(definitions)})')
+        while chunk := list(islice(rows, chunk_size)):
+            cursor.executemany(insert, chunk)
+            written += len(chunk)
+
+        # Inside the transaction, so the table never appears without them
+        for statement in get_create_index_statements(table_name):
+            cursor.execute(statement)
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+    return written
@@ -0,0 +1,183 @@
+"""
+Downloaded worksheet values saved to disk, and replayed as a spreadsheet.
+
+A snapshot is gzipped JSON holding every worksheet's values, in sheet
+order, and the spreadsheet's modified time. SnapshotSpreadsheet answers the
+gspread calls the converter and analyzer make, so either can run from a
+snapshot without credentials or network.
+"""
+
+# standard imports
+import gzip
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+# pip imports
+import gspread
+
+# local imports
+from finances.classes.config import Config
+from finances.classes.exception_helper import ExceptionHelper
+from finances.classes.google_helper import batch_get_values, get_api_limiter
+
+# Bumped whenever the snapshot layout changes
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_PREFIX = "sheets_"
+SNAPSHOT_SUFFIX = ".json.gz"
+
+# Rows of a worksheet, as in 'Title'!1:1
+ROW_RANGE = re.compile(r"(\d+):(\d+)")
+
+
+class SheetSnapshotError(ExceptionHelper):
+    pass
+
+
+@dataclass(frozen=True)
+class SheetSnapshot:
+    created_at: str
+    modified_time: str | None
+    values_by_title: dict[str, list[list[str]]]
+
+
+class SnapshotWorksheet:
+    def __init__(self, title: str, values: list[list[str]]) -> None:
+        self.title = title
+        self.values = values
+
+    def get_all_values(self) -> list[list[str]]:
+        return self.values
+
+    def row_values(self, row: int) -> list[str]:
+        return self.values[row - 1] if len(self.values) >= row else []
+
+
+class SnapshotSpreadsheet:
+    """
+    A read-only stand-in for gspread.Spreadsheet, backed by a snapshot.
+    """
+
+    def __init__(self, snapshot: SheetSnapshot) -> None:
+        self.snapshot = snapshot
+
+    def get_lastUpdateTime(self) -> str | None:
+        return self.snapshot.modified_time
+
+    def get_range_values(self, range_name: str) -> list[list[str]]:
+        """
+        The values of an absolute range: a whole worksheet, or rows of one.
+        """
+        if range_name.endswith("'"):
+            quoted_title, cell_range = range_name[1:-1], ""
+        else:
+            quoted_title, _, cell_range = range_name[1:].rpartition("'!")
+        values = self.snapshot.values_by_title[quoted_title.replace("''", "'")]
+        if not cell_range:
+            return values
+
+        rows = ROW_RANGE.fullmatch(cell_range)
+        if not rows:
+            raise SheetSnapshotError(f"Snapshots only hold whole rows: {range_name}")
+        return values[int(rows[1]) - 1 : int(rows[2])]
+
+    def values_batch_get(self, ranges: list[str]) -> dict[str, Any]:
+        value_ranges = []
+        for range_name in ranges:
+            values = self.get_range_values(range_name)
+            # Like the API, empty worksheets come back without values
+            value_range = {"range": range_name, "values": values} if values else {}
+            value_ranges.append(value_range)
+        return {"valueRanges": value_ranges}
+
+    def worksheets(self) -> list[SnapshotWorksheet]:
+        return [
+            SnapshotWorksheet(title, values)
+            for title, values in self.snapshot.values_by_title.items()
+        ]
+
+
+def download_snapshot(spreadsheet: gspread.Spreadsheet) -> SheetSnapshot:
+    """
+    Download every worksheet's values.
+
+    Args:
+        spreadsheet (gspread.Spreadsheet): The spreadsheet to download.
+
+    Returns:
+        SheetSnapshot: The values of every worksheet, in sheet order.
+    """
+    limiter = get_api_limiter()
+    modified_time = limiter.call(spreadsheet.get_lastUpdateTime)
+    titles = [worksheet.title for worksheet in limiter.call(spreadsheet.worksheets)]
+    return SheetSnapshot(
+        created_at=datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ"),
+        modified_time=modified_time,
+        values_by_title=batch_get_values(spreadsheet, titles),
+    )
+
+
+def get_latest_snapshot_path(snapshot_dir: Path | None = None) -> Path:
+    snapshot_dir = snapshot_dir or get_snapshot_dir()
+    paths = sorted(snapshot_dir.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"))
+    if not paths:
+        raise SheetSnapshotError(f"No snapshots in {snapshot_dir}")
+
+    # Names embed the UTC creation time, so they sort oldest first
+    return paths[-1]
+
+
+def get_snapshot_dir() -> Path:
+    return Path(Config().get("SHEETS_SNAPSHOT_DIR", "data/raw/snapshots"))
+
+
+def read_snapshot(path: Path) -> SheetSnapshot:
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        content = json.load(file)
+
+    version = content.get("version")
+    if version != SNAPSHOT_VERSION:
+        raise SheetSnapshotError(
+            f"{path} is snapshot version {version}, expected {SNAPSHOT_VERSION}"
+        )
+
+    return SheetSnapshot(
+        created_at=content["created_at"],
+        modified_time=content["modified_time"],
+        values_by_title={
+            worksheet["title"]: worksheet["values"]
+            for worksheet in content["worksheets"]
+        },
+    )
+
+
+def write_snapshot(snapshot: SheetSnapshot, snapshot_dir: Path | None = None) -> Path:
+    """
+    Save snapshot, named by its creation time, returning its path.
+    """
+    snapshot_dir = snapshot_dir or get_snapshot_dir()
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    path = snapshot_dir / f"{SNAPSHOT_PREFIX}{snapshot.created_at}{SNAPSHOT_SUFFIX}"
+
+    content = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": snapshot.created_at,
+        "modified_time": snapshot.modified_time,
+        "worksheets": [
+            {"title": title, "values": values}
+            for title, values in snapshot.values_by_title.items()
+        ],
+    }
+
+    # Write then rename, so a partial snapshot is never picked as the latest
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+        json.dump(content, file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+    return path
@@ -1,19 +1,45 @@
 # import standard files
-import time
+import hashlib
 from pathlib import Path
 
 # import pip files
+from gspread import Spreadsheet
 from gspread.worksheet import Worksheet
 
 # import local files
-from finances.classes.google_helper import GoogleHelper
+from finances.classes import spreadsheet_field
+from finances.classes.google_helper import (
+    GoogleHelper,
+    batch_get_values,
+    get_api_limiter,
+)
 from finances.classes.pandas_helper import PandasHelper
+from finances.classes.sheet_snapshot import SnapshotSpreadsheet
 from finances.classes.spreadsheet_field import SpreadsheetField
 from finances.classes.sqlite_helper import to_table_name
+from finances.classes.sync_manifest import hash_values
 from finances.util.string_helpers import crop, to_class_name, to_table_name
 
 GENERATED_DIR = "src/finances/generated/"
 
+# Hash of the headers and code the generated files were last written from
+HEADER_FINGERPRINT_FILE = "header_fingerprint.txt"
+
+# The code the generated files are written with, so changing it rewrites them
+CODE_PATHS = [
+    Path(__file__),
+    Path(spreadsheet_field.__file__),
+    Path("data/raw/field_registry_prefix.py"),
+]
+
+GENERATED_FILES = [
+    "account_sheet_names.py",
+    "field_registry.py",
+    "get_account_sheet_names.js",
+    "get_all_sheet_names.js",
+    "tables.py",
+]
+
 TYPE_MAPPING = {
     " (£)": {
         "to_db": "to_numeric_str",
@@ -47,18 +73,27 @@ TYPE_MAPPING = {
 
 
 class SpreadsheetAnalyzer:
-    def __init__(self) -> None:
+    def __init__(
+        self, spreadsheet: Spreadsheet | SnapshotSpreadsheet | None = None
+    ) -> None:
         """
         Initialize the analyzer
+
+        Args:
+            spreadsheet (Spreadsheet | SnapshotSpreadsheet): The spreadsheet,
+                opened with GoogleHelper when not given
         """
 
-        # Define the required scopes
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets.readonly",
-            "https://www.googleapis.com/auth/drive.readonly",
-        ]
+        if spreadsheet is None:
+            # Define the required scopes
+            scopes = [
+                "https://www.googleapis.com/auth/spreadsheets.readonly",
+                "https://www.googleapis.com/auth/drive.readonly",
+            ]
+
+            spreadsheet = GoogleHelper().get_spreadsheet(scopes)
 
-        self.spreadsheet = GoogleHelper().get_spreadsheet(scopes)
+        self.spreadsheet = spreadsheet
 
         self.pdh = PandasHelper()
 
@@ -68,27 +103,16 @@ class SpreadsheetAnalyzer:
 
         self.all_sheet_names: list[str] = []
 
-    def analyze_spreadsheet(self) -> None:
-        """
-        Analyze all sheets in the Google Spreadsheet
-        """
+        self.header_fingerprint: str | None = None
 
-        # Iterate through all worksheets
-        for worksheet in self.spreadsheet.worksheets():
-            print(f"Analyzing {worksheet.title}")
-            self.analyze_worksheet(worksheet)
+    def analyze_header(self, title: str, first_row: list[str]) -> None:
+        self.all_sheet_names.append(title)
+        if title.startswith("_"):
+            self.account_sheet_names.append(title)
 
-            time.sleep(1.1)  # Prevent Google API rate limiting
-
-    def analyze_worksheet(self, worksheet: Worksheet) -> None:
-        self.all_sheet_names.append(worksheet.title)
-        if worksheet.title.startswith("_"):
-            self.account_sheet_names.append(worksheet.title)
-
-        table_name = to_table_name(worksheet.title)
+        table_name = to_table_name(title)
 
         pdh = self.pdh
-        first_row = worksheet.row_values(1)
         print(f"first_row: {first_row}")
 
         # Split columns and rows
@@ -96,6 +120,36 @@ class SpreadsheetAnalyzer:
         for col in df.columns:
             self.fields.append(self.get_column_types(table_name, col))
 
+    def analyze_spreadsheet(self) -> None:
+        """
+        Analyze all sheets in the Google Spreadsheet
+        """
+        limiter = get_api_limiter()
+        titles = [
+            worksheet.title for worksheet in limiter.call(self.spreadsheet.worksheets)
+        ]
+
+        # Only the header rows are needed, so every sheet's fits in one request
+        header_rows = batch_get_values(
+            self.spreadsheet, titles, chunk_size=max(len(titles), 1), cell_range="1:1"
+        )
+        headers = {title: header_rows[title][0] for title in titles}
+
+        for title in titles:
+            print(f"Analyzing {title}")
+            self.analyze_header(title, headers[title])
+
+        self.header_fingerprint = hash_values(
+            [[title, *header] for title, header in headers.items()],
+            get_code_digest(),
+        )
+
+        print(f"Google API: {limiter}")
+
+    def analyze_worksheet(self, worksheet: Worksheet) -> None:
+        first_row = get_api_limiter().call(lambda: worksheet.row_values(1))
+        self.analyze_header(worksheet.title, first_row)
+
     def get_column_types(
         self, table_name: str, spreadsheet_column_name: str
     ) -> SpreadsheetField:
@@ -153,6 +207,9 @@ class SpreadsheetAnalyzer:
             sqlalchemy_type,
         )
 
+    def get_header_fingerprint_path(self) -> Path:
+        return Path(f"{GENERATED_DIR}{HEADER_FINGERPRINT_FILE}")
+
     def get_pre_pre_prefix(self) -> str:
         return (
             '"""Automatically generated file.\n\n'
@@ -160,6 +217,19 @@ class SpreadsheetAnalyzer:
             '"""\n'
         )
 
+    def is_up_to_date(self) -> bool:
+        """
+        Whether the generated files were written from the same headers and code.
+        """
+        path = self.get_header_fingerprint_path()
+        if self.header_fingerprint is None or not path.exists():
+            return False
+
+        if any(not Path(f"{GENERATED_DIR}{name}").exists() for name in GENERATED_FILES):
+            return False
+
+        return path.read_text().strip() == self.header_fingerprint
+
     def write_account_sheet_names_py(self) -> None:
         lines = ["ACCOUNT_SHEET_NAMES = ["]
         for sheet_name in self.account_sheet_names:
@@ -180,13 +250,31 @@ class SpreadsheetAnalyzer:
         lines.append("field_registry = FieldRegistry(SPREADSHEET_FIELDS)")
         self.write_lines("field_registry.py", lines)
 
-    def write_files(self) -> None:
+    def write_files(self, force: bool = False) -> bool:
+        """
+        Write the generated files, unless the headers have not changed.
+
+        Args:
+            force (bool): Write the files even if the headers have not changed
+
+        Returns:
+            bool: Whether the files were written
+        """
+        if not force and self.is_up_to_date():
+            print(f"Headers unchanged, so {GENERATED_DIR} is up to date")
+            return False
+
         self.write_account_sheet_names_py()
         self.write_get_account_sheet_names_js()
         self.write_get_all_sheet_names_js()
         self.write_field_registry_py()
         self.write_tables_py()
 
+        if self.header_fingerprint is not None:
+            self.get_header_fingerprint_path().write_text(self.header_fingerprint)
+
+        return True
+
     def write_get_account_sheet_names_js(self) -> None:
         lines = ["function getAccountSheetNames() {"]
         lines.append("  return" + str(self.account_sheet_names))
@@ -214,3 +302,10 @@ class SpreadsheetAnalyzer:
                 f"from finances.classes.table_{table_name} import {class_name}"
             )
         self.write_lines("tables.py", lines)
+
+
+def get_code_digest() -> str:
+    digest = hashlib.sha256()
+    for path in CODE_PATHS:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
@@ -1,119 +1,291 @@
-import time
-from collections.abc import Callable
-from typing import Any, Final
+from __future__ import annotations
 
-from gspread import Worksheet
-from pandas import DataFrame, Series
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Final
+
+from gspread import Spreadsheet, Worksheet
+from gspread.exceptions import APIError
 
 from finances.classes.config import Config
-from finances.classes.google_helper import GoogleHelper
-from finances.classes.pandas_helper import PandasHelper
+from finances.classes.google_helper import (
+    BATCH_GET_CHUNK_SIZE,
+    GoogleHelper,
+    batch_get_values,
+    get_api_limiter,
+)
+from finances.classes.money_storage import (
+    SQLITE_TYPES,
+    STORAGE_PENCE,
+    get_money_storage,
+    is_money_field,
+    migrate_money_columns,
+)
+from finances.classes.sheet_rows import (
+    SCALARS,
+    PreparedRows,
+    prepare_rows,
+    to_sqlite_column_name,
+    write_rows,
+)
+from finances.classes.sheet_snapshot import SnapshotSpreadsheet
 from finances.classes.sqlite_helper import SQLiteHelper, to_table_name
+from finances.classes.staged_database import StagedDatabase, apply_build_pragmas
+from finances.classes.sync_manifest import SyncManifest, hash_values
+from finances.classes.table_diff import apply_table_diff
 from finances.generated.field_registry import field_registry
-from finances.util.boolean_helpers import boolean_string_to_int
 from finances.util.database_keys import get_primary_key_columns, has_primary_key
-from finances.util.date_helpers import UK_to_ISO
-from finances.util.financial_helpers import string_to_financial
-from finances.util.string_helpers import crop, remove_non_numeric
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+# The rows writer never imports pandas
+WRITERS = ["pandas", "rows"]
 
 
 class SpreadSheetToSqliteError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class PreparedTable:
+    table_name: str
+    df: DataFrame
+    dtype: dict[str, str]
+    worksheet_title: str
+    content_hash: str
+
+
+@dataclass(frozen=True)
+class UnchangedTable:
+    table_name: str
+    worksheet_title: str
+    content_hash: str
+
+
 class SpreadSheetToSqlite:
-    _SCALARS: Final[dict[str, Callable[[str], Any] | None]] = {
-        "to_boolean_integer": boolean_string_to_int,
-        "to_date": UK_to_ISO,
-        "to_financial": string_to_financial,
-        "to_numeric_str": remove_non_numeric,
-        "to_str": None,
-    }
-
-    def __init__(self) -> None:
+    _SCALARS: Final[dict[str, Callable[[str], Any] | None]] = SCALARS
+
+    def __init__(
+        self, spreadsheet: Spreadsheet | SnapshotSpreadsheet | None = None
+    ) -> None:
         """
-        Initialize the converter with Google Sheets credentials and spreadsheet name
+        Initialize the converter with the Google Spreadsheet to convert
 
         Args:
-            credentials_path (str): Path to your Google Cloud service account JSON
-            spreadsheet_name (str): Name of the Google Spreadsheet
+            spreadsheet (Spreadsheet | SnapshotSpreadsheet): The spreadsheet,
+                opened with GoogleHelper when not given
         """
 
         self.read_config()
 
-        self.pdh = PandasHelper()
+        if spreadsheet is None:
+            # Define the required scopes
+            scopes = [
+                "https://www.googleapis.com/auth/spreadsheets.readonly",
+                "https://www.googleapis.com/auth/drive.readonly",
+            ]
 
-        # Define the required scopes
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets.readonly",
-            "https://www.googleapis.com/auth/drive.readonly",
-        ]
+            spreadsheet = GoogleHelper().get_spreadsheet(scopes)
 
-        self.spreadsheet = GoogleHelper().get_spreadsheet(scopes)
+        self.spreadsheet = spreadsheet
 
         self.sql = SQLiteHelper()
 
-    @staticmethod
-    def apply(df: DataFrame, column_name: str, scalar: Callable[[Any], Any]) -> Series:  # type: ignore
-        return df[column_name].apply(scalar)  # type: ignore
-
-    def backup_bmonzo(self) -> None:
-        pass
-
     def convert_column_name(self, spreadsheet_column_name: str) -> str:
-        sqlite_column_name = to_table_name(spreadsheet_column_name)
-
-        if spreadsheet_column_name.endswith(" (£)"):
-            sqlite_column_name = crop(sqlite_column_name, "____")
-        elif spreadsheet_column_name.endswith(" (%)"):
-            sqlite_column_name = crop(sqlite_column_name, "____")
-        elif spreadsheet_column_name.endswith("?"):
-            sqlite_column_name = sqlite_column_name.strip("_")
-
-        return sqlite_column_name
+        return to_sqlite_column_name(spreadsheet_column_name)
 
     def convert_df_col(
         self, df: DataFrame, table_name: str, column_name: str
     ) -> DataFrame:
+        # Imported here, so the rows writer does not load pandas
+        from finances.util.series_converters import CONVERTERS
+
         to_db = self.get_to_db(table_name, column_name)
-        if to_db not in self._SCALARS:
+        if to_db not in CONVERTERS:
             raise ValueError(f"Unexpected to_db value: {to_db}")
 
-        scalar = self._SCALARS[to_db]
-        if scalar:
+        converter = CONVERTERS[to_db]
+        if converter:
             print(f"Transforming {table_name}.{column_name} using {to_db}")
 
-            df[column_name] = self.apply(df, column_name, scalar)  # type: ignore
+            df[column_name] = converter(df[column_name])
+            if to_db == "to_financial":
+                # sqlite3 cannot bind a Decimal, and the financial columns are TEXT
+                df[column_name] = df[column_name].map(str, na_action="ignore")
 
         return df
 
-    def convert_to_sqlite(self) -> None:
+    def convert_to_sqlite(
+        self, full: bool = False, diff: bool = False
+    ) -> dict[str, list[str]]:
         """
-        Convert all sheets in the Google Spreadsheet to SQLite tables
-        """
-        self.sql.open_connection()
+        Convert changed sheets in the Google Spreadsheet to SQLite tables
+
+        The tables are built in a staging copy of the database, which then
+        replaces the live file, so readers never see a partial ingest.
 
-        self.backup_bmonzo()
+        Args:
+            full (bool): Convert every sheet, even if it has not changed
+            diff (bool): Change only the rows that differ, instead of
+                replacing each changed table
 
-        # Iterate through all worksheets
-        for worksheet in self.spreadsheet.worksheets():
-            if self.convert_account_tables or not worksheet.title.startswith("_"):
-                self.convert_worksheet(worksheet)
+        Returns:
+            summary: The table names skipped, updated and added, and those
+                whose money columns were migrated
+        """
+        live_sql = self.sql
+        staged = StagedDatabase(live_sql.db_path)
+        staged.prepare()
 
-                time.sleep(1.1)  # Prevent Google API rate limiting
+        self.sql = SQLiteHelper(staged.staging_path)
+        try:
+            summary = self.sync_tables(full, diff)
+        except BaseException:
+            staged.discard()
+            raise
+        finally:
+            self.sql = live_sql
 
-        self.backup_bmonzo()
+        # Only a run that changed tables becomes the generation to roll back
+        changed = bool(summary["updated"] or summary["added"] or summary["migrated"])
+        staged.swap_in(keep_previous=changed)
 
-        self.sql.close_connection()
+        print(f"Google API: {get_api_limiter()}")
+
+        return summary
 
     def convert_worksheet(self, worksheet: Worksheet) -> None:
-        table_name = to_table_name(worksheet.title)
-        print(f"table_name: {table_name}")
+        self.convert_worksheet_values(worksheet.title, worksheet.get_all_values())
+
+    def convert_worksheet_values(self, title: str, data: list[list[str]]) -> None:
+        self.write_prepared(self.prepare(title, data, self.hash_table(title, data)))
+
+    def diff_table(self, table: PreparedTable | PreparedRows) -> None:
+        """
+        Apply only the row changes, replacing the table if its columns changed.
+        """
+        table_name = table.table_name
+        key_columns = (
+            get_primary_key_columns(table_name) if has_primary_key(table_name) else []
+        )
+
+        rows: Iterable[tuple[Any, ...]]
+        if isinstance(table, PreparedRows):
+            columns = list(table.columns)
+            rows = table.rows
+        else:
+            df = table.df
+            if not key_columns:
+                # The synthetic id is not content; existing rows keep theirs
+                df = df.drop(columns="id")
+            columns = [str(column) for column in df.columns]
+            rows = get_plain_rows(df)
 
-        pdh = self.pdh
+        expected = set(columns) if key_columns else {*columns, "id"}
+        table_columns = {row[1] for row in self.sql.get_table_info(table_name)}
+        if table_columns != expected:
+            print(f"{table_name}: columns changed, replacing the table")
+            self.write_prepared(table)
+            return
 
-        # Get worksheet data as a DataFrame
-        data = worksheet.get_all_values()
+        table_diff = apply_table_diff(self.sql, table_name, columns, rows, key_columns)
+        print(f"{table_name}: {table_diff}")
+
+        self.sql.create_indexes(table_name)
+
+    def fetch_chunk(self, titles: list[str]) -> dict[str, list[list[str]]]:
+        return batch_get_values(self.spreadsheet, titles, self.batch_get_chunk_size)
+
+    def get_financial_columns(self) -> list[str]:
+        return [
+            "balance",
+            "credit",
+            "debit",
+        ]
+
+    def get_modified_time(self) -> str | None:
+        """
+        When the spreadsheet last changed, or None if Drive cannot say.
+        """
+        try:
+            modified_time: str | None = get_api_limiter().call(
+                self.spreadsheet.get_lastUpdateTime
+            )
+        except APIError as e:
+            print(f"Spreadsheet modified time unavailable: {e}")
+            return None
+
+        return modified_time
+
+    def get_sqlite_type(self, table_name: str, column_name: str) -> str:
+        if is_money_field(field_registry, table_name, column_name):
+            return SQLITE_TYPES[self.money_storage]
+        return field_registry.get_sqlite_type(table_name, column_name)
+
+    def get_to_db(self, table_name: str, column_name: str) -> str:
+        if self.money_storage == STORAGE_PENCE and is_money_field(
+            field_registry, table_name, column_name
+        ):
+            return "to_pence"
+        return field_registry.get_to_db(table_name, column_name)
+
+    def get_worksheet_titles(self) -> list[str]:
+        worksheets = get_api_limiter().call(self.spreadsheet.worksheets)
+        return [
+            worksheet.title
+            for worksheet in worksheets
+            if self.convert_account_tables or not worksheet.title.startswith("_")
+        ]
+
+    def hash_table(self, title: str, values: list[list[str]]) -> str:
+        """
+        Hash a worksheet with how it is converted, so a registry or writer
+        change rebuilds the table even when the values have not changed.
+        """
+        table_name = to_table_name(title)
+        header = values[0] if values else []
+        columns = [
+            self.convert_column_name(column) for column in header if column.strip()
+        ]
+        settings = {
+            "writer": self.writer,
+            "columns": [
+                [
+                    column,
+                    self.get_to_db(table_name, column),
+                    self.get_sqlite_type(table_name, column),
+                ]
+                for column in columns
+            ],
+        }
+        return hash_values(values, settings)
+
+    def key_column_not_found(self, sheet_name: str, key_column: str) -> str:
+        return (
+            f"Primary key column '{key_column}' not found in worksheet '{sheet_name}'"
+        )
+
+    def prepare(
+        self, title: str, data: list[list[str]], content_hash: str
+    ) -> PreparedTable | PreparedRows:
+        if self.writer == "rows":
+            return prepare_rows(title, data, self, content_hash)
+
+        return self.prepare_table(title, data, content_hash)
+
+    def prepare_table(
+        self, title: str, data: list[list[str]], content_hash: str
+    ) -> PreparedTable:
+        # Imported here, so the rows writer does not load pandas
+        from finances.classes.pandas_helper import PandasHelper
+
+        table_name = to_table_name(title)
+        print(f"table_name: {table_name}")
+
+        pdh = PandasHelper()
 
         # Split columns and rows
         df = pdh.worksheet_values_to_dataframe(data)
@@ -140,7 +312,7 @@ class SpreadSheetToSqlite:
             primary_key_columns = get_primary_key_columns(table_name)
             key_column = primary_key_columns[0]
             if key_column not in df.columns:
-                raise ValueError(self.key_column_not_found(worksheet.title, key_column))
+                raise ValueError(self.key_column_not_found(title, key_column))
             sqlite_type = self.get_sqlite_type(table_name, key_column)
             dtype = {key_column: f"{sqlite_type} PRIMARY KEY"}
         else:
@@ -151,34 +323,183 @@ class SpreadSheetToSqlite:
         print(f"table_name: {table_name}")
         print(f"dtype: {dtype}")
 
+        return PreparedTable(table_name, df, dtype, title, content_hash)
+
+    def prepare_tables(
+        self, titles: list[str], known_hashes: Mapping[str, str]
+    ) -> Iterator[PreparedTable | PreparedRows | UnchangedTable]:
+        """
+        Fetch and convert the titled worksheets, overlapping the stages.
+
+        Fetch workers download chunks of worksheets under the API limiter,
+        and a convert worker turns each chunk into DataFrames, skipping any
+        worksheet whose content hash is in known_hashes. At most
+        pipeline_queue_depth chunks are in flight, which caps peak memory.
+        Tables are yielded in title order.
+        """
+        chunk_size = self.batch_get_chunk_size
+        chunks = [titles[i : i + chunk_size] for i in range(0, len(titles), chunk_size)]
+
+        fetch_pool = ThreadPoolExecutor(self.fetch_workers, "sheets-fetch")
+        convert_pool = ThreadPoolExecutor(1, "sheets-convert")
+
+        def convert(
+            fetched: Future[dict[str, list[list[str]]]],
+        ) -> list[PreparedTable | PreparedRows | UnchangedTable]:
+            tables: list[PreparedTable | PreparedRows | UnchangedTable] = []
+            values_by_title = fetched.result()
+            for title in list(values_by_title):
+                values = values_by_title.pop(title)
+                table_name = to_table_name(title)
+                content_hash = self.hash_table(title, values)
+                if known_hashes.get(table_name) == content_hash:
+                    tables.append(UnchangedTable(table_name, title, content_hash))
+                else:
+                    tables.append(self.prepare(title, values, content_hash))
+            return tables
+
+        def submit(
+            chunk: list[str],
+        ) -> Future[list[PreparedTable | PreparedRows | UnchangedTable]]:
+            fetched = fetch_pool.submit(self.fetch_chunk, chunk)
+            return convert_pool.submit(convert, fetched)
+
+        in_flight: deque[
+            Future[list[PreparedTable | PreparedRows | UnchangedTable]]
+        ] = deque()
+        pending = iter(chunks)
+        try:
+            while True:
+                while len(in_flight) < self.pipeline_queue_depth:
+                    chunk = next(pending, None)
+                    if chunk is None:
+                        break
+                    in_flight.append(submit(chunk))
+
+                if not in_flight:
+                    return
+
+                yield from in_flight.popleft().result()
+        finally:
+            fetch_pool.shutdown(cancel_futures=True)
+            convert_pool.shutdown(cancel_futures=True)
+
+    def read_config(self) -> None:
+        config = Config()
+
+        self.convert_account_tables = config.get("CONVERT_ACCOUNT_TABLES", True)
+        self.batch_get_chunk_size = int(
+            config.get("GOOGLE_BATCH_GET_CHUNK_SIZE", BATCH_GET_CHUNK_SIZE)
+        )
+        self.fetch_workers = int(config.get("SHEETS_FETCH_WORKERS", 2))
+
+        # Chunks fetched or converted ahead of the writer; at least one
+        queue_depth = int(config.get("SHEETS_PIPELINE_QUEUE_DEPTH", 3))
+        self.pipeline_queue_depth = max(queue_depth, 1)
+
+        self.writer = config.get("SHEETS_WRITER", "pandas")
+        if self.writer not in WRITERS:
+            raise SpreadSheetToSqliteError(
+                f"SHEETS_WRITER must be one of {WRITERS}, not {self.writer}"
+            )
+
+        self.money_storage = get_money_storage()
+
+    def sync_tables(self, full: bool, diff: bool) -> dict[str, list[str]]:
+        """
+        Bring the tables in self.sql up to date with the spreadsheet.
+        """
+        summary: dict[str, list[str]] = {"skipped": [], "updated": [], "added": []}
+
+        with self.sql.session():
+            # The staging file is discarded on failure, so it needs no journal
+            apply_build_pragmas(self.sql.db_connection)
+
+            # Tables kept from earlier runs must match the configured storage
+            migrated = migrate_money_columns(
+                self.sql, field_registry, self.money_storage
+            )
+            summary["migrated"] = migrated
+
+            manifest = SyncManifest(self.sql)
+            manifest.create_table()
+            entries = {} if full else manifest.get_entries()
+            table_names = set(self.sql.get_table_names())
+            modified_time = self.get_modified_time()
+
+            # Sheets synced since the spreadsheet last changed need no download
+            titles = []
+            for title in self.get_worksheet_titles():
+                entry = entries.get(to_table_name(title))
+                if modified_time and entry and entry.modified_time == modified_time:
+                    summary["skipped"].append(entry.table_name)
+                else:
+                    titles.append(title)
+
+            known_hashes = {
+                table_name: entry.content_hash for table_name, entry in entries.items()
+            }
+
+            # This thread is the only writer, so it alone owns the connection
+            for table in self.prepare_tables(titles, known_hashes):
+                if isinstance(table, UnchangedTable):
+                    summary["skipped"].append(table.table_name)
+                elif table.table_name in table_names:
+                    if diff:
+                        self.diff_table(table)
+                    else:
+                        self.write_prepared(table)
+                    summary["updated"].append(table.table_name)
+                else:
+                    self.write_prepared(table)
+                    summary["added"].append(table.table_name)
+
+                manifest.record(
+                    table.table_name,
+                    table.worksheet_title,
+                    table.content_hash,
+                    modified_time,
+                )
+
+            if summary["updated"] or summary["added"] or migrated:
+                # Replaced tables lose their statistics, so refresh them once
+                self.sql.analyze()
+
+        return summary
+
+    def write_prepared(self, table: PreparedTable | PreparedRows) -> None:
+        if isinstance(table, PreparedRows):
+            written = write_rows(self.sql, table)
+            print(f"{table.table_name}: wrote {written} rows")
+        else:
+            self.write_table(table)
+
+    def write_table(self, table: PreparedTable) -> None:
         # Write DataFrame to SQLite table (sheet name becomes table name)
-        df.to_sql(
-            table_name,
+        table.df.to_sql(
+            table.table_name,
             self.sql.db_connection,
             if_exists="replace",
             index=False,
-            dtype=dtype,
+            dtype=table.dtype,
         )
 
-    def get_financial_columns(self) -> list[str]:
-        return [
-            "balance",
-            "credit",
-            "debit",
-        ]
-
-    def get_sqlite_type(self, table_name: str, column_name: str) -> str:
-        return field_registry.get_sqlite_type(table_name, column_name)
+        # to_sql(if_exists="replace") drops the table's indexes with it
+        self.sql.create_indexes(table.table_name)
+        self.sql.db_connection.commit()
 
-    def get_to_db(self, table_name: str, column_name: str) -> str:
-        return field_registry.get_to_db(table_name, column_name)
 
-    def key_column_not_found(self, sheet_name: str, key_column: str) -> str:
-        return (
-            f"Primary key column '{key_column}' not found in worksheet '{sheet_name}'"
-        )
+def get_plain_rows(df: DataFrame) -> Iterator[tuple[Any, ...]]:
+    """
+    The rows of df as plain Python values, which sqlite3 can bind.
 
-    def read_config(self) -> None:
-        config = Config()
+    to_pence gives an Int64 column, whose cells are pd.NA or numpy integers.
+    """
+    # Imported here, so the rows writer does not load pandas
+    import numpy as np
 
-        self.convert_account_tables = config.get("CONVERT_ACCOUNT_TABLES", True)
+    plain = df.astype(object).where(df.notna(), None)
+    for row in plain.itertuples(index=False, name=None):
+        yield tuple(
+            int(value) if isinstance(value, np.integer) else value for value in row
+        )
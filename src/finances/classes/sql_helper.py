@@ -1,6 +1,8 @@
 import importlib
 from typing import TYPE_CHECKING
 
+from finances.classes.connection_registry import registry
+
 if TYPE_CHECKING:
     from finances.classes.sqlalchemy_helper import SQLAlchemyHelper
     from finances.classes.sqlite_helper import SQLiteHelper
@@ -24,7 +26,10 @@ def select_sql_helper(preferred_helper: str) -> SQLHelperType:
     try:
         module_path, class_name = mapping[preferred_helper].rsplit(".", 1)
         mod = importlib.import_module(module_path)
-        return getattr(mod, class_name)()
+        helper: SQLHelperType = registry.get_shared(
+            class_name, getattr(mod, class_name)
+        )
+        return helper
     except KeyError:
         raise SQLHelperError(
             f"Unexpected preferred_helper: {preferred_helper}"
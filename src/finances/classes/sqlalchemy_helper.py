@@ -1,13 +1,21 @@
 # standard imports
-from collections.abc import Sequence
+import sqlite3
+import time
+from collections.abc import Mapping, Sequence
 from typing import Any, cast
 
 # pip imports
-from sqlalchemy import Row, create_engine, text
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Row, event, text
+from sqlalchemy.orm import Session
 
 # local imports
 from finances.classes.config import Config
+from finances.classes.connection_registry import registry
+from finances.classes.memory_database import get_memory_name, get_memory_url
+from finances.classes.query_log import query_log
+from finances.classes.sqlite_profiles import on_connect
+from finances.classes.table_migration import TableMigration, text_to_real_sql
+from finances.util.boolean_helpers import boolean_string_to_int
 from finances.util.string_helpers import to_method_name
 
 
@@ -15,69 +23,58 @@ class SQLAlchemyHelper:
     def __init__(self) -> None:
         self.read_config()
 
-        self.engine = create_engine(self.database_url, echo=self.is_echo_enabled)
-        self.Session = sessionmaker(bind=self.engine)
+        # Engines are pooled per database URL and shared by every helper
+        self.engine = registry.open(self.database_url, echo=self.is_echo_enabled)
+        if not event.contains(self.engine, "connect", on_connect):
+            # The same PRAGMAs SQLiteHelper applies, on each pooled connection
+            event.listen(self.engine, "connect", on_connect)
+        self.Session = registry.get_session_factory(self.database_url)
 
     def drop_column(self, table_name: str, column_name: str) -> None:
-        session = self.Session()
-        try:
-            # Step 1: get current schema
-            result = session.execute(text(f"PRAGMA table_info({table_name})"))
-            columns_info = result.fetchall()
-
-            # Step 2: build list of columns to keep
-            keep_columns = [col[1] for col in columns_info if col[1] != column_name]
-            if column_name not in [col[1] for col in columns_info]:
-                raise ValueError(
-                    f"Column {column_name} not found in table {table_name}"
-                )
-
-            # Step 3: create new table using selected columns
-            tmp_table = f"{table_name}_tmp"
-            create_table_statement = (
-                f"CREATE TABLE {tmp_table} AS "
-                f"SELECT {', '.join(keep_columns)} "
-                f"FROM {table_name}"
-            )
-            session.execute(text(create_table_statement))
+        self.migrate_table(TableMigration(table_name).drop(column_name))
 
-            # Step 4: replace original table
-            session.execute(text(f"DROP TABLE {table_name}"))
-            session.execute(text(f"ALTER TABLE {tmp_table} RENAME TO {table_name}"))
-            session.commit()
-        finally:
-            session.close()
-
-    def executeAndCommit(self, sql: str) -> None:
+    def executeAndCommit(
+        self, sql: str, params: Mapping[str, Any] | None = None
+    ) -> None:
         session = self.Session()
         try:
-            session.execute(text(sql))
+            started = time.perf_counter()
+            session.execute(text(sql), params or {})
             session.commit()
+            self.record_query(session, sql, params, started, 0)
         finally:
             session.close()
 
-    def fetch_all(self, query: str) -> list[Any]:
+    def fetch_all(
+        self, query: str, params: Mapping[str, Any] | None = None
+    ) -> list[Any]:
         text_clause = text(query)
         session = self.Session()
         try:
             # Execute the query
-            result = session.execute(text_clause)
+            started = time.perf_counter()
+            result = session.execute(text_clause, params or {})
             all = result.fetchall()
+            self.record_query(session, query, params, started, len(all))
         finally:
             # Close the session
             session.close()
 
         return cast(list[Any], all)
 
-    def fetch_one_value(self, query: str) -> Any:
+    def fetch_one_value(
+        self, query: str, params: Mapping[str, Any] | None = None
+    ) -> Any:
         text_clause = text(query)
 
         # Open a session
         session = self.Session()
         try:
             # Execute the query
-            result = session.execute(text_clause)
+            started = time.perf_counter()
+            result = session.execute(text_clause, params or {})
             value = result.scalar()
+            self.record_query(session, query, params, started, int(value is not None))
         finally:
             # Close the session
             session.close()
@@ -105,6 +102,17 @@ class SQLAlchemyHelper:
 
         return table_info
 
+    def migrate_table(self, migration: TableMigration) -> None:
+        """
+        Make all of migration's column changes with one rebuild at most.
+        """
+        # The planner runs its own transaction on the sqlite3 connection
+        connection = self.engine.raw_connection()
+        try:
+            migration.apply(cast(sqlite3.Connection, connection.driver_connection))
+        finally:
+            connection.close()
+
     def read_config(self) -> None:
         config = Config()
 
@@ -115,79 +123,57 @@ class SQLAlchemyHelper:
             )
         self.database_url = database_url
 
+        memory_name = get_memory_name()
+        if memory_name:
+            # The in-memory copy of the database, loaded for a report run
+            self.database_url = get_memory_url(memory_name)
+
         is_echo_enabled = config.get("OUR_FINANCES_SQLITE_ECHO_ENABLED")
         if not is_echo_enabled:
             raise ValueError(
                 "OUR_FINANCES_SQLITE_ECHO_ENABLED is not set in the configuration."
             )
-        self.is_echo_enabled = is_echo_enabled
+        self.is_echo_enabled = bool(boolean_string_to_int(is_echo_enabled))
 
-    def rename_column(self, table_name: str, old_name: str, new_name: str) -> None:
-        session = self.Session()
-        try:
-            # Step 1: get table structure
-            result = session.execute(text(f"PRAGMA table_info({table_name})"))
-            columns_info = result.fetchall()
-
-            if old_name not in [col[1] for col in columns_info]:
-                raise ValueError(f"Column {old_name} not found in table {table_name}")
-
-            # Step 2: reconstruct schema with new column name
-            new_columns: list[str] = []
-            select_columns: list[str] = []
-            for col in columns_info:
-                col_name, col_type = col[1], col[2]
-                if col_name == old_name:
-                    new_columns.append(f"{new_name} {col_type}")
-                    select_columns.append(f"{old_name} AS {new_name}")
-                else:
-                    new_columns.append(f"{col_name} {col_type}")
-                    select_columns.append(col_name)
-
-            tmp_table = f"{table_name}_tmp"
-            session.execute(
-                text(f"CREATE TABLE {tmp_table} ({', '.join(new_columns)})")
-            )
-            insert_statement = (
-                f"INSERT INTO {tmp_table} "
-                f"SELECT {', '.join(select_columns)} "
-                f"FROM {table_name}"
-            )
-            session.execute(text(insert_statement))
+    def record_query(
+        self,
+        session: Session,
+        query: str,
+        params: Mapping[str, Any] | None,
+        started: float,
+        rows: int,
+    ) -> None:
+        if not query_log.is_enabled():
+            return
 
-            # Step 3: replace original table
-            session.execute(text(f"DROP TABLE {table_name}"))
-            session.execute(text(f"ALTER TABLE {tmp_table} RENAME TO {table_name}"))
-            session.commit()
-        finally:
-            session.close()
+        def explain() -> list[str]:
+            plan = session.execute(text(f"EXPLAIN QUERY PLAN {query}"), params or {})
+            return [row[3] for row in plan.fetchall()]
 
-    def text_to_real(self, table_name: str, column_name: str) -> None:
-        table_info = self.get_table_info(table_name)
-
-        column_type = None
+        query_log.record(query, started, rows, explain)
 
-        for column in table_info:
-            if column[1] == column_name:
-                column_type = column[2]
-
-        if column_type == "TEXT":
-            update_statement = (
-                f"UPDATE {table_name} "
-                f"SET {column_name}_real = CAST("
-                f"REPLACE(REPLACE(REPLACE({column_name}, '£', ''), ',', ''), ' ', '') "
-                f"AS REAL)"
-            )
+    def rename_column(self, table_name: str, old_name: str, new_name: str) -> None:
+        self.migrate_table(TableMigration(table_name).rename(old_name, new_name))
 
-            sql_statements = [
-                f"ALTER TABLE {table_name} ADD COLUMN {column_name}_real REAL",
-                update_statement,
-            ]
-            for sql_statement in sql_statements:
-                self.executeAndCommit(sql_statement)
+    def text_to_real(self, table_name: str, column_name: str) -> None:
+        self.texts_to_real(table_name, [column_name])
+
+    def texts_to_real(self, table_name: str, column_names: Sequence[str]) -> None:
+        """
+        Convert the TEXT columns among column_names to REAL, in one rebuild.
+        """
+        column_types = {
+            column[1]: column[2] for column in self.get_table_info(table_name)
+        }
+
+        migration = TableMigration(table_name)
+        for column_name in column_names:
+            if column_types.get(column_name) == "TEXT":
+                migration.change_type(
+                    column_name, "REAL", using=text_to_real_sql(column_name)
+                )
 
-            self.drop_column(table_name, column_name)
-            self.rename_column(table_name, f"{column_name}_real", column_name)
+        self.migrate_table(migration)
 
 
 def to_column_name(name: str) -> str:
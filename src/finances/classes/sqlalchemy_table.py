@@ -1,5 +1,6 @@
 from typing import Any
 
+from finances.classes.connection_registry import registry
 from finances.classes.query_builder import QueryBuilder
 from finances.classes.sqlalchemy_helper import (
     SQLAlchemyHelper,
@@ -10,7 +11,7 @@ from finances.classes.sqlalchemy_helper import (
 class SQLiteTable:
     def __init__(self, table_name: str) -> None:
         validate_table_name(table_name)
-        self.sql = SQLAlchemyHelper()
+        self.sql = registry.get_shared("SQLAlchemyHelper", SQLAlchemyHelper)
         self.table_name = table_name
 
     def fetch_all(self) -> Any:
@@ -1,95 +1,138 @@
 # standard library imports
 import os
-
-# pip install imports
 import sqlite3
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
 from decimal import Decimal
+from pathlib import Path
 from typing import Any
 
 # local imports
 from finances.classes.config import Config
 from finances.classes.exception_helper import ExceptionHelper
+from finances.classes.memory_database import get_memory_name, get_memory_uri
+from finances.classes.query_log import query_log
+from finances.classes.sqlite_profiles import (
+    apply_journal_mode,
+    apply_profile,
+    get_profile,
+)
+from finances.classes.table_migration import TableMigration, text_to_real_sql
+from finances.util.boolean_helpers import boolean_string_to_int
+from finances.util.database_indexes import get_create_index_statements
 from finances.util.string_helpers import to_method_name
 
+# Values bound to ? or :name placeholders
+QueryParams = Mapping[str, Any] | Sequence[Any]
+
 
 class SQLiteHelperError(ExceptionHelper):
     pass
 
 
 class SQLiteHelper:
-    def __init__(self) -> None:
+    def __init__(self, db_path: str | None = None) -> None:
         self.read_config()
 
-    def close_connection(self) -> None:
-        if self.db_connection:
-            self.db_connection.close()
-
-    def drop_column(self, table_name: str, column_to_drop: str) -> None:
-        temp_table_name = f"temp_{table_name}"
-        self.open_connection()
-
-        cursor = self.db_connection.cursor()
+        if db_path:
+            # A file other than the configured database, such as a staging copy
+            self.db_path = db_path
 
-        # Get the table structure
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = cursor.fetchall()
+        # How many session() scopes are currently open on this helper
+        self._scope_depth = 0
 
-        # Extract column names excluding the column to drop
-        column_names = [f'"{col[1]}"' for col in columns if col[1] != column_to_drop]
-        column_names_str = ", ".join(column_names)
+        # Whether db_connection has been put in the profile's journal mode
+        self._journal_mode_set = False
 
-        # Create a temporary table without the column to drop
-        create_table_statement = (
-            f"CREATE TABLE {temp_table_name} AS "
-            f"SELECT {column_names_str} "
-            f"FROM {table_name}"
-        )
-        cursor.execute(create_table_statement)
+    def analyze(self) -> None:
+        """
+        Refresh the query planner statistics in sqlite_stat1.
+        """
+        self.executeAndCommit("ANALYZE")
 
-        # Drop the original table
-        sql_statement = f"DROP TABLE {table_name}"
-        cursor.execute(sql_statement)
+    def close_connection(self) -> None:
+        if self.in_session():
+            return  # The enclosing session() owns the connection
+
+        db_connection = getattr(self, "db_connection", None)
+        if db_connection:
+            db_connection.close()
+
+    def connect(self) -> sqlite3.Connection:
+        if self.memory_name:
+            connection = sqlite3.connect(get_memory_uri(self.memory_name), uri=True)
+            if self.read_only:
+                # A memory database cannot be opened read-only
+                connection.execute("PRAGMA query_only = ON")
+        elif self.read_only:
+            db_uri = Path(self.db_path).resolve().as_uri()
+            connection = sqlite3.connect(f"{db_uri}?mode=ro", uri=True)
+        else:
+            connection = sqlite3.connect(self.db_path)
 
-        # Rename the temporary table to the original table name
-        sql_statement = f"ALTER TABLE {temp_table_name} RENAME TO {table_name}"
-        cursor.execute(sql_statement)
+        apply_profile(connection, self.profile)
+        return connection
 
-        # Commit the changes and close the connection
-        self.db_connection.commit()
+    def create_indexes(self, table_name: str) -> None:
+        """
+        Create the indexes declared for table_name in util/database_indexes.py.
+        """
+        for statement in get_create_index_statements(table_name):
+            self.executeAndCommit(statement)
 
-        self.close_connection()
+    def drop_column(self, table_name: str, column_to_drop: str) -> None:
+        self.migrate_table(TableMigration(table_name).drop(column_to_drop))
 
-    def executeAndCommit(self, sql_statement: str) -> None:
+    def executeAndCommit(
+        self, sql_statement: str, params: QueryParams | None = None
+    ) -> None:
         self.open_connection()
+        self.prepare_write()
 
         cursor = self.db_connection.cursor()
-        cursor.execute(sql_statement)
+        started = time.perf_counter()
+        cursor.execute(sql_statement, params or ())
         self.db_connection.commit()
+        self.record_query(cursor, sql_statement, params, started, 0)
 
         self.close_connection()
 
-    def fetch_all(self, query: str) -> list[Any]:
+    def explain_query_plan(
+        self, query: str, params: QueryParams | None = None
+    ) -> list[str]:
+        """
+        Return the detail lines of EXPLAIN QUERY PLAN for query.
+        """
+        rows = self.fetch_all(f"EXPLAIN QUERY PLAN {query}", params)
+        return [row[3] for row in rows]
+
+    def fetch_all(self, query: str, params: QueryParams | None = None) -> list[Any]:
         self.open_connection()
 
         cursor = self.db_connection.cursor()
-        cursor.execute(query)
+        started = time.perf_counter()
+        cursor.execute(query, params or ())
         fetch_all = cursor.fetchall()
+        self.record_query(cursor, query, params, started, len(fetch_all))
 
         self.close_connection()
 
         return fetch_all
 
-    def fetch_one_row(self, query: str) -> Any:
+    def fetch_one_row(self, query: str, params: QueryParams | None = None) -> Any:
         self.open_connection()
         cursor = self.db_connection.cursor()
-        cursor.execute(query)
+        started = time.perf_counter()
+        cursor.execute(query, params or ())
         row = cursor.fetchone()
+        self.record_query(cursor, query, params, started, 1 if row else 0)
         self.close_connection()
 
         return row
 
-    def fetch_one_value(self, query: str) -> Any:
-        row = self.fetch_one_row(query)
+    def fetch_one_value(self, query: str, params: QueryParams | None = None) -> Any:
+        row = self.fetch_one_row(query, params)
         if row:
             value = row[0]  # Accessing the first element of the tuple
         else:
@@ -97,8 +140,10 @@ class SQLiteHelper:
 
         return value
 
-    def fetch_one_value_decimal(self, query: str) -> Decimal:
-        row = self.fetch_one_row(query)
+    def fetch_one_value_decimal(
+        self, query: str, params: QueryParams | None = None
+    ) -> Decimal:
+        row = self.fetch_one_row(query, params)
         if row:
             value = row[0]  # Accessing the first element of the tuple
         else:
@@ -106,8 +151,10 @@ class SQLiteHelper:
 
         return Decimal(value)
 
-    def fetch_one_value_float(self, query: str) -> float:
-        row = self.fetch_one_row(query)
+    def fetch_one_value_float(
+        self, query: str, params: QueryParams | None = None
+    ) -> float:
+        row = self.fetch_one_row(query, params)
         if row:
             value = row[0]  # Accessing the first element of the tuple
         else:
@@ -125,7 +172,6 @@ class SQLiteHelper:
         return column_info
 
     def get_how_many(self, table_name: str, where: str | None = None) -> int:
-        self.open_connection()
         query = f"""
 SELECT COUNT(*)
 FROM {table_name}
@@ -137,8 +183,6 @@ FROM {table_name}
 
         how_many = int(self.fetch_one_value(query))
 
-        self.close_connection()
-
         return how_many
 
     def get_table_info(self, table_name: str) -> list[Any]:
@@ -153,9 +197,39 @@ FROM {table_name}
 
         return table_info
 
+    def get_table_names(self) -> list[str]:
+        query = "SELECT name FROM sqlite_master WHERE type = 'table'"
+        return [row[0] for row in self.fetch_all(query)]
+
+    def in_session(self) -> bool:
+        return self._scope_depth > 0
+
+    def migrate_table(self, migration: TableMigration) -> None:
+        """
+        Make all of migration's column changes with one rebuild at most.
+        """
+        self.open_connection()
+        self.prepare_write()
+        try:
+            migration.apply(self.db_connection)
+        finally:
+            self.close_connection()
+
     def open_connection(self) -> None:
+        if self.in_session():
+            return  # Reuse the connection owned by the enclosing session()
+
         # Connect to SQLite database
-        self.db_connection: sqlite3.Connection = sqlite3.connect(self.db_path)
+        self.db_connection: sqlite3.Connection = self.connect()
+        self._journal_mode_set = False
+
+    def prepare_write(self) -> None:
+        """
+        Put the open connection in the profile's journal mode, once.
+        """
+        if not self._journal_mode_set and not self.read_only:
+            apply_journal_mode(self.db_connection, self.profile)
+            self._journal_mode_set = True
 
     def read_config(self) -> None:
         config = Config()
@@ -182,63 +256,82 @@ FROM {table_name}
 
         self.db_path = db_location + "/" + db_name + ".sqlite"
 
-    def rename_column(
-        self, table_name: str, old_column_name: str, new_column_name: str
-    ) -> None:
-        self.open_connection()
-
-        cursor = self.db_connection.cursor()
-
-        # Get the table structure
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = cursor.fetchall()
-
-        # Create a list of column names with the renamed column
+        # Report workers only read, so they can share the file safely
+        read_only = config.get("SQLITE_READ_ONLY", "No")
+        self.read_only = bool(boolean_string_to_int(read_only))
 
-        new_column_phrase = f"{old_column_name} AS {new_column_name}"
+        self.profile = get_profile(config.get("SQLITE_PROFILE", "default"))
 
-        new_columns = [
-            (f'"{col[1]}"' if col[1] != old_column_name else new_column_phrase)
-            for col in columns
-        ]
-        new_columns_str = ", ".join(new_columns)
+        # Connect to the in-memory copy instead of db_path, when one is loaded
+        self.memory_name = get_memory_name()
 
-        # Create a new table with the renamed column
-        sql_statement = f"CREATE TABLE temp_{table_name} AS SELECT {new_columns_str} FROM {table_name}"
-        cursor.execute(sql_statement)
+    def record_query(
+        self,
+        cursor: sqlite3.Cursor,
+        query: str,
+        params: QueryParams | None,
+        started: float,
+        rows: int,
+    ) -> None:
+        if not query_log.is_enabled():
+            return
 
-        # Drop the original table
-        sql_statement = f"DROP TABLE {table_name}"
-        cursor.execute(sql_statement)
+        def explain() -> list[str]:
+            # On the same cursor, while its connection is still open
+            plan = cursor.execute(f"EXPLAIN QUERY PLAN {query}", params or ())
+            return [row[3] for row in plan.fetchall()]
 
-        # Rename the new table to the original table name
-        sql_statement = f"ALTER TABLE temp_{table_name} RENAME TO {table_name}"
-        cursor.execute(sql_statement)
+        query_log.record(query, started, rows, explain)
 
-        # Commit the changes and close the connection
-        self.db_connection.commit()
+    def rename_column(
+        self, table_name: str, old_column_name: str, new_column_name: str
+    ) -> None:
+        self.migrate_table(
+            TableMigration(table_name).rename(old_column_name, new_column_name)
+        )
 
-        self.close_connection()
+    @contextmanager
+    def session(self, write: bool = False) -> Iterator["SQLiteHelper"]:
+        """
+        Keep one connection open for every call made inside the with block.
+
+        Scopes nest; the connection is closed when the outermost scope exits.
+        Calls made outside any scope open and close their own connection.
+
+        Args:
+            write (bool): The block writes, so put the connection in the
+                profile's journal mode first
+        """
+        if not self.in_session():
+            self.db_connection = self.connect()
+            self._journal_mode_set = False
+        if write:
+            self.prepare_write()
+
+        self._scope_depth += 1
+        try:
+            yield self
+        finally:
+            self._scope_depth -= 1
+            if not self.in_session():
+                self.db_connection.close()
 
     def text_to_real(self, table_name: str, column_name: str) -> None:
-        table_info = self.get_table_info(table_name)
-
-        column_type = None
-
-        for column in table_info:
-            if column[1] == column_name:
-                column_type = column[2]
-
-        if column_type == "TEXT":
-            sql_statements = [
-                f"ALTER TABLE {table_name} ADD COLUMN {column_name}_real REAL",
-                f"UPDATE {table_name} SET {column_name}_real = CAST(REPLACE(REPLACE(REPLACE({column_name}, '£', ''), ',', ''), ' ', '') AS REAL)",
-            ]
-            for sql_statement in sql_statements:
-                self.executeAndCommit(sql_statement)
-
-            self.drop_column(table_name, column_name)
-            self.rename_column(table_name, f"{column_name}_real", column_name)
+        self.texts_to_real(table_name, [column_name])
+
+    def texts_to_real(self, table_name: str, column_names: Sequence[str]) -> None:
+        """
+        Convert the TEXT columns among column_names to REAL, in one rebuild.
+        """
+        migration = TableMigration(table_name)
+        for column_name in column_names:
+            column_info = self.get_column_info(table_name, column_name)
+            if column_info and column_info[2] == "TEXT":
+                migration.change_type(
+                    column_name, "REAL", using=text_to_real_sql(column_name)
+                )
+
+        self.migrate_table(migration)
 
 
 def to_column_name(name: str) -> str:
@@ -0,0 +1,84 @@
+"""
+Named sets of SQLite PRAGMAs, applied to every new connection.
+
+SQLITE_PROFILE picks one. "default" keeps SQLite's own settings. "ingest"
+and "report" use a larger page cache and memory-mapped reads. "report" also
+uses WAL, so reports can read while another connection writes; the mode is
+stored in the file, so it is set only by connections that write.
+"""
+
+# standard imports
+import sqlite3
+from dataclasses import dataclass
+from typing import Any
+
+# local imports
+from finances.classes.config import Config
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    name: str
+    # None leaves the file's journal mode as it is
+    journal_mode: str | None
+    synchronous: str
+    # Negative sizes are KiB, as PRAGMA cache_size takes them
+    cache_size: int
+    mmap_size: int
+    temp_store: str
+    busy_timeout: int
+
+    def get_pragmas(self) -> list[str]:
+        return [
+            f"PRAGMA busy_timeout = {self.busy_timeout}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = {self.cache_size}",
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
+
+
+PROFILES = {
+    # SQLite's defaults, with sqlite3's five second busy timeout
+    "default": SQLiteProfile("default", None, "FULL", -2000, 0, "DEFAULT", 5000),
+    # Builds run with apply_build_pragmas' journal_mode = OFF instead
+    "ingest": SQLiteProfile(
+        "ingest", None, "NORMAL", -262144, 268435456, "MEMORY", 30000
+    ),
+    "report": SQLiteProfile(
+        "report", "WAL", "NORMAL", -65536, 268435456, "MEMORY", 5000
+    ),
+}
+
+
+def apply_journal_mode(connection: sqlite3.Connection, profile: SQLiteProfile) -> None:
+    """
+    Set the profile's journal mode, before the connection's first write.
+
+    Changing the mode writes the file header, so connections that only read
+    leave it alone.
+    """
+    if profile.journal_mode:
+        connection.execute(f"PRAGMA journal_mode = {profile.journal_mode}")
+
+
+def apply_profile(connection: sqlite3.Connection, profile: SQLiteProfile) -> None:
+    for pragma in profile.get_pragmas():
+        connection.execute(pragma)
+
+
+def get_profile(name: str | None = None) -> SQLiteProfile:
+    """
+    The named profile, by default the one SQLITE_PROFILE names.
+    """
+    name = name or Config().get("SQLITE_PROFILE", "default")
+    if name not in PROFILES:
+        raise ValueError(f"SQLITE_PROFILE must be one of {list(PROFILES)}, not {name}")
+    return PROFILES[name]
+
+
+def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    SQLAlchemy "connect" event hook, applying the configured profile.
+    """
+    apply_profile(dbapi_connection, get_profile())
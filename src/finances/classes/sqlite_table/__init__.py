@@ -1,12 +1,13 @@
 from typing import Any
 
+from finances.classes.connection_registry import registry
 from finances.classes.query_builder import QueryBuilder
 from finances.classes.sqlite_helper import SQLiteHelper
 
 
 class SQLiteTable:
     def __init__(self, table_name: str) -> None:
-        self.sql = SQLiteHelper()
+        self.sql = registry.get_shared("SQLiteHelper", SQLiteHelper)
         self.table_name = table_name
 
     def fetch_all(self) -> list[Any]:
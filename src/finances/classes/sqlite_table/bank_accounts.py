@@ -19,13 +19,13 @@ class BankAccounts(SQLiteTable):
 
     def get_value_by_key_column(self, column_name: str) -> Any:
         if self.key:
-            query = (
+            query, params = (
                 self.query_builder()
                 .select(column_name)
-                .where(f'"key" = "{self.key}"')
+                .where('"key" = :key', {"key": self.key})
                 .build()
             )
-            result = self.sql.fetch_one_value(query)
+            result = self.sql.fetch_one_value(query, params)
         else:
             result = None
 
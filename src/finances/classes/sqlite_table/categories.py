@@ -8,19 +8,30 @@ class Categories(SQLiteTable):
         self.category = category
 
     def fetch_by_category(self, category):
-        query = self.query_builder().where(f"category = '{category}'").build()
-        return self.sql.fetch_all(query)
+        query, params = (
+            self.query_builder()
+            .where('"category" = :category', {"category": category})
+            .build()
+        )
+        return self.sql.fetch_all(query, params)
 
     def fetch_by_hmrc_page_id(self, hmrc_page, hmrc_question_id, person_code):
-        query = (
+        query, params = (
             self.query_builder()
             .select("category")
             .where(
-                f'"hmrc_page"="{hmrc_page}" AND "hmrc_question_id"="{hmrc_question_id}" AND "category" LIKE "HMRC {person_code}%"'
+                '"hmrc_page" = :hmrc_page'
+                ' AND "hmrc_question_id" = :hmrc_question_id'
+                ' AND "category" LIKE :category_like',
+                {
+                    "hmrc_page": hmrc_page,
+                    "hmrc_question_id": hmrc_question_id,
+                    "category_like": f"HMRC {person_code}%",
+                },
             )
             .build()
         )
-        return self.sql.fetch_one_value(query)
+        return self.sql.fetch_one_value(query, params)
 
     def get_description(self) -> Any:
         return self.get_value_by_category("description")
@@ -30,13 +41,13 @@ class Categories(SQLiteTable):
 
     def get_value_by_category(self, column_name):
         if self.category:
-            query = (
+            query, params = (
                 self.query_builder()
                 .select(column_name)
-                .where(f'"category" = "{self.category}"')
+                .where('"category" = :category', {"category": self.category})
                 .build()
             )
-            result = self.sql.fetch_one_value(query)
+            result = self.sql.fetch_one_value(query, params)
         else:
             result = None
 
@@ -21,14 +21,14 @@ class HMRC_Businesses(SQLiteTable):
 
     def _get_value_by_business_name(self, column_name: str) -> str:
         business_name = self.business_name
-        query = (
+        query, params = (
             self.query_builder()
             .select(column_name)
-            .where(f'"business_name" = "{business_name}"')
+            .where('"business_name" = :business_name', {"business_name": business_name})
             .build()
         )
 
-        result = self.sql.fetch_one_value(query)
+        result = self.sql.fetch_one_value(query, params)
 
         if result is None:
             raise ValueError(
@@ -1,6 +1,6 @@
 from decimal import Decimal
-from functools import cache
 
+from finances.classes.memo import memoized
 from finances.classes.sqlite_helper import to_table_name
 from finances.classes.sqlite_table import SQLiteTable
 
@@ -9,14 +9,14 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
     def _get_value_by_hmrc_constant(self, hmrc_constant: str) -> Decimal:
         tax_year = self.tax_year
         tax_year_col = self.tax_year_col
-        query = (
+        query, params = (
             self.query_builder()
             .select(tax_year_col)
-            .where(f'"hmrc_constant" = "{hmrc_constant}"')
+            .where('"hmrc_constant" = :hmrc_constant', {"hmrc_constant": hmrc_constant})
             .build()
         )
         result = self.sql.fetch_one_value(
-            query
+            query, params
         )  # Could be formatted as a float, a ccy, etc.
 
         if result is None:
@@ -31,7 +31,7 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
         self.tax_year = tax_year
         self.tax_year_col = to_table_name(tax_year)
 
-    @cache
+    @memoized
     def get_additional_rate_threshold(self) -> Decimal:
         additional_rate_threshold = self._get_value_by_hmrc_constant(
             "Additional rate threshold"
@@ -39,13 +39,13 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return additional_rate_threshold
 
-    @cache
+    @memoized
     def get_basic_rate_threshold(self) -> Decimal:
         basic_rate_threshold = self._get_value_by_hmrc_constant("Basic rate threshold")
 
         return basic_rate_threshold
 
-    @cache
+    @memoized
     def get_class_2_weekly_rate(self) -> Decimal:
         class_2_nics_weekly_rate = self._get_value_by_hmrc_constant(
             "NIC Class 2 weekly rate"
@@ -53,7 +53,7 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return class_2_nics_weekly_rate
 
-    @cache
+    @memoized
     def get_class_4_lower_profits_limit(self) -> Decimal:
         class_4_lower_profits_limit = self._get_value_by_hmrc_constant(
             "NIC Class 4 lower profits limit"
@@ -61,7 +61,7 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return class_4_lower_profits_limit
 
-    @cache
+    @memoized
     def get_class_4_upper_profits_limit(self) -> Decimal:
         class_4_upper_profits_limit = self._get_value_by_hmrc_constant(
             "NIC Class 4 upper profits limit"
@@ -69,13 +69,13 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return class_4_upper_profits_limit
 
-    @cache
+    @memoized
     def get_dividends_allowance(self) -> Decimal:
         dividends_allowance = self._get_value_by_hmrc_constant("Dividends allowance")
 
         return dividends_allowance
 
-    @cache
+    @memoized
     def get_higher_rate_threshold(self) -> Decimal:
         higher_rate_threshold = self._get_value_by_hmrc_constant(
             "Higher rate threshold"
@@ -83,19 +83,19 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return higher_rate_threshold
 
-    @cache
+    @memoized
     def get_marriage_allowance(self) -> Decimal:
         marriage_allowance = self._get_value_by_hmrc_constant("Marriage allowance")
 
         return marriage_allowance
 
-    @cache
+    @memoized
     def get_personal_allowance(self) -> Decimal:
         personal_allowance = self._get_value_by_hmrc_constant("Personal allowance")
 
         return personal_allowance
 
-    @cache
+    @memoized
     def get_personal_savings_allowance(self) -> Decimal:
         personal_savings_allowance = self._get_value_by_hmrc_constant(
             "Personal savings allowance for basic rate taxpayers"
@@ -103,7 +103,7 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return personal_savings_allowance
 
-    @cache
+    @memoized
     def get_property_income_allowance(self) -> Decimal:
         property_income_allowance = self._get_value_by_hmrc_constant(
             "Property income allowance"
@@ -111,13 +111,13 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return property_income_allowance
 
-    @cache
+    @memoized
     def get_savings_nil_band(self) -> Decimal:
         savings_nil_band = self._get_value_by_hmrc_constant("Savings nil band")
 
         return savings_nil_band
 
-    @cache
+    @memoized
     def get_small_profits_threshold(self) -> Decimal:
         small_profits_threshold = self._get_value_by_hmrc_constant(
             "NIC Class 2 small profits threshold"
@@ -125,7 +125,7 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return small_profits_threshold
 
-    @cache
+    @memoized
     def get_starting_rate_limit_for_savings(self) -> Decimal:
         starting_rate_limit_for_savings = self._get_value_by_hmrc_constant(
             "Starting rate limit for savings"
@@ -133,7 +133,7 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return starting_rate_limit_for_savings
 
-    # @cache
+    # @memoized
     def get_trading_income_allowance(self) -> Decimal:
         trading_income_allowance = self._get_value_by_hmrc_constant(
             "Trading income allowance"
@@ -141,7 +141,7 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return trading_income_allowance
 
-    @cache
+    @memoized
     def get_vat_registration_threshold(self) -> Decimal:
         vat_registration_threshold = self._get_value_by_hmrc_constant(
             "VAT registration threshold"
@@ -149,7 +149,7 @@ class HMRC_ConstantAmountsByYear(SQLiteTable):
 
         return vat_registration_threshold
 
-    @cache
+    @memoized
     def get_weekly_state_pension(self) -> Decimal:
         weekly_state_pension = self._get_value_by_hmrc_constant("Weekly state pension")
 
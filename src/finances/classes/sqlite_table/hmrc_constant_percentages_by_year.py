@@ -71,14 +71,14 @@ class HMRC_ConstantPercentagesByYear(SQLiteTable):
     def _get_value_by_hmrc_constant(self, hmrc_constant: str) -> Percentage:
         tax_year = self.tax_year
         tax_year_col = self.tax_year_col
-        query = (
+        query, params = (
             self.query_builder()
             .select(tax_year_col)
-            .where(f'"hmrc_constant" = "{hmrc_constant}"')
+            .where('"hmrc_constant" = :hmrc_constant', {"hmrc_constant": hmrc_constant})
             .build()
         )
         result = self.sql.fetch_one_value(
-            query
+            query, params
         )  # Could be formatted as a float, a ccy, etc.
 
         if result is None:
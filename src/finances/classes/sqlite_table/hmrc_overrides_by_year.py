@@ -1,5 +1,4 @@
-from functools import cache
-
+from finances.classes.memo import memoized
 from finances.classes.sqlite_helper import to_table_name
 from finances.classes.sqlite_table import SQLiteTable
 
@@ -15,14 +14,17 @@ class HMRCOverridesByYear(SQLiteTable):
         person_code = self.person_code
         tax_year = self.tax_year
         tax_year_col = self.tax_year_col
-        query = (
+        query, params = (
             self.query_builder()
             .select(tax_year_col)
-            .where(f'"person_code" = "{person_code}" AND "override" = "{override}"')
+            .where(
+                '"person_code" = :person_code AND "override" = :override',
+                {"person_code": person_code, "override": override},
+            )
             .build()
         )
         result = self.sql.fetch_one_value(
-            query
+            query, params
         )  # Could be formatted as a float, a ccy, etc.
 
         if result is None:
@@ -32,13 +34,13 @@ class HMRCOverridesByYear(SQLiteTable):
 
         return result
 
-    @cache
+    @memoized
     def deduct_trading_expenses(self) -> bool:
         deduct_trading_expenses = self._get_value_by_override("Deduct trading expenses")
 
         return deduct_trading_expenses == "Yes"
 
-    @cache
+    @memoized
     def use_trading_allowance(self) -> bool:
         try:
             value = self._get_value_by_override("Use trading allowance")
@@ -10,13 +10,13 @@ class HMRCPeopleDetails(SQLiteTable):
 
     def _get_value_by_code_column(self, column_name: str) -> str | None:
         if self.code:
-            query = (
+            query, params = (
                 self.query_builder()
                 .select(column_name)
-                .where(f'"code" = "{self.code}"')
+                .where('"code" = :code', {"code": self.code})
                 .build()
             )
-            result = str(self.sql.fetch_one_value(query))
+            result = str(self.sql.fetch_one_value(query, params))
         else:
             result = None
 
@@ -28,8 +28,10 @@ class HMRCPeopleDetails(SQLiteTable):
         )
 
     def fetch_by_code(self, code: str) -> list[dict[str, str]]:
-        query = self.query_builder().where(f"code = '{code}'").build()
-        return self.sql.fetch_all(query)
+        query, params = (
+            self.query_builder().where('"code" = :code', {"code": code}).build()
+        )
+        return self.sql.fetch_all(query, params)
 
     def get_marital_status(self) -> str | None:
         return self._get_value_by_code_column("marital_status")
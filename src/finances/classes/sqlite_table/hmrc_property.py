@@ -5,13 +5,13 @@ class HMRC_Property(SQLiteTable):
     def _get_value_by_postcode_column(self, column_name):
         postcode = self.postcode
         if postcode:
-            query = (
+            query, params = (
                 self.query_builder()
                 .select(column_name)
-                .where(f'"property_postcode" = "{postcode}"')
+                .where('"property_postcode" = :postcode', {"postcode": postcode})
                 .build()
             )
-            result = str(self.sql.fetch_one_value(query))
+            result = str(self.sql.fetch_one_value(query, params))
         else:
             raise ValueError(f"Unexpected postcode: {postcode}")
 
@@ -22,8 +22,12 @@ class HMRC_Property(SQLiteTable):
         self.postcode = postcode
 
     def fetch_by_postcode(self, postcode):
-        query = self.query_builder().where(f"postcode = '{postcode}'").build()
-        return self.sql.fetch_all(query)
+        query, params = (
+            self.query_builder()
+            .where('"postcode" = :postcode', {"postcode": postcode})
+            .build()
+        )
+        return self.sql.fetch_all(query, params)
 
     def get_property_postcode(self) -> str:
         return self.postcode
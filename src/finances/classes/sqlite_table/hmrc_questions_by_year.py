@@ -35,7 +35,7 @@ class HMRC_QuestionsByYear(SQLiteTable):
 
         super().__init__(table_name)
 
-    def _get_questions(self, columns: list[str], order_column: str) -> list[list[str]]:
+    def _fetch_question_rows(self, columns: list[str], order_column: str) -> list[Any]:
         for col in columns:
             validate_column_name(col)
         validate_column_name(order_column)
@@ -51,6 +51,9 @@ class HMRC_QuestionsByYear(SQLiteTable):
             + f' ORDER BY q1."{order_column}" ASC'
         )
 
+        return self.sql.fetch_all(query)
+
+    def _to_questions(self, rows: list[Any]) -> list[list[str]]:
         questions: list[list[str]] = [
             [
                 row[0],  # question
@@ -60,7 +63,7 @@ class HMRC_QuestionsByYear(SQLiteTable):
                 self.to_method_name(row[0]),  # method
                 row[4],  # additional information
             ]
-            for row in self.sql.fetch_all(query)
+            for row in rows
         ]
 
         return questions
@@ -120,7 +123,7 @@ class HMRC_QuestionsByYear(SQLiteTable):
         ]
         return questions
 
-    def get_online_questions(self) -> Any:
+    def fetch_online_question_rows(self) -> list[Any]:
         columns = [
             "question",
             "online_section",
@@ -128,12 +131,18 @@ class HMRC_QuestionsByYear(SQLiteTable):
             "online_box",
         ]
         order_column = "online_order"
-        return self._get_questions(columns, order_column)
+        return self._fetch_question_rows(columns, order_column)
 
-    def get_printed_form_questions(self) -> Any:
+    def fetch_printed_form_question_rows(self) -> list[Any]:
         columns = ["question", "printed_section", "printed_header", "printed_box"]
         order_column = "printed_order"
-        return self._get_questions(columns, order_column)
+        return self._fetch_question_rows(columns, order_column)
+
+    def get_online_questions(self) -> Any:
+        return self._to_questions(self.fetch_online_question_rows())
+
+    def get_printed_form_questions(self) -> Any:
+        return self._to_questions(self.fetch_printed_form_question_rows())
 
     def is_it_a_yes_no_question(self, question: str) -> bool:
         return any(question.startswith(q) for q in self.yes_no_questions)
@@ -9,8 +9,10 @@ class People(SQLiteTable):
         self.code = code
 
     def fetch_by_code(self, code):
-        query = self.query_builder().where(f"code = '{code}'").build()
-        return self.sql.fetch_all(query)
+        query, params = (
+            self.query_builder().where('"code" = :code', {"code": code}).build()
+        )
+        return self.sql.fetch_all(query, params)
 
     def get_address(self) -> Any:
         return self.get_value_by_code_column("address")
@@ -41,13 +43,13 @@ class People(SQLiteTable):
 
     def get_value_by_code_column(self, column_name):
         if self.code:
-            query = (
+            query, params = (
                 self.query_builder()
                 .select(column_name)
-                .where(f'"code" = "{self.code}"')
+                .where('"code" = :code', {"code": self.code})
                 .build()
             )
-            result = self.sql.fetch_one_value(query)
+            result = self.sql.fetch_one_value(query, params)
         else:
             result = None
 
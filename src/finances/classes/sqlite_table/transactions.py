@@ -1,26 +1,65 @@
+from collections.abc import Mapping
 from decimal import Decimal
+from typing import Any
 
+from finances.classes.money_storage import STORAGE_PENCE, get_column_storage
 from finances.classes.sqlite_table import SQLiteTable
-from finances.util.financial_helpers import round_even
+from finances.util.financial_helpers import from_pence, round_even
 
 
 class Transactions(SQLiteTable):
     def __init__(self) -> None:
         super().__init__("transactions")
 
-    def fetch_total_where(self, where_clause: str) -> Decimal:
-        query = self.query_builder().total("nett").where(f"{where_clause}").build()
-        total = self.sql.fetch_one_value_decimal(query)
-        return round_even(Decimal(total))
+        self.money_storage = get_column_storage(self.sql, self.table_name, "nett")
+
+    def fetch_total_where(
+        self, where_clause: str, params: Mapping[str, Any] | None = None
+    ) -> Decimal:
+        query, params = (
+            self.query_builder().total("nett").where(where_clause, params).build()
+        )
+        total = self.sql.fetch_one_value(query, params)
+        if self.money_storage == STORAGE_PENCE:
+            # An exact integer sum, so no float parsing or drift
+            return from_pence(total)
+
+        return round_even(Decimal(total or 0))
 
     def fetch_total_by_tax_year_category(self, tax_year: str, category: str) -> Decimal:
-        where_clause = f'"tax_year" = "{tax_year}" AND "category" = "{category}"'
-        return self.fetch_total_where(where_clause)
+        where_clause = '"tax_year" = :tax_year AND "category" = :category'
+        return self.fetch_total_where(
+            where_clause, {"tax_year": tax_year, "category": category}
+        )
 
     def fetch_total_by_tax_year_category_like(
         self, tax_year: str, category_like: str
     ) -> Decimal:
-        where_clause = (
-            f'"tax_year" = "{tax_year}" AND "category" LIKE "{category_like}%"'
+        where_clause = '"tax_year" = :tax_year AND "category" LIKE :category_like'
+        return self.fetch_total_where(
+            where_clause, {"tax_year": tax_year, "category_like": f"{category_like}%"}
         )
-        return self.fetch_total_where(where_clause)
+
+    def fetch_totals_by_category(self, tax_year: str) -> list[Any]:
+        """
+        Return (category, total nett, count) for every category in tax_year.
+
+        The totals are Decimal, summed exactly as pence when nett is stored so.
+        """
+        query, params = (
+            self.query_builder()
+            .select_raw('"category", COALESCE(SUM("nett"), 0), COUNT(*)')
+            .where('"tax_year" = :tax_year', {"tax_year": tax_year})
+            .group("category")
+            .build()
+        )
+        rows = self.sql.fetch_all(query, params)
+        if self.money_storage == STORAGE_PENCE:
+            return [
+                (category, from_pence(total), count) for category, total, count in rows
+            ]
+
+        # str() keeps the float sum's shortest repr, e.g. 0.1 not 0.1000000000000000055
+        return [
+            (category, Decimal(str(total)), count) for category, total, count in rows
+        ]
@@ -0,0 +1,124 @@
+"""
+Rebuild a copy of the database, then swap it over the live file.
+
+Readers see either the old database or the new one, never a half-finished
+ingest. The file replaced is kept alongside as the previous generation, to
+roll back to or ATTACH and compare against.
+"""
+
+# standard imports
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+# local imports
+from finances.classes.exception_helper import ExceptionHelper
+
+STAGING_SUFFIX = ".staging"
+PREVIOUS_SUFFIX = ".previous"
+
+# Safe because a failed build is thrown away, never recovered
+BUILD_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+)
+
+
+class StagedDatabaseError(ExceptionHelper):
+    pass
+
+
+class StagedDatabase:
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.staging_path = db_path + STAGING_SUFFIX
+        self.previous_path = get_previous_path(db_path)
+
+    def discard(self) -> None:
+        Path(self.staging_path).unlink(missing_ok=True)
+
+    def prepare(self) -> None:
+        """
+        Start the staging file as a consistent copy of the live database.
+        """
+        self.discard()
+        staging = sqlite3.connect(self.staging_path)
+        try:
+            if os.path.exists(self.db_path):
+                live = sqlite3.connect(self.db_path)
+                try:
+                    live.backup(staging)
+                finally:
+                    live.close()
+        finally:
+            staging.close()
+
+    def swap_in(self, keep_previous: bool = True) -> None:
+        """
+        Replace the live database with the staging file.
+
+        Args:
+            keep_previous (bool): Keep the live database as the previous
+                generation; False leaves the existing previous generation
+        """
+        self.settle_journals()
+        if keep_previous and os.path.exists(self.db_path):
+            Path(self.previous_path).unlink(missing_ok=True)
+            try:
+                # A second name for the live file, so it is never missing
+                os.link(self.db_path, self.previous_path)
+            except OSError:
+                shutil.copy2(self.db_path, self.previous_path)
+
+        os.replace(self.staging_path, self.db_path)
+
+    def settle_journals(self) -> None:
+        """
+        Leave both files complete on their own, without -wal files.
+
+        The staging copy may have inherited WAL mode from the live database,
+        and a live -wal file must not be applied to the file swapped in.
+        """
+        staging = sqlite3.connect(self.staging_path)
+        try:
+            staging.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            staging.close()
+
+        if not os.path.exists(self.db_path):
+            return
+        live = sqlite3.connect(self.db_path)
+        try:
+            busy = live.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+        finally:
+            live.close()
+        if busy:
+            raise StagedDatabaseError(
+                f"{self.db_path} is busy, so its WAL could not be checkpointed"
+            )
+
+
+def apply_build_pragmas(connection: sqlite3.Connection) -> None:
+    for statement in BUILD_PRAGMAS:
+        connection.execute(statement)
+
+
+def get_previous_path(db_path: str) -> str:
+    return db_path + PREVIOUS_SUFFIX
+
+
+def restore_previous(db_path: str) -> None:
+    """
+    Swap the previous generation back in, keeping it for another restore.
+
+    Args:
+        db_path (str): The live database file.
+    """
+    previous_path = get_previous_path(db_path)
+    if not os.path.exists(previous_path):
+        raise StagedDatabaseError(f"No previous generation at {previous_path}")
+
+    staged = StagedDatabase(db_path)
+    shutil.copy2(previous_path, staged.staging_path)
+    staged.swap_in(keep_previous=False)
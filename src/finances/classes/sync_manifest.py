@@ -0,0 +1,97 @@
+# standard imports
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+# local imports
+from finances.classes.sqlite_helper import SQLiteHelper
+
+
+@dataclass(frozen=True)
+class SyncManifestEntry:
+    table_name: str
+    worksheet_title: str
+    content_hash: str
+    modified_time: str | None
+    synced_at: str
+
+
+class SyncManifest:
+    """
+    What each table was last synced from, stored alongside the tables.
+
+    A worksheet whose content hash matches its entry, and whose table still
+    exists, does not need converting again.
+    """
+
+    TABLE_NAME = "sync_manifest"
+
+    def __init__(self, sql: SQLiteHelper) -> None:
+        self.sql = sql
+
+    def create_table(self) -> None:
+        self.sql.executeAndCommit(
+            f"""
+CREATE TABLE IF NOT EXISTS "{self.TABLE_NAME}" (
+    "table_name" TEXT PRIMARY KEY,
+    "worksheet_title" TEXT NOT NULL,
+    "content_hash" TEXT NOT NULL,
+    "modified_time" TEXT,
+    "synced_at" TEXT NOT NULL
+)
+"""
+        )
+
+    def get_entries(self) -> dict[str, SyncManifestEntry]:
+        """
+        Every entry whose table still exists, by table name.
+        """
+        self.create_table()
+        table_names = set(self.sql.get_table_names())
+        rows = self.sql.fetch_all(
+            "SELECT table_name, worksheet_title, content_hash, modified_time,"
+            f' synced_at FROM "{self.TABLE_NAME}"'
+        )
+        return {
+            row[0]: SyncManifestEntry(*row) for row in rows if row[0] in table_names
+        }
+
+    def record(
+        self,
+        table_name: str,
+        worksheet_title: str,
+        content_hash: str,
+        modified_time: str | None,
+    ) -> None:
+        self.sql.executeAndCommit(
+            f'INSERT OR REPLACE INTO "{self.TABLE_NAME}"'
+            " (table_name, worksheet_title, content_hash, modified_time, synced_at)"
+            " VALUES (:table_name, :worksheet_title, :content_hash,"
+            " :modified_time, :synced_at)",
+            {
+                "table_name": table_name,
+                "worksheet_title": worksheet_title,
+                "content_hash": content_hash,
+                "modified_time": modified_time,
+                "synced_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            },
+        )
+
+
+def hash_values(values: list[list[str]], settings: Any = None) -> str:
+    """
+    Hash a worksheet's values, so an unchanged worksheet hashes the same.
+
+    Args:
+        values (list[list[str]]): The worksheet's rows of cell values.
+        settings (Any): JSON-serialisable settings the values are read with,
+            so a change to them changes the hash too.
+
+    Returns:
+        str: The SHA-256 hex digest of the values.
+    """
+    hashed = values if settings is None else [settings, values]
+    content = json.dumps(hashed, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()
@@ -0,0 +1,197 @@
+# standard imports
+import sqlite3
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+# local imports
+from finances.classes.sqlite_helper import SQLiteHelper
+
+
+@dataclass(frozen=True)
+class TableDiff:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    def __str__(self) -> str:
+        return f"+{self.inserted} ~{self.updated} -{self.deleted}"
+
+
+def apply_table_diff(
+    sql: SQLiteHelper,
+    table_name: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    key_columns: Sequence[str],
+) -> TableDiff:
+    """
+    Make table_name hold rows, changing only the rows that differ.
+
+    Rows are matched on key_columns. Without key columns a row's whole
+    content is its key: matching rows, and their synthetic ids, are kept
+    and only added or removed rows are written. Either way the changes are
+    made in one transaction.
+
+    Args:
+        sql (SQLiteHelper): The helper, inside a session.
+        table_name (str): The table to change, which must already exist.
+        columns (Sequence[str]): The columns of rows, without any id column.
+        rows (Iterable[Sequence[Any]]): The rows the table should hold.
+        key_columns (Sequence[str]): The natural key columns, if any.
+
+    Returns:
+        TableDiff: How many rows were inserted, updated and deleted.
+    """
+    if not sql.in_session():
+        raise ValueError("apply_table_diff needs a session, for one transaction")
+
+    stage = f"_stage_{table_name}"
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    placeholders = ", ".join("?" for _ in columns)
+
+    connection = sql.db_connection
+    cursor = connection.cursor()
+    try:
+        # Built from the target table, so the stage applies the same affinity
+        cursor.execute(f'DROP TABLE IF EXISTS temp."{stage}"')
+        cursor.execute(
+            f'CREATE TEMP TABLE "{stage}" AS'
+            f' SELECT {column_list} FROM "{table_name}" WHERE 0'
+        )
+        cursor.executemany(
+            f'INSERT INTO temp."{stage}" ({column_list}) VALUES ({placeholders})',
+            rows,
+        )
+
+        if key_columns:
+            diff = _apply_keyed_diff(cursor, table_name, stage, columns, key_columns)
+        else:
+            diff = _apply_content_diff(cursor, table_name, stage, columns)
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.execute(f'DROP TABLE IF EXISTS temp."{stage}"')
+
+    return diff
+
+
+def _apply_content_diff(
+    cursor: sqlite3.Cursor, table_name: str, stage: str, columns: Sequence[str]
+) -> TableDiff:
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    same_row = " AND ".join(
+        [f'e."{column}" IS s."{column}"' for column in columns]
+        + ["e.occurrence = s.occurrence"]
+    )
+
+    # Numbering repeats lets identical rows be matched one to one
+    numbered = f"""
+WITH e AS (
+    SELECT "id", {column_list},
+        ROW_NUMBER() OVER (PARTITION BY {column_list} ORDER BY "id") AS occurrence
+    FROM "{table_name}"
+),
+s AS (
+    SELECT rowid AS position, {column_list},
+        ROW_NUMBER() OVER (PARTITION BY {column_list} ORDER BY rowid) AS occurrence
+    FROM temp."{stage}"
+)
+"""
+
+    deleted = _execute(
+        cursor,
+        numbered
+        + f"""
+DELETE FROM "{table_name}" WHERE "id" IN (
+    SELECT e."id" FROM e WHERE NOT EXISTS (SELECT 1 FROM s WHERE {same_row})
+)
+""",
+    )
+
+    inserted = _execute(
+        cursor,
+        numbered
+        + f"""
+INSERT INTO "{table_name}" ({column_list})
+SELECT {", ".join(f's."{column}"' for column in columns)} FROM s
+WHERE NOT EXISTS (SELECT 1 FROM e WHERE {same_row})
+ORDER BY s.position
+""",
+    )
+
+    return TableDiff(inserted=inserted, deleted=deleted)
+
+
+def _apply_keyed_diff(
+    cursor: sqlite3.Cursor,
+    table_name: str,
+    stage: str,
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+) -> TableDiff:
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    value_columns = [column for column in columns if column not in key_columns]
+    same_key = " AND ".join(
+        f's."{column}" IS "{table_name}"."{column}"' for column in key_columns
+    )
+
+    key_list = ", ".join(f'"{column}"' for column in key_columns)
+    duplicate = cursor.execute(
+        f'SELECT {key_list} FROM temp."{stage}"'
+        f" GROUP BY {key_list} HAVING COUNT(*) > 1 LIMIT 1"
+    ).fetchone()
+    if duplicate:
+        raise ValueError(f"Duplicate key {duplicate} in rows for {table_name}")
+
+    deleted = _execute(
+        cursor,
+        f"""
+DELETE FROM "{table_name}"
+WHERE NOT EXISTS (SELECT 1 FROM temp."{stage}" s WHERE {same_key})
+""",
+    )
+
+    updated = 0
+    if value_columns:
+        value_list = ", ".join(f'"{column}"' for column in value_columns)
+        changed = " OR ".join(
+            f's."{column}" IS NOT "{table_name}"."{column}"' for column in value_columns
+        )
+        updated = _execute(
+            cursor,
+            f"""
+UPDATE "{table_name}"
+SET ({value_list}) = (
+    SELECT {", ".join(f's."{column}"' for column in value_columns)}
+    FROM temp."{stage}" s WHERE {same_key}
+)
+WHERE EXISTS (SELECT 1 FROM temp."{stage}" s WHERE {same_key} AND ({changed}))
+""",
+        )
+
+    inserted = _execute(
+        cursor,
+        f"""
+INSERT INTO "{table_name}" ({column_list})
+SELECT {column_list} FROM temp."{stage}" s
+WHERE NOT EXISTS (SELECT 1 FROM "{table_name}" WHERE {same_key})
+ORDER BY s.rowid
+""",
+    )
+
+    return TableDiff(inserted=inserted, updated=updated, deleted=deleted)
+
+
+def _execute(cursor: sqlite3.Cursor, statement: str) -> int:
+    """
+    Execute statement, returning how many rows it changed.
+    """
+    cursor.execute(statement)
+
+    # rowcount is -1 for statements that start with WITH
+    changes: int = cursor.execute("SELECT changes()").fetchone()[0]
+    return changes
@@ -0,0 +1,383 @@
+"""
+Column changes for one table, planned together and applied in one go.
+
+Type changes need the table rebuilt, since SQLite cannot change a column's
+type in place. All of a table's changes share that one rebuild, instead of
+one copy per change. Renames and drops alone use ALTER TABLE when the SQLite
+library supports it. Either way the table keeps its indexes.
+"""
+
+# standard imports
+import re
+import sqlite3
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Self
+
+# local imports
+from finances.classes.exception_helper import ExceptionHelper
+
+# The first SQLite versions with each ALTER TABLE form
+NATIVE_DROP_COLUMN = (3, 35, 0)
+NATIVE_RENAME_COLUMN = (3, 25, 0)
+
+
+class TableMigrationError(ExceptionHelper):
+    pass
+
+
+@dataclass(frozen=True)
+class ChangeType:
+    column: str
+    sqlite_type: str
+    # SQL for the new value, in terms of the old column; by default the value
+    # is copied and the new type's affinity applies
+    using: str | None = None
+
+
+@dataclass(frozen=True)
+class DropColumn:
+    column: str
+
+
+@dataclass(frozen=True)
+class RenameColumn:
+    column: str
+    new_name: str
+
+
+ColumnOperation = ChangeType | DropColumn | RenameColumn
+
+
+@dataclass(frozen=True)
+class Index:
+    name: str
+    table_name: str
+    unique: bool
+    partial: bool
+    # Column name, DESC and collation of each key, or None for an expression
+    keys: tuple[tuple[str, bool, str] | None, ...]
+    sql: str
+
+    @property
+    def columns(self) -> list[str]:
+        return [key[0] for key in self.keys if key]
+
+    def get_create_statement(
+        self, drops: set[str], renames: dict[str, str]
+    ) -> str | None:
+        """
+        Recreate the index after a rebuild, or None if a column was dropped.
+        """
+        if self.partial or None in self.keys:
+            # Expressions cannot be rewritten, so only unaffected ones are kept
+            for column in drops | set(renames):
+                if re.search(rf"\b{re.escape(column)}\b", self.sql):
+                    raise TableMigrationError(
+                        f"Index {self.name} uses changed column {column}"
+                    )
+            return self.sql
+
+        if drops & set(self.columns):
+            return None
+
+        keys = []
+        for key in self.keys:
+            if key is None:
+                continue
+            column, descending, collation = key
+            text = f'"{renames.get(column, column)}"'
+            if collation.upper() != "BINARY":
+                text += f" COLLATE {collation}"
+            if descending:
+                text += " DESC"
+            keys.append(text)
+
+        unique = "UNIQUE " if self.unique else ""
+        return (
+            f'CREATE {unique}INDEX "{self.name}"'
+            f' ON "{self.table_name}" ({", ".join(keys)})'
+        )
+
+
+class TableMigration:
+    def __init__(
+        self,
+        table_name: str,
+        sqlite_version: tuple[int, int, int] = sqlite3.sqlite_version_info,
+    ) -> None:
+        self.table_name = table_name
+        self.sqlite_version = sqlite_version
+        self.operations: list[ColumnOperation] = []
+
+    def __repr__(self) -> str:
+        return f"<TableMigration {self.table_name} {self.operations}>"
+
+    def apply(self, connection: sqlite3.Connection) -> None:
+        apply_migrations(connection, [self])
+
+    def can_alter_in_place(
+        self,
+        cursor: sqlite3.Cursor,
+        table_info: list[Any],
+        types: dict[str, ChangeType],
+        drops: set[str],
+        renames: dict[str, str],
+    ) -> bool:
+        if types:
+            return False
+        if renames and self.sqlite_version < NATIVE_RENAME_COLUMN:
+            return False
+        if set(renames.values()) & set(renames):
+            return False  # Swapped names would collide one ALTER at a time
+        if not drops:
+            return True
+        if self.sqlite_version < NATIVE_DROP_COLUMN:
+            return False
+
+        # SQLite refuses to drop a key or indexed column
+        keys = {row[1] for row in table_info if row[5]}
+        indexed = {
+            column
+            for index in get_indexes(cursor, self.table_name)
+            for column in index.columns
+        }
+        return not drops & (keys | indexed)
+
+    def change_type(
+        self, column: str, sqlite_type: str, using: str | None = None
+    ) -> Self:
+        self.operations.append(ChangeType(column, sqlite_type, using))
+        return self
+
+    def drop(self, column: str) -> Self:
+        self.operations.append(DropColumn(column))
+        return self
+
+    def get_changes(
+        self, columns: list[str]
+    ) -> tuple[dict[str, ChangeType], set[str], dict[str, str]]:
+        """
+        The type changes, drops and renames, checked against columns.
+        """
+        types: dict[str, ChangeType] = {}
+        drops: set[str] = set()
+        renames: dict[str, str] = {}
+        for operation in self.operations:
+            if operation.column not in columns:
+                raise TableMigrationError(
+                    f"No column {operation.column} in {self.table_name}"
+                )
+            if operation.column in drops:
+                raise TableMigrationError(
+                    f"Column {operation.column} of {self.table_name} is dropped"
+                )
+
+            if isinstance(operation, ChangeType):
+                types[operation.column] = operation
+            elif isinstance(operation, DropColumn):
+                drops.add(operation.column)
+            else:
+                renames[operation.column] = operation.new_name
+
+        kept = [
+            renames.get(column, column) for column in columns if column not in drops
+        ]
+        if len(set(kept)) != len(kept):
+            raise TableMigrationError(
+                f"Renames would duplicate a column of {self.table_name}: {kept}"
+            )
+
+        # A dropped column needs neither its new type nor its new name
+        for column in drops:
+            types.pop(column, None)
+            renames.pop(column, None)
+
+        return types, drops, renames
+
+    def plan(self, connection: sqlite3.Connection) -> list[str]:
+        """
+        The statements that make every change, from the table's current schema.
+        """
+        cursor = connection.cursor()
+        table_info = cursor.execute(
+            f"PRAGMA table_info('{self.table_name}')"
+        ).fetchall()
+        if not table_info:
+            raise TableMigrationError(f"No table {self.table_name}")
+
+        types, drops, renames = self.get_changes([row[1] for row in table_info])
+        if not (types or drops or renames):
+            return []
+
+        if self.can_alter_in_place(cursor, table_info, types, drops, renames):
+            return [
+                f'ALTER TABLE "{self.table_name}" RENAME COLUMN "{old}" TO "{new}"'
+                for old, new in renames.items()
+            ] + [
+                f'ALTER TABLE "{self.table_name}" DROP COLUMN "{column}"'
+                for column in drops
+            ]
+
+        return self.plan_rebuild(cursor, table_info, types, drops, renames)
+
+    def plan_rebuild(
+        self,
+        cursor: sqlite3.Cursor,
+        table_info: list[Any],
+        types: dict[str, ChangeType],
+        drops: set[str],
+        renames: dict[str, str],
+    ) -> list[str]:
+        table_name = self.table_name
+        create_sql = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table_name,),
+        ).fetchone()[0]
+        autoincrement = "AUTOINCREMENT" in create_sql.upper()
+
+        key_columns = [
+            row[1] for row in sorted(table_info, key=lambda row: row[5]) if row[5]
+        ]
+        if drops & set(key_columns):
+            raise TableMigrationError(f"Cannot drop a key column of {table_name}")
+
+        definitions = []
+        new_columns = []
+        selects = []
+        for _, column, column_type, not_null, default, key in table_info:
+            if column in drops:
+                continue
+
+            new_column = renames.get(column, column)
+            new_columns.append(f'"{new_column}"')
+            if column in types:
+                column_type = types[column].sqlite_type
+                selects.append(types[column].using or f'"{column}"')
+            else:
+                selects.append(f'"{column}"')
+
+            definition = f'"{new_column}" {column_type}'.rstrip()
+            if key and len(key_columns) == 1:
+                definition += " PRIMARY KEY"
+                if autoincrement and column_type.upper() == "INTEGER":
+                    definition += " AUTOINCREMENT"
+            if not_null:
+                definition += " NOT NULL"
+            if default is not None:
+                definition += f" DEFAULT {default}"
+            definitions.append(definition)
+
+        if len(key_columns) > 1:
+            key_list = ", ".join(f'"{renames.get(c, c)}"' for c in key_columns)
+            definitions.append(f"PRIMARY KEY ({key_list})")
+
+        # Build the indexes' statements now, while the old table describes them
+        index_statements = [
+            statement
+            for index in get_indexes(cursor, table_name)
+            if (statement := index.get_create_statement(drops, renames))
+        ]
+
+        new_table_name = f"_migrate_{table_name}"
+        statements = [
+            f'DROP TABLE IF EXISTS "{new_table_name}"',
+            f'CREATE TABLE "{new_table_name}" ({", ".join(definitions)})',
+            f'INSERT INTO "{new_table_name}" ({", ".join(new_columns)})'
+            f' SELECT {", ".join(selects)} FROM "{table_name}"',
+            f'DROP TABLE "{table_name}"',
+            # Let the new table take the old one's name despite views on it
+            "PRAGMA legacy_alter_table = ON",
+            f'ALTER TABLE "{new_table_name}" RENAME TO "{table_name}"',
+            "PRAGMA legacy_alter_table = OFF",
+            *index_statements,
+        ]
+
+        if autoincrement:
+            # Dropping the table forgot its sequence, so ids could be reused
+            row = cursor.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = ?", (table_name,)
+            ).fetchone()
+            if row:
+                seq = int(row[0])
+                statements += [
+                    f"UPDATE sqlite_sequence SET seq = MAX(seq, {seq})"
+                    f" WHERE name = '{table_name}'",
+                    # An empty table has no sequence row after the copy
+                    f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table_name}',"
+                    f" {seq} WHERE NOT EXISTS"
+                    f" (SELECT 1 FROM sqlite_sequence WHERE name = '{table_name}')",
+                ]
+
+        return statements
+
+    def rename(self, column: str, new_name: str) -> Self:
+        self.operations.append(RenameColumn(column, new_name))
+        return self
+
+
+def apply_migrations(
+    connection: sqlite3.Connection, migrations: Sequence[TableMigration]
+) -> None:
+    """
+    Plan and make every migration in one transaction.
+
+    Args:
+        connection (sqlite3.Connection): The database to change.
+        migrations (Sequence[TableMigration]): The tables' changes.
+    """
+    cursor = connection.cursor()
+    try:
+        # sqlite3 would otherwise commit each CREATE, DROP and ALTER on its own
+        if not connection.in_transaction:
+            cursor.execute("BEGIN")
+        for migration in migrations:
+            for statement in migration.plan(connection):
+                cursor.execute(statement)
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.execute("PRAGMA legacy_alter_table = OFF")
+
+
+def get_indexes(cursor: sqlite3.Cursor, table_name: str) -> list[Index]:
+    """
+    The indexes created on table_name, not those its constraints imply.
+    """
+    indexes = []
+    for _, name, unique, origin, partial in cursor.execute(
+        f"PRAGMA index_list('{table_name}')"
+    ).fetchall():
+        if origin != "c":
+            continue
+
+        keys: list[tuple[str, bool, str] | None] = []
+        for _, cid, column, descending, collation, key in cursor.execute(
+            f"PRAGMA index_xinfo('{name}')"
+        ).fetchall():
+            if key:
+                keys.append(
+                    None if cid == -2 else (column, bool(descending), collation)
+                )
+
+        sql = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)
+        ).fetchone()[0]
+        indexes.append(
+            Index(name, table_name, bool(unique), bool(partial), tuple(keys), sql)
+        )
+
+    return indexes
+
+
+def text_to_real_sql(column_name: str) -> str:
+    """
+    SQL for a money text column's value as REAL, without "£", "," or " ".
+    """
+    stripped = (
+        f"REPLACE(REPLACE(REPLACE(\"{column_name}\", '£', ''), ',', ''), ' ', '')"
+    )
+    return f"CAST({stripped} AS REAL)"
@@ -0,0 +1,70 @@
+# table_name, index_name, columns
+# A column may carry a COLLATE clause. SQLite only uses an index for
+# "column LIKE 'prefix%'" when the index collation is NOCASE, matching the
+# case-insensitive default of LIKE.
+database_indexes: list[tuple[str, str, tuple[str, ...]]] = [
+    (
+        "transactions",
+        "ix_transactions_tax_year_category",
+        ("tax_year", "category COLLATE NOCASE"),
+    ),
+    ("transactions", "ix_transactions_key_date", ("key", "date")),
+    ("transactions", "ix_transactions_description", ("description",)),
+]
+
+
+def get_create_index_statements(table_name: str) -> list[str]:
+    """
+    Get the CREATE INDEX statements declared for the given table_name.
+
+    Args:
+        table_name (str): The table name to check.
+
+    Returns:
+        statements: One CREATE INDEX IF NOT EXISTS statement per index.
+    """
+    statements: list[str] = []
+    for table, index_name, columns in database_indexes:
+        if table == table_name:
+            indexed_columns = ", ".join(to_indexed_column(col) for col in columns)
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{index_name}"'
+                f' ON "{table}" ({indexed_columns})'
+            )
+    return statements
+
+
+def get_index_names(table_name: str) -> list[str]:
+    """
+    Get the index names declared for the given table_name.
+
+    Args:
+        table_name (str): The table name to check.
+
+    Returns:
+        index_names: The declared index names, in declaration order.
+    """
+    return [index for table, index, _ in database_indexes if table == table_name]
+
+
+def has_indexes(table_name: str) -> bool:
+    """
+    Check if any index is declared for the given table_name.
+
+    Args:
+        table_name (str): The table name to check.
+
+    Returns:
+        bool: True if at least one index is declared, False otherwise.
+    """
+    return any(table == table_name for table, _, _ in database_indexes)
+
+
+def to_indexed_column(column: str) -> str:
+    """
+    Quote the column name, keeping any trailing COLLATE clause.
+    """
+    name, _, collation = column.partition(" COLLATE ")
+    if collation:
+        return f'"{name}" COLLATE {collation}'
+    return f'"{name}"'
@@ -3,6 +3,8 @@ import math
 import re
 from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_UP, Decimal, InvalidOperation
 
+from finances.util.string_helpers import remove_non_numeric
+
 
 def format_as_gbp(amount: Decimal, field_width: int = 0) -> str:
     """
@@ -30,6 +32,35 @@ def format_as_gbp_or_blank(amount: Decimal) -> str:
         return format_as_gbp(amount)
 
 
+def from_decimal_2(value: int | str | None) -> Decimal:
+    """
+    Convert a money column's database value to Decimal.
+
+    Args:
+        value (int | str | None): Integer pence, or the pounds as text.
+
+    Returns:
+        Decimal: The amount in pounds.
+    """
+    if isinstance(value, int):
+        return from_pence(value)
+
+    return Decimal(value or "0")
+
+
+def from_pence(pence: int | None) -> Decimal:
+    """
+    Convert integer pence to pounds, exactly.
+
+    Args:
+        pence (int | None): The amount in pence, or None for no amount.
+
+    Returns:
+        Decimal: The amount in pounds, to two decimal places.
+    """
+    return Decimal(pence or 0).scaleb(-2)
+
+
 def round_down(number: float) -> int:
     return math.floor(number)
 
@@ -106,6 +137,40 @@ def string_to_financial(string: str) -> Decimal:
         return Decimal("0.00")
 
 
+def string_to_pence(string: str) -> int | None:
+    """
+    Convert a spreadsheet money string to integer pence.
+
+    Characters are stripped as to_numeric_str strips them, so pence and text
+    storage hold the same amounts.
+    """
+    return text_to_pence(remove_non_numeric(string))
+
+
+def text_to_pence(text: str | int | float | None) -> int | None:
+    """
+    Convert an amount in pounds to integer pence.
+
+    Args:
+        text (str | int | float | None): The amount, as stored in a TEXT column.
+
+    Returns:
+        int | None: The amount in pence, or None for a blank amount.
+    """
+    if text is None or str(text).strip() == "":
+        return None
+
+    try:
+        pence = Decimal(str(text)).scaleb(2)
+    except InvalidOperation as e:
+        raise ValueError(f"{text!r} is not an amount") from e
+
+    if pence != pence.to_integral_value():
+        raise ValueError(f"{text!r} is not a whole number of pence")
+
+    return int(pence)
+
+
 # Function to convert currency/percent strings to float
 def string_to_float(string: str) -> float:
     if string.strip() == "":  # Check if the string is empty or whitespace
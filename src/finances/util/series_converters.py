@@ -0,0 +1,132 @@
+"""
+Whole-column versions of the spreadsheet cell converters.
+
+Each gives the same values as applying its scalar converter to every cell.
+Cells the fast path cannot handle fall back to the scalar, so they behave
+exactly as before, errors included.
+"""
+
+# standard imports
+from collections.abc import Callable
+
+# pip imports
+import numpy as np
+import pandas as pd
+from pandas import Series
+
+# local imports
+from finances.util.boolean_helpers import BOOLEAN_MAP, boolean_string_to_int
+from finances.util.date_helpers import UK_to_ISO
+from finances.util.financial_helpers import string_to_financial, string_to_pence
+
+UK_DATE_PATTERN = r"^(\d{1,2})/(\d{1,2})/(\d{4})$"
+
+
+def to_boolean_integer(series: Series) -> Series:
+    """
+    Convert boolean strings to 0 or 1, like boolean_string_to_int.
+
+    Args:
+        series (Series): The boolean strings.
+
+    Returns:
+        Series: 0 or 1 for each string.
+    """
+    # Object dtype keeps Python's str semantics, whatever the string storage
+    keys = series.astype(object).str.strip().str.lower()
+    result = keys.map({"": 0, **BOOLEAN_MAP})
+
+    unexpected = result.isna()
+    if unexpected.any():
+        # Raise the scalar's error for the first unexpected value
+        boolean_string_to_int(series[unexpected].iloc[0])
+
+    return result.astype("int64")
+
+
+def to_date(series: Series) -> Series:
+    """
+    Convert UK date strings (DD/MM/YYYY) to ISO date strings, like UK_to_ISO.
+
+    Args:
+        series (Series): The UK date strings.
+
+    Returns:
+        Series: The ISO date strings, or "" for blank cells.
+    """
+    # Transactions share dates, so only the distinct strings are parsed
+    codes, uniques = pd.factorize(series.astype(object))
+    dates = Series(uniques, dtype=object)
+
+    parts = dates.str.extract(UK_DATE_PATTERN)
+    iso = parts[2] + "-" + parts[1].str.zfill(2) + "-" + parts[0].str.zfill(2)
+
+    # Coercion catches impossible dates such as 31/02, which the scalar rejects
+    parsed = pd.to_datetime(iso, format="%Y-%m-%d", errors="coerce")
+    result = iso.where(parsed.notna())
+
+    unusual = result.isna()
+    if unusual.any():
+        result[unusual] = dates[unusual].map(UK_to_ISO)
+
+    converted = np.array([*result, None], dtype=object)
+    return Series(converted[codes], index=series.index, name=series.name).astype(
+        series.dtype
+    )
+
+
+def to_financial(series: Series) -> Series:
+    """
+    Convert currency and percent strings to Decimal, like string_to_financial.
+
+    Args:
+        series (Series): The currency or percent strings.
+
+    Returns:
+        Series: A Decimal for each string.
+    """
+    # Amounts repeat a lot, so each distinct string is only converted once
+    codes, uniques = pd.factorize(series.astype(object))
+    decimals = np.array([string_to_financial(string) for string in uniques] + [None])
+    return Series(decimals[codes], index=series.index, name=series.name)
+
+
+def to_numeric_str(series: Series) -> Series:
+    """
+    Remove every character except digits and decimal points, like
+    remove_non_numeric.
+
+    Args:
+        series (Series): The strings to clean.
+
+    Returns:
+        Series: The cleaned strings.
+    """
+    cleaned = series.astype(object).str.replace(r"[^\d.]", "", regex=True)
+    return cleaned.astype(series.dtype)
+
+
+def to_pence(series: Series) -> Series:
+    """
+    Convert money strings to integer pence, like string_to_pence.
+
+    Args:
+        series (Series): The money strings.
+
+    Returns:
+        Series: Nullable integer pence, missing for blank cells.
+    """
+    codes, uniques = pd.factorize(series.astype(object))
+    pence = np.array([string_to_pence(string) for string in uniques] + [None])
+    return Series(pence[codes], index=series.index, name=series.name, dtype="Int64")
+
+
+# Whole-column equivalents of the sheet_rows SCALARS, by to_db name
+CONVERTERS: dict[str, Callable[[Series], Series] | None] = {
+    "to_boolean_integer": to_boolean_integer,
+    "to_date": to_date,
+    "to_financial": to_financial,
+    "to_numeric_str": to_numeric_str,
+    "to_pence": to_pence,
+    "to_str": None,
+}
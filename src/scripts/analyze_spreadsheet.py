@@ -1,13 +1,46 @@
+import argparse
+from pathlib import Path
+
 # import local files
+from finances.classes.sheet_snapshot import (
+    SnapshotSpreadsheet,
+    get_latest_snapshot_path,
+    read_snapshot,
+)
 from finances.classes.spreadsheet_analyzer import SpreadsheetAnalyzer
 
 
-def main() -> None:
-    analyzer = SpreadsheetAnalyzer()
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Analyze the Google Sheets spreadsheet.")
+    p.add_argument(
+        "--from-snapshot",
+        nargs="?",
+        const="latest",
+        type=str,
+        help="Analyze a saved snapshot (the latest by default), offline.",
+    )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate the files even if the headers have not changed.",
+    )
+    args = p.parse_args(argv)
+
+    spreadsheet = None
+    if args.from_snapshot:
+        path = (
+            get_latest_snapshot_path()
+            if args.from_snapshot == "latest"
+            else Path(args.from_snapshot)
+        )
+        print(f"Analyzing snapshot {path}")
+        spreadsheet = SnapshotSpreadsheet(read_snapshot(path))
+
+    analyzer = SpreadsheetAnalyzer(spreadsheet)
 
     # Analyze spreadsheet
     analyzer.analyze_spreadsheet()
-    analyzer.write_files()
+    analyzer.write_files(force=args.force)
 
     print("Analyzed Google Sheets spreadsheet")
 
@@ -0,0 +1,78 @@
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pandas import DataFrame, Series
+
+from finances.util import series_converters
+from finances.util.boolean_helpers import boolean_string_to_int
+from finances.util.date_helpers import UK_to_ISO
+from finances.util.financial_helpers import string_to_financial
+from finances.util.string_helpers import remove_non_numeric
+
+HOW_MANY_ROWS = 100_000
+
+# to_db name, column, scalar converter, whole-column converter
+CONVERTERS: list[tuple[str, str, Callable[[str], Any], Callable[[Series], Series]]] = [
+    ("to_date", "date", UK_to_ISO, series_converters.to_date),
+    ("to_financial", "nett", string_to_financial, series_converters.to_financial),
+    ("to_numeric_str", "key", remove_non_numeric, series_converters.to_numeric_str),
+    (
+        "to_boolean_integer",
+        "reconciled",
+        boolean_string_to_int,
+        series_converters.to_boolean_integer,
+    ),
+]
+
+
+def get_transactions(how_many_rows: int) -> DataFrame:
+    """
+    A transactions tab shaped like the real one, built as the sheet values are.
+    """
+    rng = random.Random(0)
+    rows = [["date", "nett", "key", "reconciled"]]
+    for row_number in range(how_many_rows):
+        day, month, year = (
+            rng.randint(1, 28),
+            rng.randint(1, 12),
+            rng.randint(2015, 2025),
+        )
+        rows.append(
+            [
+                f"{day:02}/{month:02}/{year}",
+                f"£{rng.randint(-50_000, 50_000) / 100:,.2f}",
+                f"TX-{row_number:06}",
+                rng.choice(["Yes", "No", ""]),
+            ]
+        )
+    return DataFrame(rows[1:], columns=rows[0])
+
+
+def time_call(function: Callable[[], Series]) -> tuple[float, Series]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    df = get_transactions(HOW_MANY_ROWS)
+    print(f"Converting {HOW_MANY_ROWS:,} transactions rows\n")
+
+    for to_db, column, scalar, vectorized in CONVERTERS:
+        scalar_seconds, expected = time_call(lambda: df[column].apply(scalar))
+        vector_seconds, result = time_call(lambda: vectorized(df[column]))
+
+        if list(result) != list(expected) or result.dtype != expected.dtype:
+            raise ValueError(f"{to_db} results differ from the scalar converter")
+
+        print(
+            f"{to_db:<20} scalar {scalar_seconds:7.3f}s"
+            f"  vectorized {vector_seconds:7.3f}s"
+            f"  {scalar_seconds / vector_seconds:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
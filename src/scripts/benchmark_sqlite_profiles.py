@@ -0,0 +1,97 @@
+import os
+import random
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from finances.classes.connection_registry import registry
+from finances.classes.sheet_rows import PreparedRows, write_rows
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sqlite_profiles import PROFILES
+from finances.classes.sqlite_table.transactions import Transactions
+
+HOW_MANY_ROWS = 200_000
+HOW_MANY_REPORT_PASSES = 20
+
+CATEGORIES = [f"Category {number:02}" for number in range(40)]
+TAX_YEARS = [f"{year} to {year + 1}" for year in range(2015, 2025)]
+COLUMNS = ("date", "tax_year", "category", "key", "description", "nett")
+
+
+def get_rows(how_many_rows: int) -> Iterator[tuple[Any, ...]]:
+    """
+    Transactions rows shaped like the converted ones.
+    """
+    rng = random.Random(0)
+    for row_number in range(how_many_rows):
+        year = rng.randint(2015, 2024)
+        yield (
+            f"{year}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}",
+            f"{year} to {year + 1}",
+            rng.choice(CATEGORIES),
+            f"TX-{row_number:07}",
+            f"Payee {rng.randint(1, 2_000)}",
+            str(rng.randint(-50_000, 50_000) / 100),
+        )
+
+
+def ingest() -> None:
+    sql = SQLiteHelper()
+    prepared = PreparedRows(
+        "transactions",
+        COLUMNS,
+        ("TEXT",) * len(COLUMNS),
+        None,
+        list(get_rows(HOW_MANY_ROWS)),
+        "Transactions",
+        "",
+    )
+    with sql.session(write=True):
+        write_rows(sql, prepared)
+    sql.analyze()
+
+
+def report() -> None:
+    transactions = Transactions()
+    with transactions.sql.session():
+        for _ in range(HOW_MANY_REPORT_PASSES):
+            for tax_year in TAX_YEARS:
+                for category in CATEGORIES:
+                    transactions.fetch_total_by_tax_year_category(tax_year, category)
+                transactions.fetch_total_by_tax_year_category_like(
+                    tax_year, "Category 1"
+                )
+
+
+def time_call(function: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    queries = HOW_MANY_REPORT_PASSES * len(TAX_YEARS) * (len(CATEGORIES) + 1)
+    print(f"Ingesting {HOW_MANY_ROWS:,} transactions rows, then {queries:,} totals\n")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in PROFILES:
+            # Each profile gets a fresh database, helper and connections
+            registry.dispose()
+            os.environ["SQLITE_DB_LOCATION"] = os.path.join(temp_dir, name)
+            os.environ["SQLITE_OUR_FINANCES_DB_NAME"] = "benchmark"
+            os.environ["SQLITE_PROFILE"] = name
+
+            ingest_seconds = time_call(ingest)
+            report_seconds = time_call(report)
+
+            print(
+                f"{name:<10} ingest {ingest_seconds:7.3f}s"
+                f"  report {report_seconds:7.3f}s"
+            )
+
+    registry.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,99 @@
+import argparse
+import os
+from pathlib import Path
+
+from finances.classes.google_helper import GoogleHelper
+from finances.classes.sheet_snapshot import (
+    SnapshotSpreadsheet,
+    download_snapshot,
+    get_latest_snapshot_path,
+    read_snapshot,
+    write_snapshot,
+)
 from finances.classes.spreadsheet_to_sqlite import SpreadSheetToSqlite
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sqlite_profiles import PROFILES
+from finances.classes.staged_database import restore_previous
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(
+        description="Convert the Google Sheets spreadsheet to the SQLite database."
+    )
+    p.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild every table, even if its worksheet has not changed.",
+    )
+    p.add_argument(
+        "--diff",
+        action="store_true",
+        help="Change only the rows that differ, keeping synthetic ids stable.",
+    )
+    p.add_argument(
+        "--profile",
+        choices=list(PROFILES),
+        help="SQLite profile for every connection (default: SQLITE_PROFILE, "
+        "else ingest).",
+    )
+    source = p.add_mutually_exclusive_group()
+    source.add_argument(
+        "--save-snapshot",
+        action="store_true",
+        help="Save the downloaded values as a snapshot, then convert from it.",
+    )
+    source.add_argument(
+        "--from-snapshot",
+        nargs="?",
+        const="latest",
+        type=str,
+        help="Convert a saved snapshot (the latest by default), offline.",
+    )
+    source.add_argument(
+        "--restore-previous",
+        action="store_true",
+        help="Put back the database replaced by the last download, and stop.",
+    )
+    args = p.parse_args(argv)
 
+    # Set before any connection opens
+    if args.profile:
+        os.environ["SQLITE_PROFILE"] = args.profile
+    os.environ.setdefault("SQLITE_PROFILE", "ingest")
+
+    if args.restore_previous:
+        db_path = SQLiteHelper().db_path
+        restore_previous(db_path)
+        print(f"Restored {db_path} from its previous generation")
+        return
 
-def main() -> None:
     print("Converting Google Sheets spreadsheet to SQLite database\n")
 
-    converter = SpreadSheetToSqlite()
+    spreadsheet = None
+    if args.save_snapshot:
+        scopes = [
+            "https://www.googleapis.com/auth/spreadsheets.readonly",
+            "https://www.googleapis.com/auth/drive.readonly",
+        ]
+        snapshot = download_snapshot(GoogleHelper().get_spreadsheet(scopes))
+        print(f"Saved snapshot {write_snapshot(snapshot)}")
+        spreadsheet = SnapshotSpreadsheet(snapshot)
+    elif args.from_snapshot:
+        path = (
+            get_latest_snapshot_path()
+            if args.from_snapshot == "latest"
+            else Path(args.from_snapshot)
+        )
+        print(f"Converting snapshot {path}")
+        spreadsheet = SnapshotSpreadsheet(read_snapshot(path))
+
+    converter = SpreadSheetToSqlite(spreadsheet)
 
     # Convert spreadsheet to SQLite
-    converter.convert_to_sqlite()
+    summary = converter.convert_to_sqlite(full=args.full, diff=args.diff)
+
+    for status, table_names in summary.items():
+        print(f"{status.capitalize()} {len(table_names)} tables: {table_names}")
 
     print("Converted Google Sheets spreadsheet to SQLite database")
 
@@ -0,0 +1,81 @@
+from typing import Any
+
+from finances.classes.connection_registry import registry
+from finances.classes.query_log import get_used_index
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sqlite_table.transactions import Transactions
+from finances.util.database_indexes import get_index_names
+
+
+def get_hot_queries(tax_year: str) -> list[tuple[str, str, dict[str, Any]]]:
+    """
+    The transactions queries the HMRC reports run most, built the same way.
+    """
+    transactions = Transactions()
+    tax_year_category_like = {"tax_year": tax_year, "category_like": "HMRC %"}
+
+    total_like = (
+        transactions.query_builder()
+        .total("nett")
+        .where('"tax_year" = :tax_year AND "category" LIKE :category_like')
+        .build()[0]
+    )
+    total_equal = (
+        transactions.query_builder()
+        .total("nett")
+        .where('"tax_year" = :tax_year AND "category" = :category')
+        .build()[0]
+    )
+    count_like = (
+        transactions.query_builder()
+        .select_raw("COUNT(DISTINCT category)")
+        .where('"tax_year" = :tax_year AND "category" LIKE :category_like')
+        .build()[0]
+    )
+    breakdown = (
+        transactions.query_builder()
+        .select("date", "key", "description", "note", "nett", "category")
+        .where('"tax_year" = :tax_year AND "category" LIKE :category_like')
+        .order("date")
+        .build()[0]
+    )
+
+    return [
+        ("total by category prefix", total_like, tax_year_category_like),
+        (
+            "total by category",
+            total_equal,
+            {"tax_year": tax_year, "category": "HMRC B SES income"},
+        ),
+        ("count categories by prefix", count_like, tax_year_category_like),
+        ("breakdown by category prefix", breakdown, tax_year_category_like),
+    ]
+
+
+def main() -> None:
+    sql = registry.get_shared("SQLiteHelper", SQLiteHelper)
+    table_name = "transactions"
+
+    try:
+        with sql.session():
+            # Databases synced before the index spec existed need them too
+            print(f"Declared indexes: {get_index_names(table_name)}")
+            sql.create_indexes(table_name)
+
+            print("Running ANALYZE")
+            sql.analyze()
+
+            tax_year = sql.fetch_one_value("SELECT MAX(tax_year) FROM transactions")
+            print(f"Explaining hot queries for tax year {tax_year}\n")
+
+            for label, query, params in get_hot_queries(tax_year):
+                plan = sql.explain_query_plan(query, params)
+                print(f"{label}: {get_used_index(plan)}")
+                for detail in plan:
+                    print(f"    {detail}")
+    finally:
+        registry.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,31 @@
+import argparse
+import os
+import sys
+import textwrap
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
+from finances.classes.connection_registry import registry
 from finances.classes.hmrc.core import HMRC
+from finances.classes.memo import get_memo
+from finances.classes.memory_database import MemoryDatabase, get_memory_name
+from finances.classes.query_log import QueryStats, query_log
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sqlite_profiles import PROFILES
+from finances.classes.sqlite_table.hmrc_people_details import HMRCPeopleDetails
 from finances.classes.sqlite_table.hmrc_questions_by_year import HMRC_QuestionsByYear
 
+# One tax year and the people whose returns are computed together
+ReportUnit = tuple[str, tuple[str, ...]]
+
+MEMORY_DATABASE_NAME = "our_finances"
+
+# A worker's own in-memory copy, kept open for the worker's lifetime
+worker_memory: MemoryDatabase | None = None
+
 
 def check_questions(tax_year: str) -> None:
     questions = HMRC_QuestionsByYear(tax_year)
@@ -19,13 +42,146 @@ def get_tax_years_from(earliest_year: int) -> list[str]:
     return tax_years
 
 
-def print_reports(hmrc_people: list[str], tax_year: str) -> None:
-    for person in hmrc_people:
-        hmrc = HMRC(person, tax_year)
-        hmrc.print_reports()
+def get_units(hmrc_people: list[str], tax_years: list[str]) -> list[ReportUnit]:
+    """
+    Split the reports into units of work, keeping married couples together.
 
+    A spouse's return feeds into the other's (marriage allowance), so both
+    are computed in the same process and the spouse's answers are shared.
+    """
+    couples: list[tuple[str, ...]] = []
+    placed: set[str] = set()
+    for person in hmrc_people:
+        if person in placed:
+            continue
+
+        spouse = HMRCPeopleDetails(person).get_spouse_code()
+        if spouse in hmrc_people and spouse not in placed and spouse != person:
+            couple: tuple[str, ...] = (person, spouse)
+        else:
+            couple = (person,)
+
+        couples.append(couple)
+        placed.update(couple)
+
+    return [(tax_year, couple) for tax_year in tax_years for couple in couples]
+
+
+def init_worker() -> None:
+    global worker_memory
+
+    # Workers only read, and must not reuse a connection inherited by fork
+    os.environ["SQLITE_READ_ONLY"] = "Yes"
+    registry.dispose()
+
+    memory_name = get_memory_name()
+    if memory_name:
+        # SQLite state must not cross a fork, so each worker loads its own
+        worker_memory = load_memory_database(memory_name)
+
+
+def load_memory_database(name: str) -> MemoryDatabase:
+    start = time.perf_counter()
+    memory = MemoryDatabase(name)
+    memory.load(SQLiteHelper().db_path)
+    seconds = time.perf_counter() - start
+    print(f"Loaded the database into memory in {seconds:.3f}s")
+    return memory
+
+
+def print_reports(hmrc_people: list[str], tax_year: str) -> list[str]:
+    """
+    Print every report for hmrc_people, returning an error per failed person.
+    """
+    errors: list[str] = []
+
+    # Every table shares this helper, so one connection serves the whole unit
+    sql = registry.get_shared("SQLiteHelper", SQLiteHelper)
+    with sql.session():
+        # Hold every return for the whole unit, so a spouse is only built once
+        returns = [HMRC.get_instance(person, tax_year) for person in hmrc_people]
+        for person, hmrc in zip(hmrc_people, returns, strict=True):
+            try:
+                hmrc.print_reports()
+            except Exception as e:
+                # Formatted here, since a worker's traceback cannot be pickled
+                errors.append(
+                    f"{person} {tax_year}: {type(e).__name__}: {e}\n"
+                    f"{traceback.format_exc().rstrip()}"
+                )
+                continue
+            print(f"Getter memo for {person} {tax_year}: {get_memo(hmrc)}")
+
+    return errors
+
+
+def print_unit_reports(unit: ReportUnit) -> list[str]:
+    tax_year, hmrc_people = unit
+    return print_reports(list(hmrc_people), tax_year)
+
+
+def run_units(units: list[ReportUnit], jobs: int) -> list[str]:
+    if jobs == 1:
+        return [error for unit in units for error in print_unit_reports(unit)]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as pool:
+        # map keeps the units' order, so the error summary is deterministic
+        results = list(pool.map(print_unit_reports, units))
+
+    return [error for errors in results for error in errors]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Generate the HMRC reports.")
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes, one (tax year, couple) unit each.",
+    )
+    p.add_argument(
+        "--profile",
+        choices=list(PROFILES),
+        help="SQLite profile for every connection (default: SQLITE_PROFILE, "
+        "else report).",
+    )
+    p.add_argument(
+        "--query-stats",
+        action="store_true",
+        help="Time every SQL statement and print the slowest at the end.",
+    )
+    p.add_argument(
+        "--query-trace",
+        type=Path,
+        help="Also write the statement totals and every statement as JSON.",
+    )
+    p.add_argument(
+        "--explain-full-scans",
+        action="store_true",
+        help="Capture the query plan of statements that scan all transactions.",
+    )
+    p.add_argument(
+        "--in-memory",
+        action="store_true",
+        help="Copy the database into memory once, and run every query there.",
+    )
+    args = p.parse_args(argv)
+    if args.jobs < 1:
+        p.error("--jobs must be at least 1")
+
+    query_stats = None
+    if args.query_stats or args.query_trace or args.explain_full_scans:
+        if args.jobs > 1:
+            p.error("query statistics are only gathered with --jobs 1")
+        query_stats = QueryStats(keep_events=bool(args.query_trace))
+        query_log.add_listener(query_stats)
+        query_log.explain_full_scans = args.explain_full_scans
+
+    # Set before any connection opens; forked workers inherit it
+    if args.profile:
+        os.environ["SQLITE_PROFILE"] = args.profile
+    os.environ.setdefault("SQLITE_PROFILE", "report")
 
-def main() -> None:
     # List of people to generate reports for
     hmrc_people = ["S", "B"]
 
@@ -33,13 +189,44 @@ def main() -> None:
 
     tax_years = get_tax_years_from(earliest_year)
 
-    for tax_year in tax_years:
-        # Tax year to generate reports for
-
-        check_questions(tax_year)
-
-        print_reports(hmrc_people, tax_year)
+    memory = None
+    if args.in_memory:
+        # Set before any helper is created, so every one connects to the copy
+        os.environ["SQLITE_IN_MEMORY"] = MEMORY_DATABASE_NAME
+        memory = load_memory_database(MEMORY_DATABASE_NAME)
+
+    try:
+        for tax_year in tax_years:
+            check_questions(tax_year)
+
+        units = get_units(hmrc_people, tax_years)
+        if args.jobs > 1:
+            # Forked workers must not share the parent's connection
+            registry.dispose()
+            if memory:
+                memory.close()
+
+        errors = run_units(units, args.jobs)
+    finally:
+        print(f"Connection registry: {registry.get_stats()}")
+        registry.dispose()
+        if memory:
+            memory.close()
+        if query_stats:
+            query_log.remove_listener(query_stats)
+            print(f"\nQuery statistics:\n{query_stats.format_summary()}")
+            if args.query_trace:
+                query_stats.write_trace(args.query_trace)
+                print(f"Wrote query trace {args.query_trace}")
+
+    if errors:
+        print(f"{len(errors)} of {len(hmrc_people) * len(tax_years)} reports failed:")
+        for error in errors:
+            print(textwrap.indent(error, "    "))
+        return 1
+
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
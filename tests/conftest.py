@@ -0,0 +1,25 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.connection_registry import registry
+from finances.classes.sqlite_helper import SQLiteHelper
+
+
+@pytest.fixture
+def sql(tmp_path: Path, monkeypatch: MonkeyPatch) -> Iterator[SQLiteHelper]:
+    """
+    The shared SQLiteHelper, on an empty database in tmp_path.
+
+    The registry is disposed of before and after, so no engine or shared
+    helper leaks into another test.
+    """
+    monkeypatch.setenv("SQLITE_DB_LOCATION", str(tmp_path))
+    monkeypatch.setenv("SQLITE_OUR_FINANCES_DB_NAME", "test")
+    registry.dispose()
+
+    yield registry.get_shared("SQLiteHelper", SQLiteHelper)
+
+    registry.dispose()
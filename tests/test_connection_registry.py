@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from finances.classes.connection_registry import (
+    ConnectionRegistry,
+    ConnectionRegistryError,
+)
+
+
+@pytest.fixture
+def database_url(tmp_path: Path) -> str:
+    return f"sqlite:///{tmp_path / 'registry.sqlite'}"
+
+
+def test_open_reuses_engine_per_url(database_url: str) -> None:
+    registry = ConnectionRegistry()
+    first = registry.open(database_url)
+    second = registry.open(database_url)
+    assert first is second
+    assert registry.engines_created == 1
+
+
+def test_open_creates_engine_per_database(tmp_path: Path) -> None:
+    registry = ConnectionRegistry()
+    registry.open(f"sqlite:///{tmp_path / 'one.sqlite'}")
+    registry.open(f"sqlite:///{tmp_path / 'two.sqlite'}")
+    assert registry.engines_created == 2
+    assert registry.get_stats()["engines_open"] == 2
+
+
+def test_session_factory_uses_shared_engine(database_url: str) -> None:
+    registry = ConnectionRegistry()
+    engine = registry.open(database_url)
+    session = registry.get_session_factory(database_url)()
+    try:
+        assert session.get_bind() is engine
+        assert session.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        session.close()
+
+
+def test_session_factory_requires_open_engine(database_url: str) -> None:
+    registry = ConnectionRegistry()
+    with pytest.raises(ConnectionRegistryError):
+        registry.get_session_factory(database_url)
+
+
+def test_close_disposes_engine(database_url: str) -> None:
+    registry = ConnectionRegistry()
+    registry.open(database_url)
+    registry.close(database_url)
+    assert not registry.is_open(database_url)
+    assert registry.engines_disposed == 1
+
+    registry.open(database_url)
+    assert registry.engines_created == 2
+
+
+def test_get_shared_calls_factory_once() -> None:
+    registry = ConnectionRegistry()
+    calls: list[int] = []
+
+    def factory() -> object:
+        calls.append(1)
+        return object()
+
+    first = registry.get_shared("helper", factory)
+    second = registry.get_shared("helper", factory)
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_dispose_clears_engines_and_shared(database_url: str) -> None:
+    registry = ConnectionRegistry()
+    registry.open(database_url)
+    shared = registry.get_shared("helper", object)
+    registry.dispose()
+    assert registry.get_stats()["engines_open"] == 0
+    assert registry.get_shared("helper", object) is not shared
@@ -0,0 +1,47 @@
+import pytest
+
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.util.database_indexes import (
+    get_create_index_statements,
+    get_index_names,
+    has_indexes,
+)
+
+
+@pytest.fixture
+def helper(sql: SQLiteHelper) -> SQLiteHelper:
+    # The same column types pandas to_sql gives a transactions worksheet
+    sql.executeAndCommit(
+        "CREATE TABLE transactions (id INTEGER PRIMARY KEY, tax_year TEXT,"
+        " category TEXT, key TEXT, date TEXT, description TEXT, nett REAL)"
+    )
+    sql.create_indexes("transactions")
+    return sql
+
+
+def test_create_index_statements_keep_collation() -> None:
+    statements = get_create_index_statements("transactions")
+    assert len(statements) == len(get_index_names("transactions"))
+    assert '"category" COLLATE NOCASE' in statements[0]
+    assert not has_indexes("people")
+
+
+def test_create_indexes_is_repeatable(helper: SQLiteHelper) -> None:
+    helper.create_indexes("transactions")
+    rows = helper.fetch_all(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table",
+        {"table": "transactions"},
+    )
+    assert sorted(row[0] for row in rows) == sorted(get_index_names("transactions"))
+
+
+def test_like_prefix_uses_index(helper: SQLiteHelper) -> None:
+    plan = helper.explain_query_plan(
+        'SELECT SUM(nett) FROM transactions WHERE "tax_year" = :tax_year'
+        ' AND "category" LIKE :category_like',
+        {"tax_year": "2024 to 2025", "category_like": "HMRC B SES income%"},
+    )
+    assert plan == [
+        "SEARCH transactions USING INDEX ix_transactions_tax_year_category"
+        " (tax_year=? AND category>? AND category<?)"
+    ]
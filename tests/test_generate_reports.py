@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+import scripts.generate_reports as generate_reports
+from finances.classes.sqlite_helper import SQLiteHelper
+from scripts.generate_reports import ReportUnit, get_units, print_reports, run_units
+
+SPOUSES = {"S": "B", "B": "S", "A": None, "C": "C", "D": "X"}
+
+
+class FakePeopleDetails:
+    def __init__(self, person: str) -> None:
+        self.person = person
+
+    def get_spouse_code(self) -> str | None:
+        return SPOUSES[self.person]
+
+
+UNITS: list[ReportUnit] = [
+    ("2023 to 2024", ("A",)),
+    ("2023 to 2024", ("S", "B")),
+    ("2024 to 2025", ("A",)),
+]
+
+
+class FailingHMRC:
+    def print_reports(self) -> None:
+        raise ValueError("no transactions")
+
+
+def fake_print_unit_reports(unit: ReportUnit) -> list[str]:
+    tax_year, people = unit
+    # The first unit finishes last, so completion order differs from unit order
+    time.sleep(0.2 if unit == UNITS[0] else 0)
+    return [f"{person} {tax_year}: failed" for person in people]
+
+
+@pytest.fixture
+def people_details(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(generate_reports, "HMRCPeopleDetails", FakePeopleDetails)
+
+
+def test_get_units_keeps_couples_together(people_details: None) -> None:
+    assert get_units(["S", "A", "B"], ["2024 to 2025"]) == [
+        ("2024 to 2025", ("S", "B")),
+        ("2024 to 2025", ("A",)),
+    ]
+
+
+def test_get_units_without_the_spouse_in_the_list(people_details: None) -> None:
+    assert get_units(["S", "D"], ["2024 to 2025"]) == [
+        ("2024 to 2025", ("S",)),
+        ("2024 to 2025", ("D",)),
+    ]
+
+
+def test_get_units_when_a_person_is_their_own_spouse(people_details: None) -> None:
+    assert get_units(["C"], ["2023 to 2024", "2024 to 2025"]) == [
+        ("2023 to 2024", ("C",)),
+        ("2024 to 2025", ("C",)),
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_units_keeps_the_units_order(monkeypatch: MonkeyPatch, jobs: int) -> None:
+    monkeypatch.setattr(generate_reports, "print_unit_reports", fake_print_unit_reports)
+    assert run_units(UNITS, jobs) == [
+        "A 2023 to 2024: failed",
+        "S 2023 to 2024: failed",
+        "B 2023 to 2024: failed",
+        "A 2024 to 2025: failed",
+    ]
+
+
+def test_print_reports_keeps_the_traceback(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        generate_reports.HMRC, "get_instance", lambda person, tax_year: FailingHMRC()
+    )
+    errors = print_reports(["S"], "2024 to 2025")
+
+    assert len(errors) == 1
+    assert errors[0].startswith("S 2024 to 2025: ValueError: no transactions\n")
+    assert "Traceback (most recent call last)" in errors[0]
+    assert 'raise ValueError("no transactions")' in errors[0]
+
+
+def test_jobs_must_be_at_least_one() -> None:
+    with pytest.raises(SystemExit):
+        generate_reports.main(["--jobs", "0"])
@@ -0,0 +1,172 @@
+from typing import Any
+
+import pytest
+from gspread.exceptions import APIError
+
+from finances.classes.google_helper import (
+    GoogleApiLimiter,
+    GoogleHelperError,
+    batch_get_values,
+)
+
+
+class FakeSpreadsheet:
+    """
+    Answers values_batch_get from memory, counting the requests.
+    """
+
+    def __init__(self, sheets: dict[str, list[list[str]]]) -> None:
+        self.sheets = sheets
+        self.requests: list[list[str]] = []
+
+    def values_batch_get(self, ranges: list[str]) -> dict[str, Any]:
+        self.requests.append(ranges)
+        value_ranges = []
+        for name in ranges:
+            values = self.sheets[name.strip("'")]
+            # Like the API, empty sheets come back without a values key
+            value_ranges.append({"range": name, "values": values} if values else {})
+        return {"valueRanges": value_ranges}
+
+
+def get_values(spreadsheet: FakeSpreadsheet, *args: Any) -> dict[str, Any]:
+    fake: Any = spreadsheet
+    clock = FakeClock()
+    limiter = GoogleApiLimiter(clock=clock, sleep=clock.sleep)
+    return batch_get_values(fake, *args, limiter=limiter)
+
+
+def test_one_request_per_chunk() -> None:
+    sheets = {f"Sheet {n}": [["Name"], [str(n)]] for n in range(5)}
+    spreadsheet = FakeSpreadsheet(sheets)
+
+    values = get_values(spreadsheet, list(sheets), 2)
+
+    assert values == sheets
+    assert [len(ranges) for ranges in spreadsheet.requests] == [2, 2, 1]
+    assert spreadsheet.requests[0] == ["'Sheet 0'", "'Sheet 1'"]
+
+
+def test_ragged_rows_are_padded() -> None:
+    spreadsheet = FakeSpreadsheet({"Accounts": [["Name", "Balance"], ["Cash"]]})
+    values = get_values(spreadsheet, ["Accounts"])
+    assert values["Accounts"] == [["Name", "Balance"], ["Cash", ""]]
+
+
+def test_empty_sheet() -> None:
+    spreadsheet = FakeSpreadsheet({"Empty": [], "Accounts": [["Name"]]})
+    values = get_values(spreadsheet, ["Empty", "Accounts"])
+    assert values == {"Empty": [[]], "Accounts": [["Name"]]}
+
+
+def test_missing_ranges_raise() -> None:
+    spreadsheet = FakeSpreadsheet({"Accounts": [["Name"]]})
+    spreadsheet.values_batch_get = lambda ranges: {"valueRanges": []}  # type: ignore
+    with pytest.raises(GoogleHelperError):
+        get_values(spreadsheet, ["Accounts"])
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ""
+
+    def json(self) -> dict[str, Any]:
+        return {"error": {"code": self.status_code, "message": "quota"}}
+
+
+def make_limiter(clock: FakeClock, requests_per_minute: int = 60) -> GoogleApiLimiter:
+    return GoogleApiLimiter(requests_per_minute, clock=clock, sleep=clock.sleep)
+
+
+def test_limiter_does_not_wait_within_budget() -> None:
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    for _ in range(60):
+        limiter.acquire()
+    assert clock.sleeps == []
+    assert limiter.get_stats()["waits"] == 0
+
+
+def test_limiter_waits_when_budget_is_spent() -> None:
+    clock = FakeClock()
+    limiter = make_limiter(clock, requests_per_minute=2)
+    for _ in range(4):
+        limiter.acquire()
+    assert clock.sleeps == [30.0, 30.0]
+    assert limiter.get_stats() == {
+        "requests": 4,
+        "retries": 0,
+        "waits": 2,
+        "wait_seconds": 60.0,
+    }
+
+
+def test_limiter_retries_429_then_succeeds() -> None:
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    responses = [429, 503]
+
+    def request() -> str:
+        if responses:
+            raise APIError(FakeResponse(responses.pop(0)))  # type: ignore
+        return "values"
+
+    assert limiter.call(request) == "values"
+    assert limiter.get_stats()["retries"] == 2
+    assert 1 <= clock.sleeps[0] < 2
+    assert 2 <= clock.sleeps[1] < 3
+
+
+def test_limiter_slows_after_429_and_recovers() -> None:
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    responses = [429, 429]
+
+    def request() -> str:
+        if responses:
+            raise APIError(FakeResponse(responses.pop(0)))  # type: ignore
+        return "values"
+
+    limiter.call(request)
+    assert limiter.refill_per_second == pytest.approx(0.25 + 0.1)
+
+    for _ in range(10):
+        limiter.call(request)
+    assert limiter.refill_per_second == 1.0
+
+
+def test_limiter_does_not_retry_client_errors() -> None:
+    limiter = make_limiter(FakeClock())
+
+    def request() -> str:
+        raise APIError(FakeResponse(404))  # type: ignore
+
+    with pytest.raises(APIError):
+        limiter.call(request)
+    assert limiter.get_stats()["retries"] == 0
+
+
+def test_limiter_gives_up_after_max_retries() -> None:
+    clock = FakeClock()
+    limiter = GoogleApiLimiter(max_retries=2, clock=clock, sleep=clock.sleep)
+
+    def request() -> str:
+        raise APIError(FakeResponse(429))  # type: ignore
+
+    with pytest.raises(APIError):
+        limiter.call(request)
+    assert limiter.get_stats()["requests"] == 3
@@ -0,0 +1,91 @@
+from types import MappingProxyType
+from typing import Any
+
+from finances.classes.hmrc.answer_set import HMRCAnswerSet
+from finances.classes.hmrc.core import HMRC
+from finances.classes.hmrc.question_plan import HMRCQuestionPlan, PlannedQuestion
+from finances.classes.hmrc_output import HMRCOutput
+
+INCOME = PlannedQuestion("Income", "S1", "H1", "1", "get_income", "")
+DIVIDENDS = PlannedQuestion("Dividends?", "S1", "H2", "2", "did_you_get_div", "")
+
+PLAN = HMRCQuestionPlan(
+    "2024 to 2025",
+    MappingProxyType(
+        {
+            HMRCOutput.HMRC_ONLINE_ANSWERS: (INCOME, DIVIDENDS),
+            HMRCOutput.HMRC_TAX_RETURN: (DIVIDENDS, INCOME),
+        }
+    ),
+)
+
+
+class FakePerson:
+    def get_name(self) -> str:
+        return "Sam"
+
+    def get_unique_tax_reference(self) -> str:
+        return "12345"
+
+
+class FakeHMRC:
+    tax_year = "2024 to 2025"
+    person = FakePerson()
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_answer_set(self) -> HMRCAnswerSet:
+        return compute(self)
+
+    def get_question_plan(self) -> HMRCQuestionPlan:
+        return PLAN
+
+    def get_income(self) -> int:
+        self.calls.append("get_income")
+        return 100
+
+    def did_you_get_div(self) -> bool:
+        self.calls.append("did_you_get_div")
+        return True
+
+
+def compute(hmrc: FakeHMRC) -> HMRCAnswerSet:
+    fake: Any = hmrc
+    return HMRCAnswerSet.compute(fake)
+
+
+def test_each_getter_runs_once() -> None:
+    hmrc = FakeHMRC()
+    answer_set = compute(hmrc)
+    for report_type in [HMRCOutput.HMRC_ONLINE_ANSWERS, HMRCOutput.HMRC_TAX_RETURN]:
+        answer_set.get_answers(report_type)
+    assert hmrc.calls == ["get_income", "did_you_get_div"]
+
+
+def test_report_types_project_in_their_own_order() -> None:
+    answer_set = compute(FakeHMRC())
+    assert answer_set.get_answers(HMRCOutput.HMRC_TAX_RETURN) == [
+        ["Dividends?", "S1", "H2", "2", True, ""],
+        ["Income", "S1", "H1", "1", 100, ""],
+    ]
+
+
+def test_output_data_carries_person_details() -> None:
+    output_data = compute(FakeHMRC()).get_output_data(HMRCOutput.HMRC_ONLINE_ANSWERS)
+    assert output_data.person_name == "Sam"
+    assert output_data.unique_tax_reference == "12345"
+    assert output_data.report_type == HMRCOutput.HMRC_ONLINE_ANSWERS
+    assert [answer[4] for answer in output_data.answers] == [100, True]
+
+
+def test_hmrc_answers_and_questions_take_the_report_type() -> None:
+    hmrc: Any = FakeHMRC()
+    assert HMRC.get_answers(hmrc, HMRCOutput.HMRC_TAX_RETURN) == [
+        ["Dividends?", "S1", "H2", "2", True, ""],
+        ["Income", "S1", "H1", "1", 100, ""],
+    ]
+    assert HMRC.get_questions(hmrc, HMRCOutput.HMRC_ONLINE_ANSWERS) == [
+        ["Income", "S1", "H1", "1", "get_income", ""],
+        ["Dividends?", "S1", "H2", "2", "did_you_get_div", ""],
+    ]
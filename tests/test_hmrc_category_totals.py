@@ -0,0 +1,125 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.hmrc.category_totals import HMRCCategoryTotals, like_to_regex
+from finances.classes.hmrc.core import HMRC
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sqlite_table.transactions import Transactions
+from finances.util.financial_helpers import round_even
+
+TAX_YEAR = "2024 to 2025"
+
+
+@pytest.fixture(autouse=True)
+def transactions(sql: SQLiteHelper) -> None:
+    sql.executeAndCommit(
+        "CREATE TABLE transactions (tax_year TEXT, category TEXT, nett REAL)"
+    )
+    rows = [
+        (TAX_YEAR, "HMRC B SES income: Acme", 100.10),
+        (TAX_YEAR, "HMRC B SES income: Acme", 0.20),
+        (TAX_YEAR, "HMRC B SES expense", -40.05),
+        (TAX_YEAR, "hmrc b ukp income: rent received AB1 2CD", 500),
+        (TAX_YEAR, "HMRC B EMP Widgets income", 1000),
+        (TAX_YEAR, "HMRC B EMP Widgets tax", -200),
+        (TAX_YEAR, "HMRC S INT income", 12.34),
+        (TAX_YEAR, None, 1),
+        ("2023 to 2024", "HMRC B SES income: Acme", 999),
+    ]
+    with sql.session():
+        for row in rows:
+            sql.executeAndCommit(
+                "INSERT INTO transactions VALUES (:tax_year, :category, :nett)",
+                dict(zip(["tax_year", "category", "nett"], row, strict=True)),
+            )
+
+
+def fetch_total_like(category_like: str) -> Decimal:
+    query, params = (
+        Transactions()
+        .query_builder()
+        .total("nett")
+        .where(
+            '"tax_year" = :tax_year AND "category" LIKE :category_like',
+            {"tax_year": TAX_YEAR, "category_like": category_like},
+        )
+        .build()
+    )
+    return round_even(Transactions().sql.fetch_one_value_decimal(query, params))
+
+
+@pytest.mark.parametrize(
+    "category_like",
+    [
+        "HMRC B SES income%",
+        "HMRC B SES%",
+        "HMRC B UKP income%",
+        "HMRC B EMP%income",
+        "HMRC B _MP%",
+        "HMRC Z%",
+    ],
+)
+def test_total_like_matches_database(category_like: str) -> None:
+    totals = HMRCCategoryTotals(TAX_YEAR)
+    assert totals.get_total_like(category_like) == fetch_total_like(category_like)
+
+
+def test_counts_and_categories() -> None:
+    totals = HMRCCategoryTotals(TAX_YEAR)
+    assert totals.get_how_many_categories_like("HMRC B SES%") == 2
+    assert totals.get_how_many_transactions_like("HMRC B SES income%") == 2
+    assert totals.get_how_many_transactions_like("HMRC B EMP%income") == 1
+    assert totals.get_categories_like("HMRC B UKP income: rent received %") == [
+        "hmrc b ukp income: rent received AB1 2CD"
+    ]
+
+
+def get_rented_property_postcode(person_code: str) -> str:
+    hmrc: Any = SimpleNamespace(
+        person=SimpleNamespace(code=person_code),
+        tax_year=TAX_YEAR,
+        category_totals=HMRCCategoryTotals(TAX_YEAR),
+    )
+    postcode: str = HMRC.get_rented_property_postcode(hmrc)
+    return postcode
+
+
+def test_rented_property_postcode() -> None:
+    assert get_rented_property_postcode("B") == "AB1 2CD"
+
+
+def test_rented_property_postcode_without_rent_received() -> None:
+    with pytest.raises(ValueError, match=f"for S in {TAX_YEAR}"):
+        get_rented_property_postcode("S")
+
+
+def test_total_is_exact_match() -> None:
+    totals = HMRCCategoryTotals(TAX_YEAR)
+    assert totals.get_total("HMRC S INT income") == Decimal("12.34")
+    assert totals.get_total("hmrc s int income") == Decimal("0.00")
+
+
+def test_year_loads_with_one_query(monkeypatch: MonkeyPatch) -> None:
+    calls: list[str] = []
+    fetch = Transactions.fetch_totals_by_category
+
+    def counting_fetch(self: Transactions, tax_year: str) -> list[object]:
+        calls.append(tax_year)
+        return fetch(self, tax_year)
+
+    monkeypatch.setattr(Transactions, "fetch_totals_by_category", counting_fetch)
+    totals = HMRCCategoryTotals(TAX_YEAR)
+    totals.get_total_like("HMRC B%")
+    totals.get_how_many_categories_like("HMRC S%")
+    totals.get_total("HMRC B SES expense")
+    assert calls == [TAX_YEAR]
+
+
+def test_like_to_regex_escapes_literals() -> None:
+    assert like_to_regex("a.b%").fullmatch("a.bcd")
+    assert not like_to_regex("a.b%").fullmatch("axbcd")
+    assert like_to_regex("a_c").fullmatch("abc")
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.hmrc_output import HMRCOutput, HMRCOutputData
+
+
+def make_output(report_type: str = HMRCOutput.HMRC_TAX_RETURN) -> HMRCOutput:
+    return HMRCOutput(
+        HMRCOutputData(
+            person_name="Sam Smith",
+            report_type=report_type,
+            tax_year="2024 to 2025",
+            unique_tax_reference="12345",
+            answers=[
+                ["Income", "S1", "H1", "1 (GBP)", 1234.5, ""],
+                ["Dividends?", "S1", "H2", "2", True, "See note"],
+            ],
+        )
+    )
+
+
+def test_render_does_not_touch_disk(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    text = make_output().render()
+    assert text.startswith("HMRC tax return 2024 to 2025 for Sam Smith - UTR 12345")
+    assert "£1,234.50" in text
+    assert "See note\n" in text
+    assert text.rstrip().endswith(
+        "End of HMRC tax return 2024 to 2025 for Sam Smith - UTR 12345"
+    )
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_render_is_repeatable() -> None:
+    output = make_output()
+    assert output.render() == output.render()
+
+
+def test_print_report_replaces_file(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    output = make_output()
+    report_name = Path(output.get_report_name())
+    report_name.parent.mkdir(parents=True)
+    report_name.write_text("stale report")
+
+    output.print_report()
+
+    assert report_name.read_text() == output.render()
+    assert [path.name for path in report_name.parent.iterdir()] == [report_name.name]
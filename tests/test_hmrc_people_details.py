@@ -15,8 +15,8 @@ def mock_table() -> Generator[HMRCPeopleDetails, None, None]:
     table.sql = MagicMock()
     mock_builder = MagicMock()
     mock_builder.select = lambda col: mock_builder
-    mock_builder.where = lambda clause: mock_builder
-    mock_builder.build = lambda: "SQL QUERY"
+    mock_builder.where = lambda clause, params=None: mock_builder
+    mock_builder.build = lambda: ("SQL QUERY", {})
     table.query_builder = MagicMock(return_value=mock_builder)
     yield table
 
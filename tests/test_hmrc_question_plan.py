@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.hmrc.question_plan import HMRCQuestionPlan
+from finances.classes.hmrc_output import HMRCOutput
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sqlite_table.hmrc_questions_by_year import HMRC_QuestionsByYear
+
+TAX_YEAR = "2024 to 2025"
+
+
+class Answers:
+    def get_hmrc_calculation(self) -> str:
+        return "calculation"
+
+    def get_total_income_gbp(self) -> str:
+        return "£1.00"
+
+    def did_you_get_dividends_(self) -> bool:
+        return True
+
+
+@pytest.fixture(autouse=True)
+def questions(sql: SQLiteHelper, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("HMRC_QUESTION_PLAN_CACHE_DIR", str(tmp_path / "cache"))
+    sql.executeAndCommit(
+        "CREATE TABLE hmrc_questions (question TEXT, additional_information TEXT)"
+    )
+    sql.executeAndCommit(
+        "CREATE TABLE hmrc_questions_2024_to_2025 (question TEXT,"
+        " online_section TEXT, online_header TEXT, online_box TEXT,"
+        " online_order INTEGER, printed_section TEXT, printed_header TEXT,"
+        " printed_box TEXT, printed_order INTEGER)"
+    )
+    for question, online_order, printed_order in [
+        ("Total income (GBP)", 1, 2),
+        ("Did you get dividends?", 2, 1),
+    ]:
+        sql.executeAndCommit(
+            "INSERT INTO hmrc_questions VALUES (:question, '')", {"question": question}
+        )
+        sql.executeAndCommit(
+            "INSERT INTO hmrc_questions_2024_to_2025 VALUES (:question,"
+            " 'Online', 'Header', 'Box', :online_order,"
+            " 'Printed', 'Header', 'Box', :printed_order)",
+            {
+                "question": question,
+                "online_order": online_order,
+                "printed_order": printed_order,
+            },
+        )
+
+
+def test_compile_orders_questions_per_report_type() -> None:
+    plan = HMRCQuestionPlan.compile(TAX_YEAR, Answers)
+
+    online = plan.get_questions(HMRCOutput.HMRC_ONLINE_ANSWERS)
+    printed = plan.get_questions(HMRCOutput.HMRC_TAX_RETURN)
+    assert [q.method_name for q in online] == [
+        "get_total_income_gbp",
+        "did_you_get_dividends_",
+    ]
+    assert [q.method_name for q in printed] == [
+        "did_you_get_dividends_",
+        "get_total_income_gbp",
+    ]
+    assert plan.get_method_names() == [
+        "get_hmrc_calculation",
+        "get_total_income_gbp",
+        "did_you_get_dividends_",
+    ]
+
+
+def test_get_answer_calls_the_method() -> None:
+    plan = HMRCQuestionPlan.compile(TAX_YEAR, Answers)
+    assert plan.get_answer(Answers(), "get_total_income_gbp") == "£1.00"
+
+
+def test_second_compile_uses_disk_cache(monkeypatch: MonkeyPatch) -> None:
+    first = HMRCQuestionPlan.compile(TAX_YEAR, Answers)
+
+    def fail(self: HMRC_QuestionsByYear, question: str) -> str:
+        raise AssertionError("to_method_name should not run on a cache hit")
+
+    monkeypatch.setattr(HMRC_QuestionsByYear, "to_method_name", fail)
+    assert HMRCQuestionPlan.compile(TAX_YEAR, Answers) == first
+
+
+def test_missing_methods_are_answered_per_question() -> None:
+    class SomeAnswers:
+        def get_hmrc_calculation(self) -> str:
+            return "calculation"
+
+    plan = HMRCQuestionPlan.compile(TAX_YEAR, SomeAnswers)
+    assert plan.missing_methods == frozenset(
+        {"get_total_income_gbp", "did_you_get_dividends_"}
+    )
+    assert plan.get_answer(SomeAnswers(), "get_hmrc_calculation") == "calculation"
+    assert (
+        plan.get_answer(SomeAnswers(), "get_total_income_gbp")
+        == "Method not found: get_total_income_gbp - check log file"
+    )
+
+
+def test_unknown_report_type() -> None:
+    plan = HMRCQuestionPlan.compile(TAX_YEAR, Answers)
+    with pytest.raises(ValueError):
+        plan.get_questions("summary")
@@ -0,0 +1,80 @@
+import gc
+import weakref
+
+from finances.classes.memo import get_memo, memoized
+
+
+class Getters:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    @memoized
+    def get_total(self) -> int:
+        self.calls.append("total")
+        return 42
+
+    @memoized
+    def get_category_total(self, category: str) -> str:
+        self.calls.append(category)
+        return category.upper()
+
+    @memoized
+    def get_failure(self) -> int:
+        self.calls.append("failure")
+        raise ValueError("missing")
+
+
+def test_repeated_calls_are_cached() -> None:
+    getters = Getters()
+    assert getters.get_total() == 42
+    assert getters.get_total() == 42
+    assert getters.calls == ["total"]
+    assert get_memo(getters).get_stats() == {"values": 1, "hits": 1, "misses": 1}
+
+
+def test_arguments_are_part_of_the_key() -> None:
+    getters = Getters()
+    getters.get_category_total("a")
+    getters.get_category_total("b")
+    getters.get_category_total("a")
+    assert getters.calls == ["a", "b"]
+
+
+def test_memo_is_per_instance() -> None:
+    first, second = Getters(), Getters()
+    first.get_total()
+    second.get_total()
+    assert first.calls == second.calls == ["total"]
+
+
+def test_invalidate_one_method_or_all() -> None:
+    getters = Getters()
+    getters.get_total()
+    getters.get_category_total("a")
+
+    get_memo(getters).invalidate("get_total")
+    getters.get_total()
+    getters.get_category_total("a")
+    assert getters.calls == ["total", "a", "total"]
+
+    get_memo(getters).invalidate()
+    assert len(get_memo(getters)) == 0
+
+
+def test_exceptions_are_not_cached() -> None:
+    getters = Getters()
+    for _ in range(2):
+        try:
+            getters.get_failure()
+        except ValueError:
+            pass
+    assert getters.calls == ["failure", "failure"]
+
+
+def test_memo_does_not_keep_instance_alive() -> None:
+    getters = Getters()
+    getters.get_total()
+    ref = weakref.ref(getters)
+    del getters
+    gc.collect()
+    assert ref() is None
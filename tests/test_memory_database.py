@@ -0,0 +1,68 @@
+import sqlite3
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.memory_database import MemoryDatabase, MemoryDatabaseError
+from finances.classes.sqlalchemy_helper import SQLAlchemyHelper
+from finances.classes.sqlite_helper import SQLiteHelper
+
+
+@pytest.fixture
+def memory(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> Generator[MemoryDatabase, None, None]:
+    db_path = sql.db_path
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE accounts (name TEXT)")
+    connection.execute("INSERT INTO accounts VALUES ('disk')")
+    connection.commit()
+    connection.close()
+
+    memory = MemoryDatabase("test_memory")
+    memory.load(db_path)
+    # Only the copy is left to read
+    Path(db_path).unlink()
+    monkeypatch.setenv("SQLITE_IN_MEMORY", memory.name)
+    yield memory
+    memory.close()
+
+
+def test_sqlite_helper_reads_the_copy(memory: MemoryDatabase) -> None:
+    helper = SQLiteHelper()
+    assert helper.fetch_one_value("SELECT name FROM accounts") == "disk"
+    assert not Path(helper.db_path).exists()
+
+
+def test_read_only_helper_cannot_write_the_copy(
+    memory: MemoryDatabase, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SQLITE_READ_ONLY", "Yes")
+    reader = SQLiteHelper()
+    # The session closes the connection despite the error; a leaked one
+    # would keep the copy alive for later tests
+    with reader.session():
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            reader.executeAndCommit("DELETE FROM accounts")
+
+
+def test_sqlalchemy_helper_reads_the_copy(
+    memory: MemoryDatabase, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("OUR_FINANCES_SQLITE_DB_NAME", "sqlite:///unused.db")
+    monkeypatch.setenv("OUR_FINANCES_SQLITE_ECHO_ENABLED", "False")
+    helper = SQLAlchemyHelper()
+    assert helper.fetch_one_value("SELECT name FROM accounts") == "disk"
+
+
+def test_closing_drops_the_copy(memory: MemoryDatabase) -> None:
+    memory.close()
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        SQLiteHelper().fetch_all("SELECT name FROM accounts")
+
+
+def test_load_needs_a_database(tmp_path: Path) -> None:
+    with pytest.raises(MemoryDatabaseError, match="No database"):
+        MemoryDatabase("missing").load(str(tmp_path / "missing.sqlite"))
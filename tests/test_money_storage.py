@@ -0,0 +1,175 @@
+from decimal import Decimal
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.money_storage import get_money_storage, migrate_money_columns
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sqlite_table.transactions import Transactions
+from finances.util.financial_helpers import (
+    from_decimal_2,
+    from_pence,
+    string_to_pence,
+    text_to_pence,
+)
+
+TAX_YEAR = "2024 to 2025"
+
+
+class FakeRegistry:
+    FROM_DB = {
+        ("transactions", "nett"): "from_decimal_2",
+        ("transactions", "rate"): "from_decimal",
+        ("transactions", "category"): "from_str",
+    }
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self.FROM_DB
+
+    def get_from_db(self, table_name: str, column_name: str) -> str:
+        return self.FROM_DB[(table_name, column_name)]
+
+
+@pytest.fixture
+def sql(sql: SQLiteHelper) -> SQLiteHelper:
+    sql.executeAndCommit(
+        """
+CREATE TABLE transactions (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT,
+    "tax_year" TEXT,
+    "category" TEXT,
+    "nett" TEXT,
+    "rate" TEXT
+)
+"""
+    )
+    rows = [
+        ("HMRC B SES income", "100.10", "0.2"),
+        ("HMRC B SES income", "0.20", "0.2"),
+        ("HMRC B SES expense", "-40.05", "0.2"),
+        ("HMRC B SES expense", "", "0.2"),
+        ("HMRC S INT income", "12.3", "0.125"),
+    ]
+    with sql.session():
+        for category, nett, rate in rows:
+            sql.executeAndCommit(
+                "INSERT INTO transactions (tax_year, category, nett, rate)"
+                " VALUES (?, ?, ?, ?)",
+                (TAX_YEAR, category, nett, rate),
+            )
+    return sql
+
+
+def get_column_types(sql: SQLiteHelper) -> dict[str, str]:
+    return {row[1]: row[2] for row in sql.get_table_info("transactions")}
+
+
+def migrate(sql: SQLiteHelper, storage: str) -> list[str]:
+    with sql.session():
+        return migrate_money_columns(sql, FakeRegistry(), storage)
+
+
+def test_pence_conversions() -> None:
+    assert string_to_pence("£1,234.56") == 123456
+    assert string_to_pence(" ") is None
+    assert text_to_pence("-40.05") == -4005
+    assert text_to_pence(12) == 1200
+    assert from_pence(-4005) == Decimal("-40.05")
+    assert from_pence(None) == Decimal("0.00")
+    assert from_decimal_2(1050) == from_decimal_2("10.50") == Decimal("10.50")
+
+    with pytest.raises(ValueError, match="whole number of pence"):
+        text_to_pence("1.005")
+    with pytest.raises(ValueError, match="not an amount"):
+        text_to_pence("abc")
+
+
+def test_migrate_to_pence(sql: SQLiteHelper) -> None:
+    assert migrate(sql, "pence") == ["transactions"]
+
+    assert get_column_types(sql) == {
+        "id": "INTEGER",
+        "tax_year": "TEXT",
+        "category": "TEXT",
+        "nett": "INTEGER",
+        "rate": "TEXT",
+    }
+    assert sql.fetch_all("SELECT id, nett, rate FROM transactions") == [
+        (1, 10010, "0.2"),
+        (2, 20, "0.2"),
+        (3, -4005, "0.2"),
+        (4, None, "0.2"),
+        (5, 1230, "0.125"),
+    ]
+
+    # Already pence, so a second run does nothing
+    assert migrate(sql, "pence") == []
+
+    # The id column kept its AUTOINCREMENT
+    sql.executeAndCommit("DELETE FROM transactions WHERE id = 5")
+    sql.executeAndCommit("INSERT INTO transactions (nett) VALUES (1)")
+    assert sql.fetch_one_value("SELECT MAX(id) FROM transactions") == 6
+
+
+def test_migrate_back_to_text(sql: SQLiteHelper) -> None:
+    migrate(sql, "pence")
+
+    assert migrate(sql, "text") == ["transactions"]
+    assert get_column_types(sql)["nett"] == "TEXT"
+    assert [row[0] for row in sql.fetch_all("SELECT nett FROM transactions")] == [
+        "100.10",
+        "0.20",
+        "-40.05",
+        None,
+        "12.30",
+    ]
+
+
+def test_failed_migration_changes_nothing(sql: SQLiteHelper) -> None:
+    sql.executeAndCommit("UPDATE transactions SET nett = '1.005' WHERE id = 2")
+
+    with pytest.raises(ValueError, match="'1.005' is not a whole number of pence"):
+        migrate(sql, "pence")
+
+    assert get_column_types(sql)["nett"] == "TEXT"
+    assert sql.get_table_names() == ["transactions", "sqlite_sequence"]
+
+
+def test_totals_match_in_both_storages(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    text_total = Transactions().fetch_total_by_tax_year_category_like(TAX_YEAR, "HMRC")
+    text_totals = Transactions().fetch_totals_by_category(TAX_YEAR)
+
+    migrate(sql, "pence")
+    monkeypatch.setenv("SQLITE_MONEY_STORAGE", "pence")
+
+    pence_total = Transactions().fetch_total_by_tax_year_category_like(TAX_YEAR, "HMRC")
+    assert pence_total == text_total == Decimal("72.55")
+    assert Transactions().fetch_totals_by_category(TAX_YEAR) == text_totals
+
+
+def test_totals_follow_the_column_type_not_the_config(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    # Configured for pence, but not migrated yet
+    monkeypatch.setenv("SQLITE_MONEY_STORAGE", "pence")
+    transactions = Transactions()
+    assert transactions.money_storage == "text"
+    assert transactions.fetch_total_by_tax_year_category_like(
+        TAX_YEAR, "HMRC"
+    ) == Decimal("72.55")
+
+    migrate(sql, "pence")
+    monkeypatch.setenv("SQLITE_MONEY_STORAGE", "text")
+    transactions = Transactions()
+    assert transactions.money_storage == "pence"
+    assert transactions.fetch_total_by_tax_year_category_like(
+        TAX_YEAR, "HMRC"
+    ) == Decimal("72.55")
+
+
+def test_unknown_storage_is_rejected(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("SQLITE_MONEY_STORAGE", "float")
+    with pytest.raises(ValueError, match="SQLITE_MONEY_STORAGE"):
+        get_money_storage()
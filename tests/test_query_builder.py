@@ -0,0 +1,31 @@
+import pytest
+
+from finances.classes.query_builder import QueryBuilder
+
+
+def test_build_returns_bound_params() -> None:
+    query, params = (
+        QueryBuilder("people")
+        .select("first_name")
+        .where('"code" = :code', {"code": "B"})
+        .build()
+    )
+    assert query == 'SELECT "first_name" FROM people WHERE "code" = :code'
+    assert params == {"code": "B"}
+
+
+def test_where_merges_params_from_each_condition() -> None:
+    query, params = (
+        QueryBuilder("transactions")
+        .where('"tax_year" = :tax_year', {"tax_year": "2024 to 2025"})
+        .where('"category" LIKE :category_like', {"category_like": "HMRC B%"})
+        .build()
+    )
+    assert query.endswith('"tax_year" = :tax_year AND "category" LIKE :category_like')
+    assert params == {"tax_year": "2024 to 2025", "category_like": "HMRC B%"}
+
+
+def test_where_rejects_conflicting_param() -> None:
+    builder = QueryBuilder("people").where('"code" = :code', {"code": "B"})
+    with pytest.raises(ValueError):
+        builder.where('"spouse_code" = :code', {"code": "S"})
@@ -0,0 +1,129 @@
+import json
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.query_log import (
+    QueryStats,
+    is_full_scan,
+    normalize_sql,
+    percentile,
+    query_log,
+)
+from finances.classes.sqlalchemy_helper import SQLAlchemyHelper
+from finances.classes.sqlite_helper import SQLiteHelper
+
+
+@pytest.fixture
+def stats() -> Generator[QueryStats, None, None]:
+    stats = QueryStats(keep_events=True)
+    query_log.add_listener(stats)
+    query_log.explain_full_scans = True
+    yield stats
+    query_log.explain_full_scans = False
+    query_log.remove_listener(stats)
+
+
+@pytest.fixture
+def helper(sql: SQLiteHelper) -> SQLiteHelper:
+    sql.executeAndCommit(
+        "CREATE TABLE transactions (id INTEGER PRIMARY KEY, category TEXT, nett TEXT)"
+    )
+    sql.executeAndCommit("CREATE INDEX ix_category ON transactions (category)")
+    sql.executeAndCommit("INSERT INTO transactions (category) VALUES ('a'), ('b')")
+    return sql
+
+
+def test_normalize_sql_replaces_literals() -> None:
+    statement = """
+SELECT "tax_year" FROM transactions
+WHERE category = 'it''s' AND nett > 10.5 AND tax_year = :tax_year
+"""
+    assert normalize_sql(statement) == (
+        'SELECT "tax_year" FROM transactions'
+        " WHERE category = ? AND nett > ? AND tax_year = :tax_year"
+    )
+
+
+def test_percentile_is_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([3.0], 95) == 3
+
+
+def test_is_full_scan() -> None:
+    assert is_full_scan(["SCAN transactions"], "transactions")
+    assert is_full_scan(["SCAN TABLE transactions"], "transactions")
+    assert not is_full_scan(
+        ["SCAN transactions USING COVERING INDEX ix_category"], "transactions"
+    )
+    assert not is_full_scan(["SCAN transactions_2024"], "transactions")
+
+
+def test_nothing_is_recorded_without_listeners(helper: SQLiteHelper) -> None:
+    stats = QueryStats()
+    helper.fetch_all("SELECT * FROM transactions")
+    assert not query_log.is_enabled()
+    assert stats.statements == {}
+
+
+def test_sqlite_helper_statements_are_grouped(
+    helper: SQLiteHelper, stats: QueryStats
+) -> None:
+    for category in ("a", "b", "c"):
+        helper.fetch_all(f"SELECT id FROM transactions WHERE category = '{category}'")
+    helper.fetch_one_value("SELECT COUNT(*) FROM transactions")
+
+    statement = stats.statements["SELECT id FROM transactions WHERE category = ?"]
+    assert statement.calls == 3
+    assert statement.rows == 2
+    assert statement.callers == {
+        "test_sqlite_helper_statements_are_grouped": 3,
+    }
+    assert statement.plan is None  # Uses ix_category
+    assert len(stats.events) == 4
+
+
+def test_full_scans_of_transactions_are_explained(
+    helper: SQLiteHelper, stats: QueryStats
+) -> None:
+    helper.fetch_all("SELECT nett FROM transactions WHERE lower(category) = 'a'")
+    helper.fetch_all("SELECT nett FROM transactions WHERE lower(category) = 'b'")
+
+    statement = stats.get_statements()[0]
+    assert statement.plan and statement.plan[0].startswith("SCAN transactions")
+    assert "FULL SCAN" in stats.format_summary()
+
+
+def test_write_trace(helper: SQLiteHelper, stats: QueryStats, tmp_path: Path) -> None:
+    helper.fetch_one_row("SELECT category FROM transactions WHERE id = 1")
+    path = tmp_path / "trace" / "queries.json"
+    stats.write_trace(path)
+
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    assert trace["statements"][0]["calls"] == 1
+    assert trace["statements"][0]["callers"] == {"test_write_trace": 1}
+    assert trace["events"][0]["sql"] == (
+        "SELECT category FROM transactions WHERE id = ?"
+    )
+
+
+def test_sqlalchemy_helper_statements_are_recorded(
+    tmp_path: Path, monkeypatch: MonkeyPatch, stats: QueryStats
+) -> None:
+    monkeypatch.setenv("OUR_FINANCES_SQLITE_DB_NAME", f"sqlite:///{tmp_path}/q.db")
+    monkeypatch.setenv("OUR_FINANCES_SQLITE_ECHO_ENABLED", "False")
+    helper = SQLAlchemyHelper()
+    helper.executeAndCommit("CREATE TABLE transactions (category TEXT)")
+    helper.fetch_all(
+        "SELECT * FROM transactions WHERE category = :category", {"category": "a"}
+    )
+
+    statement = stats.statements[
+        "SELECT * FROM transactions WHERE category = :category"
+    ]
+    assert statement.calls == 1
+    assert statement.plan == ("SCAN transactions",)
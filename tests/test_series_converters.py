@@ -0,0 +1,71 @@
+from collections.abc import Callable
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from finances.util import series_converters
+from finances.util.boolean_helpers import boolean_string_to_int
+from finances.util.date_helpers import UK_to_ISO
+from finances.util.financial_helpers import string_to_financial, string_to_pence
+from finances.util.string_helpers import remove_non_numeric
+
+
+def to_series(values: list[str]) -> pd.Series:
+    # Built the way worksheet values are, so the dtype matches
+    return pd.DataFrame([[value] for value in values], columns=["cell"])["cell"]
+
+
+def assert_same(
+    vectorized: Callable[[pd.Series], pd.Series],
+    scalar: Callable[[str], Any],
+    values: list[str],
+) -> None:
+    series = to_series(values)
+    expected = series.apply(scalar)
+    result = vectorized(series)
+    assert result.dtype == expected.dtype
+    assert [(type(v), v) for v in result] == [(type(v), v) for v in expected]
+
+
+def test_to_boolean_integer() -> None:
+    values = ["Yes", " no ", "TRUE", "false", "1", "0", "y", "N", "", "  "]
+    assert_same(series_converters.to_boolean_integer, boolean_string_to_int, values)
+
+
+def test_to_boolean_integer_raises_like_scalar() -> None:
+    with pytest.raises(ValueError, match="Unexpected boolean value: maybe"):
+        series_converters.to_boolean_integer(to_series(["yes", " Maybe"]))
+
+
+def test_to_date() -> None:
+    values = ["01/02/2024", "1/2/2024", "29/02/2024", "", "  ", " 1/02/2024"]
+    values += ["31/12/1600", "05/11/2262"]
+    assert_same(series_converters.to_date, UK_to_ISO, values)
+
+
+@pytest.mark.parametrize("value", ["31/02/2024", "2024-01-02", "1/2/24", "x"])
+def test_to_date_raises_like_scalar(value: str) -> None:
+    with pytest.raises(ValueError):
+        UK_to_ISO(value)
+    with pytest.raises(ValueError):
+        series_converters.to_date(to_series(["01/01/2024", value]))
+
+
+def test_to_financial() -> None:
+    values = ["£1,234.56", "-£5.00", "", " ", "12.5%", "abc", "1.2.3", "£1,234.56"]
+    assert_same(series_converters.to_financial, string_to_financial, values)
+
+
+def test_to_numeric_str() -> None:
+    values = ["£1,234.56", "-5", "", "12.5%", "a1b2", "٣.٤"]
+    assert_same(series_converters.to_numeric_str, remove_non_numeric, values)
+
+
+def test_to_pence() -> None:
+    values = ["£1,234.56", "-£5.00", "", " ", "12", "£1,234.56"]
+    result = series_converters.to_pence(to_series(values))
+    assert result.dtype == "Int64"
+    assert [None if pd.isna(v) else int(v) for v in result] == [
+        string_to_pence(value) for value in values
+    ]
@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from finances.classes.sheet_rows import (
+    SheetRowsError,
+    prepare_rows,
+    to_sqlite_column_name,
+    write_rows,
+)
+from finances.classes.sqlite_helper import SQLiteHelper
+
+
+class FakeFieldTypes:
+    TO_DB = {
+        "date": "to_date",
+        "nett": "to_financial",
+        "reconciled": "to_boolean_integer",
+    }
+    SQLITE_TYPES = {"reconciled": "INTEGER"}
+
+    def get_sqlite_type(self, table_name: str, column_name: str) -> str:
+        return self.SQLITE_TYPES.get(column_name, "TEXT")
+
+    def get_to_db(self, table_name: str, column_name: str) -> str:
+        return self.TO_DB.get(column_name, "to_str")
+
+
+def test_column_names() -> None:
+    assert to_sqlite_column_name("Nett (£)") == "nett"
+    assert to_sqlite_column_name("Reconciled?") == "reconciled"
+
+
+def test_write_rows_adds_synthetic_id(sql: SQLiteHelper) -> None:
+    values = [
+        ["Date", "Nett (£)", "Reconciled?", "Description"],
+        ["01/02/2024", "£1,234.50", "Yes", "Rent"],
+        ["2/2/2024", "", "no"],
+    ]
+    prepared = prepare_rows("Transactions", values, FakeFieldTypes(), "hash")
+    with sql.session():
+        assert write_rows(sql, prepared, chunk_size=1) == 2
+
+    assert sql.fetch_all("SELECT * FROM transactions ORDER BY id") == [
+        (1, "2024-02-01", "1234.50", 1, "Rent"),
+        (2, "2024-02-02", "0.00", 0, ""),
+    ]
+    info = sql.get_table_info("transactions")
+    assert [(row[1], row[2], row[5]) for row in info] == [
+        ("id", "INTEGER", 1),
+        ("date", "TEXT", 0),
+        ("nett", "TEXT", 0),
+        ("reconciled", "INTEGER", 0),
+        ("description", "TEXT", 0),
+    ]
+
+
+def test_write_rows_uses_natural_key(sql: SQLiteHelper) -> None:
+    values = [["Key", "Name"], ["B1", "Bank"]]
+    prepared = prepare_rows("Bank accounts", values, FakeFieldTypes(), "hash")
+    with sql.session():
+        write_rows(sql, prepared)
+
+    assert sql.fetch_all("SELECT * FROM bank_accounts") == [("B1", "Bank")]
+    assert [row[5] for row in sql.get_table_info("bank_accounts")] == [1, 0]
+
+
+def test_prepare_rows_converts_every_row() -> None:
+    values = [["Reconciled?"], ["yes"], ["no"]]
+    prepared = prepare_rows("Transactions", values, FakeFieldTypes(), "hash")
+    assert prepared.rows == [(1,), (0,)]
+
+    # So a bad cell fails in the convert stage, before the writer sees it
+    with pytest.raises(ValueError, match="maybe"):
+        prepare_rows("Transactions", [*values, ["maybe"]], FakeFieldTypes(), "hash")
+
+
+def test_write_rows_keeps_old_table_on_error(sql: SQLiteHelper) -> None:
+    sql.executeAndCommit('CREATE TABLE bank_accounts ("key" TEXT, name TEXT)')
+    sql.executeAndCommit("INSERT INTO bank_accounts VALUES ('B1', 'Bank')")
+    values = [["Key", "Name"], ["B2", "Card"], ["B2", "Loan"]]
+    prepared = prepare_rows("Bank accounts", values, FakeFieldTypes(), "hash")
+
+    with sql.session(), pytest.raises(sqlite3.IntegrityError):
+        write_rows(sql, prepared, chunk_size=1)
+
+    assert sql.fetch_all("SELECT * FROM bank_accounts") == [("B1", "Bank")]
+
+
+def test_prepare_rows_rejects_empty_header() -> None:
+    with pytest.raises(SheetRowsError):
+        prepare_rows("Transactions", [["Date", ""]], FakeFieldTypes(), "hash")
+
+
+def test_sheet_rows_does_not_import_pandas() -> None:
+    code = "import sys, finances.classes.sheet_rows; print('pandas' in sys.modules)"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,73 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from finances.classes.google_helper import batch_get_values
+from finances.classes.sheet_snapshot import (
+    SheetSnapshot,
+    SheetSnapshotError,
+    SnapshotSpreadsheet,
+    get_latest_snapshot_path,
+    read_snapshot,
+    write_snapshot,
+)
+
+SNAPSHOT = SheetSnapshot(
+    created_at="20260101T090000Z",
+    modified_time="2026-01-01T08:59:00.000Z",
+    values_by_title={
+        "Accounts": [["Account", "Balance (£)"], ["Current", "£1.00"]],
+        "Bob's Pots": [["Pot"], ["Holiday"], ["Café"]],
+        "Empty": [],
+    },
+)
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    path = write_snapshot(SNAPSHOT, tmp_path)
+
+    assert path.name == "sheets_20260101T090000Z.json.gz"
+    assert read_snapshot(path) == SNAPSHOT
+    assert list(read_snapshot(path).values_by_title) == list(SNAPSHOT.values_by_title)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_other_version_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "sheets_old.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump({"version": 0, "worksheets": []}, file)
+
+    with pytest.raises(SheetSnapshotError, match="version 0"):
+        read_snapshot(path)
+
+
+def test_latest_snapshot_path(tmp_path: Path) -> None:
+    with pytest.raises(SheetSnapshotError):
+        get_latest_snapshot_path(tmp_path)
+
+    older = SheetSnapshot("20250101T000000Z", None, {})
+    write_snapshot(older, tmp_path)
+    newest = write_snapshot(SNAPSHOT, tmp_path)
+
+    assert get_latest_snapshot_path(tmp_path) == newest
+
+
+def test_snapshot_spreadsheet_replays_values() -> None:
+    spreadsheet = SnapshotSpreadsheet(SNAPSHOT)
+
+    worksheets = spreadsheet.worksheets()
+    assert [worksheet.title for worksheet in worksheets] == [
+        "Accounts",
+        "Bob's Pots",
+        "Empty",
+    ]
+    assert worksheets[1].row_values(1) == ["Pot"]
+    assert worksheets[2].row_values(1) == []
+    assert spreadsheet.get_lastUpdateTime() == SNAPSHOT.modified_time
+
+    # Replayed exactly as a live download, empty worksheets included
+    titles = list(SNAPSHOT.values_by_title)
+    values = batch_get_values(spreadsheet, titles)  # type: ignore[arg-type]
+    assert values == {**SNAPSHOT.values_by_title, "Empty": [[]]}
@@ -0,0 +1,90 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes import spreadsheet_analyzer
+from finances.classes.sheet_snapshot import SheetSnapshot, SnapshotSpreadsheet
+from finances.classes.spreadsheet_analyzer import SpreadsheetAnalyzer
+
+
+class CountingSpreadsheet(SnapshotSpreadsheet):
+    def __init__(self, values_by_title: dict[str, list[list[str]]]) -> None:
+        super().__init__(SheetSnapshot("20260101T000000Z", None, values_by_title))
+        self.requests: list[list[str]] = []
+
+    def values_batch_get(self, ranges: list[str]) -> dict[str, Any]:
+        self.requests.append(ranges)
+        return super().values_batch_get(ranges)
+
+
+SHEETS = {
+    "_Current": [["Date", "Amount (£)", "Cleared?"], ["01/01/2026", "£1", "Yes"]],
+    "People": [["Code", "Name"], ["B", "Bob"]],
+}
+
+
+@pytest.fixture
+def generated_dir(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    monkeypatch.setattr(spreadsheet_analyzer, "GENERATED_DIR", f"{tmp_path}/")
+    return tmp_path
+
+
+def analyze(sheets: dict[str, list[list[str]]]) -> SpreadsheetAnalyzer:
+    spreadsheet = CountingSpreadsheet(sheets)
+    analyzer = SpreadsheetAnalyzer(spreadsheet)
+    analyzer.analyze_spreadsheet()
+
+    assert spreadsheet.requests == [[f"'{title}'!1:1" for title in sheets]]
+    return analyzer
+
+
+def test_headers_come_from_one_request() -> None:
+    analyzer = analyze(SHEETS)
+
+    assert analyzer.all_sheet_names == ["_Current", "People"]
+    assert analyzer.account_sheet_names == ["_Current"]
+    assert [
+        (field.table_name, field.sqlite_column_name, field.to_db)
+        for field in analyzer.fields
+    ] == [
+        ("_current", "date", "to_date"),
+        ("_current", "amount", "to_numeric_str"),
+        ("_current", "cleared", "to_boolean_integer"),
+        ("people", "code", "to_str"),
+        ("people", "name", "to_str"),
+    ]
+
+
+def test_unchanged_headers_skip_generation(generated_dir: Path) -> None:
+    assert analyze(SHEETS).write_files()
+    field_registry = generated_dir / "field_registry.py"
+    written = field_registry.stat().st_mtime_ns
+
+    # Data rows are not part of the fingerprint
+    sheets = {**SHEETS, "People": [["Code", "Name"], ["S", "Sue"]]}
+    assert not analyze(sheets).write_files()
+    assert field_registry.stat().st_mtime_ns == written
+
+    assert analyze(sheets).write_files(force=True)
+
+
+def test_changed_headers_regenerate(generated_dir: Path) -> None:
+    assert analyze(SHEETS).write_files()
+
+    sheets = {**SHEETS, "People": [["Code", "Name", "Spouse"]]}
+    assert analyze(sheets).write_files()
+    assert "spouse" in (generated_dir / "field_registry.py").read_text()
+
+
+def test_changed_code_regenerates(
+    generated_dir: Path, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    code_path = tmp_path / "type_mapping.py"
+    code_path.write_text("TYPE_MAPPING = {}")
+    monkeypatch.setattr(spreadsheet_analyzer, "CODE_PATHS", [code_path])
+    assert analyze(SHEETS).write_files()
+
+    code_path.write_text("TYPE_MAPPING = {'?': {}}")
+    assert analyze(SHEETS).write_files()
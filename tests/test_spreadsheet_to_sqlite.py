@@ -0,0 +1,336 @@
+import importlib.util
+import os
+import sys
+import threading
+import time
+import types
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes import google_helper
+from finances.classes.google_helper import GoogleApiLimiter
+from finances.classes.sheet_rows import PreparedRows
+from finances.classes.sheet_snapshot import SheetSnapshot, SnapshotSpreadsheet
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.staged_database import get_previous_path
+
+# The converter imports the generated field registry, which analyze-spreadsheet
+# writes from the real spreadsheet; the tests swap in FakeFieldRegistry anyway
+if importlib.util.find_spec("finances.generated") is None:
+    generated = types.ModuleType("finances.generated")
+    generated.__path__ = []
+    field_registry_module = types.ModuleType("finances.generated.field_registry")
+    field_registry_module.field_registry = None  # type: ignore[attr-defined]
+    sys.modules["finances.generated"] = generated
+    sys.modules["finances.generated.field_registry"] = field_registry_module
+
+from finances.classes import spreadsheet_to_sqlite  # noqa: E402
+from finances.classes.spreadsheet_to_sqlite import (  # noqa: E402
+    PreparedTable,
+    SpreadSheetToSqlite,
+    SpreadSheetToSqliteError,
+    UnchangedTable,
+)
+
+MODIFIED_TIME = "2025-01-01T00:00:00Z"
+
+
+class FakeFieldRegistry:
+    # (table_name, column_name): (to_db, sqlite_type, from_db)
+    FIELDS = {
+        ("transactions", "date"): ("to_date", "TEXT", "from_str"),
+        ("transactions", "nett"): ("to_financial", "TEXT", "from_decimal_2"),
+        ("transactions", "description"): ("to_str", "TEXT", "from_str"),
+        ("bank_accounts", "key"): ("to_str", "TEXT", "from_str"),
+        ("bank_accounts", "name"): ("to_str", "TEXT", "from_str"),
+    }
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self.FIELDS
+
+    def get_from_db(self, table_name: str, column_name: str) -> str:
+        return self.FIELDS.get((table_name, column_name), ("", "", "from_str"))[2]
+
+    def get_sqlite_type(self, table_name: str, column_name: str) -> str:
+        return self.FIELDS.get((table_name, column_name), ("", "TEXT", ""))[1]
+
+    def get_to_db(self, table_name: str, column_name: str) -> str:
+        return self.FIELDS.get((table_name, column_name), ("to_str", "", ""))[0]
+
+
+def get_values() -> dict[str, list[list[str]]]:
+    return {
+        "Transactions": [
+            ["Date", "Nett (£)", "Description"],
+            ["01/04/2024", "£1.50", "tea"],
+            ["02/04/2024", "£500.00", "rent"],
+            ["03/04/2024", "£2.00", "bus"],
+        ],
+        "Bank accounts": [["Key", "Name"], ["B1", "Bank"]],
+    }
+
+
+def get_spreadsheet(
+    values_by_title: dict[str, list[list[str]]],
+    modified_time: str | None = MODIFIED_TIME,
+) -> SnapshotSpreadsheet:
+    return SnapshotSpreadsheet(SheetSnapshot("now", modified_time, values_by_title))
+
+
+@pytest.fixture(autouse=True)
+def fields(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(spreadsheet_to_sqlite, "field_registry", FakeFieldRegistry())
+    # A private limiter, so no test waits on another's quota
+    monkeypatch.setattr(google_helper, "_api_limiter", GoogleApiLimiter(6000))
+
+
+@pytest.fixture(params=["pandas", "rows"])
+def writer(request: pytest.FixtureRequest, monkeypatch: MonkeyPatch) -> str:
+    monkeypatch.setenv("SHEETS_WRITER", request.param)
+    writer: str = request.param
+    return writer
+
+
+def convert(
+    values_by_title: dict[str, list[list[str]]],
+    modified_time: str | None = MODIFIED_TIME,
+    full: bool = False,
+    diff: bool = False,
+) -> dict[str, list[str]]:
+    converter = SpreadSheetToSqlite(get_spreadsheet(values_by_title, modified_time))
+    return converter.convert_to_sqlite(full=full, diff=diff)
+
+
+def fetch_transactions(sql: SQLiteHelper) -> list[tuple[int, str]]:
+    return sql.fetch_all('SELECT "id", "description" FROM transactions ORDER BY 1')
+
+
+def get_table_names(
+    tables: Iterator[PreparedTable | PreparedRows | UnchangedTable],
+) -> list[str]:
+    return [table.table_name for table in tables]
+
+
+def test_prepare_tables_yields_in_title_order(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GOOGLE_BATCH_GET_CHUNK_SIZE", "1")
+    monkeypatch.setenv("SHEETS_FETCH_WORKERS", "3")
+    values = {f"Sheet {number}": [["Name"], [str(number)]] for number in range(5)}
+    converter = SpreadSheetToSqlite(get_spreadsheet(values))
+
+    fetch_chunk = converter.fetch_chunk
+
+    def slow_first_chunk(titles: list[str]) -> dict[str, list[list[str]]]:
+        # The first chunk arrives last
+        if titles == ["Sheet 0"]:
+            time.sleep(0.2)
+        return fetch_chunk(titles)
+
+    monkeypatch.setattr(converter, "fetch_chunk", slow_first_chunk)
+
+    tables = converter.prepare_tables(list(values), {})
+    assert get_table_names(tables) == [f"sheet_{number}" for number in range(5)]
+
+
+def test_prepare_tables_skips_known_hashes(sql: SQLiteHelper) -> None:
+    values = get_values()
+    converter = SpreadSheetToSqlite(get_spreadsheet(values))
+    known_hashes = {
+        "bank_accounts": converter.hash_table("Bank accounts", values["Bank accounts"])
+    }
+
+    tables = list(converter.prepare_tables(list(values), known_hashes))
+    assert [type(table) for table in tables] == [PreparedTable, UnchangedTable]
+
+
+def test_conversion_changes_change_the_hash(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    values = get_values()["Bank accounts"]
+    converter = SpreadSheetToSqlite(get_spreadsheet(get_values()))
+    content_hash = converter.hash_table("Bank accounts", values)
+    assert content_hash != spreadsheet_to_sqlite.hash_values(values)
+
+    monkeypatch.setitem(
+        FakeFieldRegistry.FIELDS,
+        ("bank_accounts", "name"),
+        ("to_str", "TEXT COLLATE NOCASE", "from_str"),
+    )
+    registry_hash = converter.hash_table("Bank accounts", values)
+    assert registry_hash != content_hash
+
+    converter.writer = "rows" if converter.writer == "pandas" else "pandas"
+    assert converter.hash_table("Bank accounts", values) != registry_hash
+
+
+def test_fetch_error_reaches_the_caller(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    converter = SpreadSheetToSqlite(get_spreadsheet(get_values()))
+
+    def fail(titles: list[str]) -> dict[str, list[list[str]]]:
+        raise google_helper.GoogleHelperError("quota")
+
+    monkeypatch.setattr(converter, "fetch_chunk", fail)
+    with pytest.raises(google_helper.GoogleHelperError, match="quota"):
+        list(converter.prepare_tables(["Transactions"], {}))
+
+
+def test_convert_error_reaches_the_caller(sql: SQLiteHelper, writer: str) -> None:
+    values = {"Transactions": [["Date", ""], ["01/04/2024", "x"]]}
+    converter = SpreadSheetToSqlite(get_spreadsheet(values))
+    with pytest.raises(Exception, match="Empty column name"):
+        list(converter.prepare_tables(["Transactions"], {}))
+
+
+def test_queue_depth_bounds_the_chunks_in_flight(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GOOGLE_BATCH_GET_CHUNK_SIZE", "1")
+    monkeypatch.setenv("SHEETS_FETCH_WORKERS", "4")
+    monkeypatch.setenv("SHEETS_PIPELINE_QUEUE_DEPTH", "2")
+    values = {f"Sheet {number}": [["Name"], [str(number)]] for number in range(6)}
+    converter = SpreadSheetToSqlite(get_spreadsheet(values))
+
+    fetched: list[str] = []
+    lock = threading.Lock()
+    fetch_chunk = converter.fetch_chunk
+
+    def record(titles: list[str]) -> dict[str, list[list[str]]]:
+        with lock:
+            fetched.extend(titles)
+        return fetch_chunk(titles)
+
+    monkeypatch.setattr(converter, "fetch_chunk", record)
+
+    tables = converter.prepare_tables(list(values), {})
+    next(tables)
+    # Give the workers time to run ahead, if they could
+    time.sleep(0.2)
+    assert len(fetched) == 2
+
+    assert len(list(tables)) == 5
+    assert len(fetched) == 6
+
+
+def test_convert_adds_then_skips_unchanged_sheets(
+    sql: SQLiteHelper, writer: str
+) -> None:
+    assert convert(get_values()) == {
+        "skipped": [],
+        "updated": [],
+        "added": ["transactions", "bank_accounts"],
+        "migrated": [],
+    }
+    assert fetch_transactions(sql) == [(1, "tea"), (2, "rent"), (3, "bus")]
+
+    # Unchanged since the last sync, so nothing is downloaded
+    summary = convert(get_values())
+    assert summary["skipped"] == ["transactions", "bank_accounts"]
+
+    # Changed spreadsheet, but these sheets hash the same
+    summary = convert(get_values(), modified_time="2025-02-01T00:00:00Z")
+    assert summary["skipped"] == ["transactions", "bank_accounts"]
+    assert summary["updated"] == []
+
+
+def test_convert_stores_financial_amounts_as_text(
+    sql: SQLiteHelper, writer: str
+) -> None:
+    convert(get_values())
+    assert sql.fetch_all('SELECT "nett" FROM transactions ORDER BY "id"') == [
+        ("1.50",),
+        ("500.00",),
+        ("2.00",),
+    ]
+
+
+def test_full_converts_every_sheet(sql: SQLiteHelper, writer: str) -> None:
+    convert(get_values())
+    summary = convert(get_values(), full=True)
+    assert summary["updated"] == ["transactions", "bank_accounts"]
+
+
+@pytest.mark.parametrize(
+    ("diff", "expected"),
+    [
+        # Unchanged rows keep their synthetic ids
+        (True, [(1, "tea"), (3, "bus"), (4, "coffee")]),
+        # The table is replaced, so the ids are renumbered
+        (False, [(1, "tea"), (2, "bus"), (3, "coffee")]),
+    ],
+)
+def test_diff_or_replace_changed_sheets(
+    sql: SQLiteHelper, writer: str, diff: bool, expected: list[tuple[int, str]]
+) -> None:
+    convert(get_values())
+
+    values = get_values()
+    values["Transactions"][2:] = [
+        ["03/04/2024", "£2.00", "bus"],
+        ["04/04/2024", "£3.00", "coffee"],
+    ]
+    summary = convert(values, modified_time="2025-02-01T00:00:00Z", diff=diff)
+
+    assert summary["updated"] == ["transactions"]
+    assert summary["skipped"] == ["bank_accounts"]
+    assert fetch_transactions(sql) == expected
+
+
+def test_convert_swaps_the_staging_copy_in(sql: SQLiteHelper, writer: str) -> None:
+    convert(get_values())
+    values = get_values()
+    values["Bank accounts"].append(["B2", "Card"])
+    convert(values, modified_time="2025-02-01T00:00:00Z")
+
+    assert not os.path.exists(sql.db_path + ".staging")
+    assert sql.fetch_all("SELECT * FROM bank_accounts") == [
+        ("B1", "Bank"),
+        ("B2", "Card"),
+    ]
+
+    # The database it replaced is kept as the previous generation
+    previous = SQLiteHelper(get_previous_path(sql.db_path))
+    assert previous.fetch_all("SELECT * FROM bank_accounts") == [("B1", "Bank")]
+
+
+def test_failed_convert_discards_the_staging_copy(
+    sql: SQLiteHelper, writer: str, monkeypatch: MonkeyPatch
+) -> None:
+    convert(get_values())
+    live_bytes = Path(sql.db_path).read_bytes()
+
+    def fail(self: SpreadSheetToSqlite, table: PreparedTable | PreparedRows) -> None:
+        raise SpreadSheetToSqliteError(f"cannot write {table.table_name}")
+
+    monkeypatch.setattr(SpreadSheetToSqlite, "write_prepared", fail)
+    values = get_values()
+    values["Bank accounts"].append(["B2", "Card"])
+    with pytest.raises(SpreadSheetToSqliteError, match="bank_accounts"):
+        convert(values, modified_time="2025-02-01T00:00:00Z")
+
+    assert not os.path.exists(sql.db_path + ".staging")
+    assert Path(sql.db_path).read_bytes() == live_bytes
+
+
+def test_diff_stores_pence_with_blank_amounts(
+    sql: SQLiteHelper, writer: str, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SQLITE_MONEY_STORAGE", "pence")
+    convert(get_values())
+
+    values = get_values()
+    values["Transactions"][2][1] = ""
+    values["Transactions"].append(["04/04/2024", "£3.00", "coffee"])
+    convert(values, modified_time="2025-02-01T00:00:00Z", diff=True)
+
+    assert sql.fetch_all('SELECT "id", "nett" FROM transactions ORDER BY 1') == [
+        (1, 150),
+        (3, 200),
+        (4, None),
+        (5, 300),
+    ]
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.sqlite_helper import SQLiteHelper
+
+
+@pytest.fixture
+def helper(sql: SQLiteHelper) -> SQLiteHelper:
+    sql.executeAndCommit(
+        "CREATE TABLE transactions (id INTEGER PRIMARY KEY, nett TEXT)"
+    )
+    sql.executeAndCommit("INSERT INTO transactions (nett) VALUES ('1.50'), ('2')")
+    return sql
+
+
+def count_connects(helper: SQLiteHelper, monkeypatch: MonkeyPatch) -> list[int]:
+    connects: list[int] = []
+    original_connect = helper.connect
+
+    def connect() -> object:
+        connects.append(1)
+        return original_connect()
+
+    monkeypatch.setattr(helper, "connect", connect)
+    return connects
+
+
+def test_calls_outside_session_use_own_connection(
+    helper: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    connects = count_connects(helper, monkeypatch)
+    helper.fetch_all("SELECT * FROM transactions")
+    helper.fetch_one_value("SELECT COUNT(*) FROM transactions")
+    assert len(connects) == 2
+
+
+def test_session_reuses_one_connection(
+    helper: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    connects = count_connects(helper, monkeypatch)
+    with helper.session():
+        assert helper.get_how_many("transactions") == 2
+        assert helper.fetch_one_value_decimal("SELECT SUM(nett) FROM transactions")
+        assert len(helper.get_table_info("transactions")) == 2
+        helper.executeAndCommit("INSERT INTO transactions (nett) VALUES ('3')")
+        assert helper.get_how_many("transactions") == 3
+    assert len(connects) == 1
+    assert not helper.in_session()
+
+
+def test_nested_sessions_share_connection(
+    helper: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    connects = count_connects(helper, monkeypatch)
+    with helper.session():
+        outer = helper.db_connection
+        with helper.session():
+            assert helper.db_connection is outer
+        assert helper.in_session()
+        helper.fetch_all("SELECT * FROM transactions")
+    assert len(connects) == 1
+
+
+def test_session_closes_connection_on_error(helper: SQLiteHelper) -> None:
+    with pytest.raises(RuntimeError):
+        with helper.session():
+            raise RuntimeError("boom")
+    assert not helper.in_session()
+    assert helper.get_how_many("transactions") == 2
+
+
+def test_fetch_binds_params(helper: SQLiteHelper) -> None:
+    query = "SELECT COUNT(*) FROM transactions WHERE nett = :nett"
+    assert helper.fetch_one_value(query, {"nett": "2"}) == 1
+    assert helper.fetch_all(query, {"nett": "'2' OR 1=1"}) == [(0,)]
+
+
+def test_read_only_helper_cannot_write(
+    helper: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SQLITE_READ_ONLY", "Yes")
+    reader = SQLiteHelper()
+    assert reader.fetch_one_value("SELECT COUNT(*) FROM transactions") == 2
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        reader.executeAndCommit("DELETE FROM transactions")
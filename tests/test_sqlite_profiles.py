@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sqlite_profiles import PROFILES, get_profile
+from finances.classes.staged_database import StagedDatabase
+
+
+def read_pragma(helper: SQLiteHelper, pragma: str) -> object:
+    return helper.fetch_one_value(f"PRAGMA {pragma}")
+
+
+def test_default_profile_keeps_sqlite_settings(sql: SQLiteHelper) -> None:
+    assert sql.profile is PROFILES["default"]
+    assert read_pragma(sql, "journal_mode") == "delete"
+    assert read_pragma(sql, "busy_timeout") == 5000
+
+
+def test_ingest_profile_is_applied_on_connect(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SQLITE_PROFILE", "ingest")
+    helper = SQLiteHelper()
+    with helper.session(write=True):
+        # Builds turn the journal off themselves, in apply_build_pragmas
+        assert read_pragma(helper, "journal_mode") == "delete"
+        assert read_pragma(helper, "synchronous") == 1  # NORMAL
+        assert read_pragma(helper, "cache_size") == -262144
+        assert read_pragma(helper, "temp_store") == 2  # MEMORY
+        assert read_pragma(helper, "busy_timeout") == 30000
+
+
+def test_only_writes_set_the_journal_mode(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    SQLiteHelper().executeAndCommit("CREATE TABLE accounts (name TEXT)")
+
+    monkeypatch.setenv("SQLITE_PROFILE", "report")
+    reader = SQLiteHelper()
+    assert read_pragma(reader, "journal_mode") == "delete"
+    assert read_pragma(reader, "cache_size") == -65536
+    with reader.session():
+        assert read_pragma(reader, "journal_mode") == "delete"
+
+    writer = SQLiteHelper()
+    writer.executeAndCommit("INSERT INTO accounts VALUES ('Cash')")
+    assert read_pragma(writer, "journal_mode") == "wal"
+
+
+def test_read_only_connection_skips_journal_mode(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    SQLiteHelper().executeAndCommit("CREATE TABLE accounts (name TEXT)")
+
+    monkeypatch.setenv("SQLITE_PROFILE", "report")
+    monkeypatch.setenv("SQLITE_READ_ONLY", "Yes")
+    reader = SQLiteHelper()
+    with reader.session(write=True):
+        assert read_pragma(reader, "journal_mode") == "delete"
+
+
+def test_unknown_profile_raises(sql: SQLiteHelper, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("SQLITE_PROFILE", "fast")
+    with pytest.raises(ValueError, match="SQLITE_PROFILE"):
+        SQLiteHelper()
+    with pytest.raises(ValueError, match="fast"):
+        get_profile()
+
+
+def test_swap_in_leaves_no_wal_behind(
+    sql: SQLiteHelper, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SQLITE_PROFILE", "ingest")
+    helper = SQLiteHelper()
+    helper.executeAndCommit("CREATE TABLE accounts (name TEXT)")
+    helper.executeAndCommit("INSERT INTO accounts VALUES ('old')")
+
+    staged = StagedDatabase(helper.db_path)
+    staged.prepare()
+    SQLiteHelper(staged.staging_path).executeAndCommit(
+        "UPDATE accounts SET name = 'new'"
+    )
+    staged.swap_in()
+
+    connection = sqlite3.connect(helper.db_path)
+    assert connection.execute("SELECT name FROM accounts").fetchone() == ("new",)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+    connection.close()
+
+    monkeypatch.setenv("SQLITE_PROFILE", "report")
+    writer = SQLiteHelper()
+    writer.executeAndCommit("UPDATE accounts SET name = 'newer'")
+    assert read_pragma(writer, "journal_mode") == "wal"
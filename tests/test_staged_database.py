@@ -0,0 +1,125 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from finances.classes.staged_database import (
+    StagedDatabase,
+    StagedDatabaseError,
+    apply_build_pragmas,
+    restore_previous,
+)
+
+
+def create_database(path: str, value: str) -> None:
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE accounts (name TEXT)")
+    connection.execute("INSERT INTO accounts VALUES (?)", (value,))
+    connection.commit()
+    connection.close()
+
+
+def read_value(path: str) -> str:
+    connection = sqlite3.connect(path)
+    value: str = connection.execute("SELECT name FROM accounts").fetchone()[0]
+    connection.close()
+    return value
+
+
+def update_value(path: str, value: str) -> None:
+    connection = sqlite3.connect(path)
+    apply_build_pragmas(connection)
+    connection.execute("UPDATE accounts SET name = ?", (value,))
+    connection.commit()
+    connection.close()
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "finances.sqlite")
+    create_database(path, "old")
+    return path
+
+
+def test_live_file_is_untouched_until_swap(db_path: str) -> None:
+    staged = StagedDatabase(db_path)
+    staged.prepare()
+    update_value(staged.staging_path, "new")
+
+    assert read_value(db_path) == "old"
+
+    staged.swap_in()
+
+    assert read_value(db_path) == "new"
+    assert read_value(staged.previous_path) == "old"
+    assert not os.path.exists(staged.staging_path)
+
+
+def test_discard_leaves_live_file(db_path: str) -> None:
+    staged = StagedDatabase(db_path)
+    staged.prepare()
+    update_value(staged.staging_path, "new")
+    staged.discard()
+
+    assert read_value(db_path) == "old"
+    assert not os.path.exists(staged.staging_path)
+    assert not os.path.exists(staged.previous_path)
+
+
+def test_unchanged_swap_keeps_previous_generation(db_path: str) -> None:
+    staged = StagedDatabase(db_path)
+    staged.prepare()
+    update_value(staged.staging_path, "new")
+    staged.swap_in()
+
+    staged.prepare()
+    staged.swap_in(keep_previous=False)
+
+    assert read_value(db_path) == "new"
+    assert read_value(staged.previous_path) == "old"
+
+
+def test_prepare_without_live_file(tmp_path: Path) -> None:
+    staged = StagedDatabase(str(tmp_path / "new.sqlite"))
+    staged.prepare()
+    create_database(staged.staging_path, "first")
+    staged.swap_in()
+
+    assert read_value(staged.db_path) == "first"
+    assert not os.path.exists(staged.previous_path)
+
+
+def test_restore_previous(db_path: str) -> None:
+    with pytest.raises(StagedDatabaseError):
+        restore_previous(db_path)
+
+    staged = StagedDatabase(db_path)
+    staged.prepare()
+    update_value(staged.staging_path, "new")
+    staged.swap_in()
+
+    restore_previous(db_path)
+
+    assert read_value(db_path) == "old"
+    assert read_value(staged.previous_path) == "old"
+
+
+def test_restore_previous_checkpoints_the_live_wal(db_path: str) -> None:
+    staged = StagedDatabase(db_path)
+    staged.prepare()
+    update_value(staged.staging_path, "new")
+    staged.swap_in()
+
+    # An open connection keeps the -wal file of the generation being replaced
+    writer = sqlite3.connect(db_path)
+    try:
+        writer.execute("PRAGMA journal_mode = WAL")
+        writer.execute("UPDATE accounts SET name = 'newer'")
+        writer.commit()
+
+        restore_previous(db_path)
+
+        assert read_value(db_path) == "old"
+    finally:
+        writer.close()
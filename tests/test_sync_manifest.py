@@ -0,0 +1,34 @@
+import pytest
+
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.sync_manifest import SyncManifest, hash_values
+
+
+@pytest.fixture
+def manifest(sql: SQLiteHelper) -> SyncManifest:
+    sql.executeAndCommit("CREATE TABLE accounts (id INTEGER PRIMARY KEY)")
+    manifest = SyncManifest(sql)
+    manifest.create_table()
+    return manifest
+
+
+def test_hash_values_changes_with_content() -> None:
+    values = [["Name", "Balance"], ["Cash", "1.00"]]
+    assert hash_values(values) == hash_values([row[:] for row in values])
+    assert hash_values(values) != hash_values([["Name", "Balance"], ["Cash", "2.00"]])
+    assert hash_values([["a", "b"]]) != hash_values([["a"], ["b"]])
+
+
+def test_entries_round_trip(manifest: SyncManifest) -> None:
+    manifest.record("accounts", "Accounts", "abc", "2025-01-01T00:00:00Z")
+    manifest.record("accounts", "Accounts", "def", None)
+
+    entry = manifest.get_entries()["accounts"]
+    assert (entry.worksheet_title, entry.content_hash) == ("Accounts", "def")
+    assert entry.modified_time is None
+
+
+def test_entries_skip_dropped_tables(manifest: SyncManifest) -> None:
+    manifest.record("accounts", "Accounts", "abc", None)
+    manifest.record("categories", "Categories", "def", None)
+    assert list(manifest.get_entries()) == ["accounts"]
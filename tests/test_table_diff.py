@@ -0,0 +1,63 @@
+import pytest
+
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.table_diff import TableDiff, apply_table_diff
+
+
+@pytest.fixture
+def sql(sql: SQLiteHelper) -> SQLiteHelper:
+    sql.executeAndCommit('CREATE TABLE accounts ("key" TEXT PRIMARY KEY, balance INT)')
+    sql.executeAndCommit(
+        "INSERT INTO accounts VALUES ('cash', 1), ('bank', 2), ('card', 3)"
+    )
+    sql.executeAndCommit(
+        "CREATE TABLE transactions"
+        " (id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT, nett TEXT)"
+    )
+    sql.executeAndCommit(
+        "INSERT INTO transactions (description, nett)"
+        " VALUES ('tea', '1'), ('tea', '1'), ('rent', '500'), ('bus', '2')"
+    )
+    return sql
+
+
+def test_keyed_diff(sql: SQLiteHelper) -> None:
+    rows = [("cash", 1), ("bank", 20), ("loan", 4)]
+    with sql.session():
+        diff = apply_table_diff(sql, "accounts", ["key", "balance"], rows, ["key"])
+
+    assert diff == TableDiff(inserted=1, updated=1, deleted=1)
+    assert sorted(sql.fetch_all("SELECT * FROM accounts")) == sorted(rows)
+
+
+def test_content_diff_keeps_ids(sql: SQLiteHelper) -> None:
+    rows = [("tea", "1"), ("coffee", "3"), ("rent", "500"), ("bus", "2")]
+    with sql.session():
+        diff = apply_table_diff(sql, "transactions", ["description", "nett"], rows, [])
+
+    assert diff == TableDiff(inserted=1, deleted=1)
+    assert sql.fetch_all("SELECT * FROM transactions ORDER BY id") == [
+        (1, "tea", "1"),
+        (3, "rent", "500"),
+        (4, "bus", "2"),
+        (5, "coffee", "3"),
+    ]
+
+
+def test_unchanged_rows_are_not_written(sql: SQLiteHelper) -> None:
+    rows = [("tea", "1"), ("tea", "1"), ("rent", "500"), ("bus", "2")]
+    with sql.session():
+        diff = apply_table_diff(sql, "transactions", ["description", "nett"], rows, [])
+    assert diff == TableDiff()
+
+
+def test_diff_rolls_back_on_error(sql: SQLiteHelper) -> None:
+    rows = [("cash", 1), ("cash", 2)]
+    with sql.session(), pytest.raises(Exception):
+        apply_table_diff(sql, "accounts", ["key", "balance"], rows, ["key"])
+    assert sql.get_how_many("accounts") == 3
+
+
+def test_diff_needs_session(sql: SQLiteHelper) -> None:
+    with pytest.raises(ValueError):
+        apply_table_diff(sql, "accounts", ["key", "balance"], [], ["key"])
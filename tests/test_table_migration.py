@@ -0,0 +1,162 @@
+import sqlite3
+
+import pytest
+
+from finances.classes.sqlite_helper import SQLiteHelper
+from finances.classes.table_migration import (
+    TableMigration,
+    TableMigrationError,
+    text_to_real_sql,
+)
+
+OLD_SQLITE = (3, 24, 0)
+
+
+@pytest.fixture
+def connection() -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(
+        """
+CREATE TABLE transactions (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT,
+    "date" TEXT NOT NULL,
+    "category" TEXT,
+    "credit" TEXT,
+    "debit" TEXT DEFAULT '0',
+    "note" TEXT
+);
+CREATE INDEX "idx_transactions_date" ON "transactions" ("date" DESC, "category");
+CREATE UNIQUE INDEX "idx_transactions_note" ON "transactions" ("note");
+INSERT INTO transactions (date, category, credit, debit, note) VALUES
+    ('2024-04-06', 'Food', '£1,000.50', '0', 'a'),
+    ('2024-04-07', 'Rent', '2', '£ 3.25', 'b'),
+    ('2024-04-08', 'Pay', '9', '9', 'c');
+DELETE FROM transactions WHERE id = 3;
+"""
+    )
+    return connection
+
+
+def get_indexes(connection: sqlite3.Connection) -> list[str]:
+    rows = connection.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' ORDER BY name"
+    )
+    return [row[0] for row in rows]
+
+
+def test_many_changes_share_one_rebuild(connection: sqlite3.Connection) -> None:
+    migration = (
+        TableMigration("transactions")
+        .change_type("credit", "REAL", using=text_to_real_sql("credit"))
+        .change_type("debit", "REAL")
+        .rename("category", "kind")
+        .drop("note")
+    )
+
+    statements = migration.plan(connection)
+    assert sum(statement.startswith("CREATE TABLE") for statement in statements) == 1
+    copies = [s for s in statements if s.startswith('INSERT INTO "_migrate_')]
+    assert len(copies) == 1
+
+    migration.apply(connection)
+
+    columns = connection.execute("PRAGMA table_info('transactions')").fetchall()
+    assert [(row[1], row[2], row[3], row[4]) for row in columns] == [
+        ("id", "INTEGER", 0, None),
+        ("date", "TEXT", 1, None),
+        ("kind", "TEXT", 0, None),
+        ("credit", "REAL", 0, None),
+        ("debit", "REAL", 0, "'0'"),
+    ]
+    # The dropped column's index went with it; the renamed column's followed
+    assert get_indexes(connection) == [
+        'CREATE INDEX "idx_transactions_date" ON "transactions" ("date" DESC, "kind")'
+    ]
+    assert connection.execute("SELECT * FROM transactions").fetchall() == [
+        (1, "2024-04-06", "Food", 1000.5, 0.0),
+        # Without a using expression, text that is not a number stays text
+        (2, "2024-04-07", "Rent", 2.0, "£ 3.25"),
+    ]
+
+    # The deleted id 3 is still never reused
+    connection.execute("INSERT INTO transactions (date) VALUES ('2024-04-09')")
+    assert connection.execute("SELECT MAX(id) FROM transactions").fetchone()[0] == 4
+
+
+def test_renames_and_drops_alter_in_place(connection: sqlite3.Connection) -> None:
+    migration = TableMigration("transactions").rename("category", "kind").drop("debit")
+
+    assert migration.plan(connection) == [
+        'ALTER TABLE "transactions" RENAME COLUMN "category" TO "kind"',
+        'ALTER TABLE "transactions" DROP COLUMN "debit"',
+    ]
+
+    migration.apply(connection)
+    assert [
+        row[1] for row in connection.execute("PRAGMA table_info('transactions')")
+    ] == ["id", "date", "kind", "credit", "note"]
+    assert len(get_indexes(connection)) == 2
+
+
+def test_indexed_column_drop_rebuilds(connection: sqlite3.Connection) -> None:
+    statements = TableMigration("transactions").drop("note").plan(connection)
+    assert statements[1].startswith('CREATE TABLE "_migrate_transactions"')
+
+
+def test_old_sqlite_rebuilds_for_renames(connection: sqlite3.Connection) -> None:
+    migration = TableMigration("transactions", OLD_SQLITE).rename("note", "memo")
+    statements = migration.plan(connection)
+    assert not any("RENAME COLUMN" in statement for statement in statements)
+
+    migration.apply(connection)
+    assert 'ON "transactions" ("memo")' in get_indexes(connection)[1]
+
+
+def test_failed_migration_changes_nothing(connection: sqlite3.Connection) -> None:
+    migration = (
+        TableMigration("transactions")
+        .change_type("credit", "REAL")
+        .change_type("debit", "REAL", using='no_such_function("debit")')
+    )
+    with pytest.raises(sqlite3.OperationalError):
+        migration.apply(connection)
+
+    types = [row[2] for row in connection.execute("PRAGMA table_info('transactions')")]
+    assert types == ["INTEGER", "TEXT", "TEXT", "TEXT", "TEXT", "TEXT"]
+    assert len(get_indexes(connection)) == 2
+
+
+@pytest.mark.parametrize(
+    "migration",
+    [
+        TableMigration("transactions").drop("missing"),
+        TableMigration("transactions").drop("note").rename("note", "memo"),
+        TableMigration("transactions").rename("note", "category"),
+        TableMigration("transactions").change_type("credit", "REAL").drop("id"),
+        TableMigration("missing").drop("note"),
+    ],
+)
+def test_invalid_migrations(
+    connection: sqlite3.Connection, migration: TableMigration
+) -> None:
+    with pytest.raises(TableMigrationError):
+        migration.plan(connection)
+
+
+def test_helper_converts_columns_together(sql: SQLiteHelper) -> None:
+    sql.executeAndCommit("CREATE TABLE totals (name TEXT, credit TEXT, debit TEXT)")
+    sql.executeAndCommit(
+        "INSERT INTO totals VALUES ('a', '£1,000.50', ' 2'), ('b', '', '3')"
+    )
+
+    sql.texts_to_real("totals", ["credit", "debit", "name_missing"])
+
+    assert [row[2] for row in sql.get_table_info("totals")] == [
+        "TEXT",
+        "REAL",
+        "REAL",
+    ]
+    assert sql.fetch_all("SELECT * FROM totals") == [
+        ("a", 1000.5, 2.0),
+        ("b", 0.0, 3.0),
+    ]